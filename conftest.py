@@ -0,0 +1 @@
+# Present so pytest puts the repository root on sys.path and tests can import data_schema_config.
@@ -0,0 +1,190 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import pickle
+import platform
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pydantic import BaseModel
+from data_schema_config.base_column_configs import ColumnConfig, get_column_config_class, load_column_configs
+from data_schema_config.streams import BLOCK_ROWS
+
+CALIBRATION_DIR = os.environ.get("RETAILDATAFORGE_CALIBRATION_DIR",
+                                 os.path.join(os.path.expanduser("~"), ".cache", "retaildataforge"))
+CALIBRATION_ROWS = 16_384
+CALIBRATION_REPEATS = 3
+
+_lock = threading.Lock()
+_profile: Optional["CalibrationProfile"] = None
+
+
+def machine_fingerprint() -> str:
+    # Anything that changes generation speed invalidates the profile: the host, its CPUs and the array libraries.
+    return "|".join([platform.node(), platform.machine(), platform.processor(), str(os.cpu_count()),
+                     f"numpy {np.__version__}", f"pyarrow {pa.__version__}", f"pandas {pd.__version__}"])
+
+
+def available_workers() -> int:
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def _best_of(fn, repeats: int = CALIBRATION_REPEATS) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _noop(_: int) -> int:
+    return os.getpid()
+
+
+class Engine(str, Enum):
+    SERIAL = "serial"  # Blocks generated one after another in this process
+    PROCESS_POOL = "process_pool"  # Blocks fanned out to worker processes and concatenated here
+
+
+class CalibrationProfile(BaseModel):
+    """Measured costs on one machine; generator costs are filled in the first time a column type is planned."""
+
+    fingerprint: str
+    created_at: str
+    seconds_per_row: Dict[str, float] = {}
+    pool_startup_seconds: Optional[float] = None
+    transfer_seconds_per_cell: Optional[float] = None
+
+    @classmethod
+    def path(cls, fingerprint: str) -> Path:
+        return Path(CALIBRATION_DIR) / f"calibration-{hashlib.sha256(fingerprint.encode()).hexdigest()[:12]}.json"
+
+    def save(self):
+        path = self.path(self.fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def measure_column(self, config: ColumnConfig) -> bool:
+        """Time the column's generator unless its type is already known; returns whether anything was measured."""
+        if config.type_name in self.seconds_per_row:
+            return False
+        generate = get_column_config_class(config.type).generate_data
+        rng = np.random.default_rng(0)
+        generate(config, 256, rng)  # Warm-up: vocabularies and lookup tables are built once per process
+        seconds = _best_of(lambda: generate(config, CALIBRATION_ROWS, rng))
+        self.seconds_per_row[config.type_name] = seconds / CALIBRATION_ROWS
+        return True
+
+    def measure_pool(self) -> bool:
+        if self.pool_startup_seconds is not None and self.transfer_seconds_per_cell is not None:
+            return False
+        workers = min(2, available_workers())
+
+        def start_pool():
+            with ProcessPoolExecutor(workers) as pool:
+                list(pool.map(_noop, range(workers)))
+
+        self.pool_startup_seconds = _best_of(start_pool, 2)
+        # Results come back pickled and are unpickled one after another in the parent.
+        rng = np.random.default_rng(0)
+        frame = pd.DataFrame({
+            "number": rng.random(CALIBRATION_ROWS),
+            "text": pd.arrays.ArrowExtensionArray(pa.array(rng.integers(0, 1 << 40, CALIBRATION_ROWS).astype(str),
+                                                           type=pa.large_string())),
+        })
+        self.transfer_seconds_per_cell = _best_of(lambda: pickle.loads(pickle.dumps(frame))) / frame.size
+        return True
+
+
+def load_profile() -> CalibrationProfile:
+    """This machine's profile, read from the calibration directory once per process."""
+    global _profile
+    with _lock:
+        fingerprint = machine_fingerprint()
+        if _profile is None or _profile.fingerprint != fingerprint:
+            path = CalibrationProfile.path(fingerprint)
+            try:
+                _profile = CalibrationProfile.model_validate_json(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                _profile = CalibrationProfile(fingerprint=fingerprint,
+                                              created_at=datetime.now(timezone.utc).isoformat())
+        return _profile
+
+
+class ExecutionPlan(BaseModel):
+    engine: Engine = Engine.SERIAL
+    workers: int = 1
+    blocks: int = 1
+    predicted_seconds: Optional[float] = None
+    column_seconds: Dict[str, float] = {}  # Predicted generation time per column over all rows
+
+    def describe(self) -> str:
+        text = f"{self.engine.value} with {self.workers} worker(s) over {self.blocks} block(s)"
+        if self.predicted_seconds is not None:
+            slowest = sorted(self.column_seconds.items(), key=lambda item: -item[1])[:3]
+            text += f", predicted {self.predicted_seconds:.2f}s; slowest columns: " + \
+                    ", ".join(f"{name} {seconds:.2f}s" for name, seconds in slowest)
+        return text
+
+
+def plan_execution(columns: List[ColumnConfig], n_rows: int, profile: Optional[CalibrationProfile] = None,
+                   max_workers: Optional[int] = None) -> ExecutionPlan:
+    """Pick serial or pooled block generation, whichever the calibrated costs predict to finish first."""
+    blocks = max(1, math.ceil(n_rows / BLOCK_ROWS))
+    max_workers = min(max_workers or available_workers(), blocks)
+    if max_workers < 2 or not columns:
+        # A single block or a single CPU can't gain from a pool, so previews never pay for one (or for calibrating).
+        return ExecutionPlan(blocks=blocks)
+
+    profile = profile or load_profile()
+    with _lock:
+        changed = any([profile.measure_column(col) for col in columns])
+        changed = profile.measure_pool() or changed
+        if changed:
+            profile.save()
+
+    column_seconds = {col.name: profile.seconds_per_row[col.type_name] * n_rows for col in columns}
+    # Blocks are always generated whole, so the cost scales with blocks rather than rows.
+    block_seconds = BLOCK_ROWS * sum(profile.seconds_per_row[col.type_name] for col in columns)
+    transfer_seconds = BLOCK_ROWS * len(columns) * profile.transfer_seconds_per_cell
+    best = ExecutionPlan(blocks=blocks, predicted_seconds=block_seconds * blocks, column_seconds=column_seconds)
+    for workers in range(2, max_workers + 1):
+        seconds = profile.pool_startup_seconds + math.ceil(blocks / workers) * block_seconds + blocks * transfer_seconds
+        if seconds < best.predicted_seconds:
+            best = ExecutionPlan(engine=Engine.PROCESS_POOL, workers=workers, blocks=blocks,
+                                 predicted_seconds=seconds, column_seconds=column_seconds)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every registered column type and save this machine's "
+                                                 "calibration profile.")
+    parser.parse_args()
+    profile = load_profile()
+    with _lock:
+        for type_name, config_class in load_column_configs().items():
+            try:
+                config = config_class(name=type_name)
+                profile.measure_column(config)
+            except Exception as e:  # Types without usable defaults are measured when a schema first uses them
+                print(f"Skipped {type_name}: {e}")
+        profile.measure_pool()
+        profile.save()
+    print(json.dumps(profile.model_dump(), indent=2))
+    print(f"Saved to {profile.path(profile.fingerprint)}")
+
+
+if __name__ == "__main__":
+    main()
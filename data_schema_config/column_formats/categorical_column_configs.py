@@ -1,21 +1,21 @@
-from pydantic import BaseModel, Field, ValidationError, conint, constr
-from enum import Enum
+import random
+from pydantic import Field, model_validator
 import numpy as np
-from typing import Optional, List, Union
+import pandas as pd
+import pyarrow as pa
+from typing import ClassVar, Literal, Optional, List
 import streamlit as st
-from faker import Faker
 from data_schema_config.base_column_configs import (
-    ColumnType, 
-    ColumnConfig, 
-    ColumnTypeGroup
-)
+    ColumnType,
+    ColumnConfig,
+    register_column_config)
+from data_schema_config.vocabulary import FakerColumnConfig, take_strings
 
-fake = Faker()
 
+@register_column_config(ColumnType.BOOLEAN)
 class BooleanColumnConfig(ColumnConfig):
-    type: ColumnType = ColumnType.BOOLEAN
+    type: Literal[ColumnType.BOOLEAN] = ColumnType.BOOLEAN
     format: str = "Categorical"
-
     true_probability: float = 0.5  # Probability of generating True
 
     @classmethod
@@ -25,50 +25,112 @@ class BooleanColumnConfig(ColumnConfig):
             probability = st.slider(
                 "Probability of True", min_value=0.0, max_value=1.0, value=0.5, step=0.01, key=f"{key_prefix}_prob"
             )
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
 
             if submit and name.strip():
-                return cls(name=name.strip(), true_probability=probability)
+                return cls(name=name.strip(), true_probability=probability, null_fraction=null_fraction)
         return None
 
     @classmethod
-    def generate_data(cls, config: "BooleanColumnConfig", n_rows: int) -> List[bool]:
-        return np.random.choice(
-            [True, False], size=n_rows, p=[config.true_probability, 1 - config.true_probability]
-        ).tolist()
-    
-
-class CountryColumnConfig(ColumnConfig):
-    type: ColumnType = ColumnType.COUNTRY
+    def prefix_stable(cls, config: "BooleanColumnConfig") -> bool:
+        return True
+
+    @classmethod
+    def generate_data(cls, config: "BooleanColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        rng = rng or np.random.default_rng()
+        return rng.random(n_rows) < config.true_probability
+
+    @classmethod
+    def generate_reference(cls, config: "BooleanColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> List[bool]:
+        # Per-row baseline the vectorized sampler is checked against.
+        rnd = random.Random(int((rng or np.random.default_rng()).integers(0, 2 ** 63)))
+        return [rnd.random() < config.true_probability for _ in range(n_rows)]
+
+
+@register_column_config(ColumnType.COUNTRY)
+class CountryColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.COUNTRY] = ColumnType.COUNTRY
     format: str = "Categorical"
+    faker_provider: ClassVar[str] = "country"
 
     @classmethod
     def from_form(cls, key_prefix="country_cfg") -> Optional["CountryColumnConfig"]:
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             name = st.text_input("Column Name (e.g., 'Country')", key=f"{key_prefix}_name")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
             if submit and name.strip():
-                return cls(name=name.strip())
+                return cls(name=name.strip(), null_fraction=null_fraction)
         return None
 
-    @classmethod
-    def generate_data(cls, config: "CountryColumnConfig", n_rows: int) -> List[str]:
-        return [fake.country() for _ in range(n_rows)]
 
-class CityColumnConfig(ColumnConfig):
-    type: ColumnType = ColumnType.CITY
+@register_column_config(ColumnType.CITY)
+class CityColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.CITY] = ColumnType.CITY
     format: str = "Categorical"
+    faker_provider: ClassVar[str] = "city"
+    composed: ClassVar[bool] = True
 
     @classmethod
     def from_form(cls, key_prefix="city_cfg") -> Optional["CityColumnConfig"]:
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             name = st.text_input("Column Name (e.g., 'City')", key=f"{key_prefix}_name")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
             if submit and name.strip():
-                return cls(name=name.strip())
+                return cls(name=name.strip(), null_fraction=null_fraction)
+        return None
+
+
+@register_column_config(ColumnType.CATEGORY)
+class CategoryColumnConfig(ColumnConfig):
+    type: Literal[ColumnType.CATEGORY] = ColumnType.CATEGORY
+    format: str = "Categorical"
+    storage_encoding: ClassVar[str] = "dictionary"
+    categories: List[str] = Field(default_factory=list)
+    weights: Optional[List[float]] = None  # Relative frequencies; uniform when omitted
+
+    @model_validator(mode="after")
+    def check_categories(self):
+        if not self.categories:
+            raise ValueError("A category column needs at least one category.")
+        if self.weights is not None:
+            if len(self.weights) != len(self.categories):
+                raise ValueError(f"Got {len(self.weights)} weight(s) for {len(self.categories)} categories.")
+            if any(w < 0 for w in self.weights) or not sum(self.weights) > 0:
+                raise ValueError("Category weights must be non-negative with a positive sum.")
+        return self
+
+    @classmethod
+    def from_form(cls, key_prefix="category_cfg") -> Optional["CategoryColumnConfig"]:
+        with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
+            name = st.text_input("Column Name (e.g., 'Segment')", key=f"{key_prefix}_name")
+            raw = st.text_input("Categories (comma-separated)", key=f"{key_prefix}_categories")
+            null_fraction = cls.null_fraction_input(key_prefix)
+            submit = st.form_submit_button("Add Column")
+            categories = [c.strip() for c in raw.split(",") if c.strip()]
+            if submit and name.strip() and categories:
+                return cls(name=name.strip(), categories=categories, null_fraction=null_fraction)
         return None
 
     @classmethod
-    def generate_data(cls, config: "CityColumnConfig", n_rows: int) -> List[str]:
-        return [fake.city() for _ in range(n_rows)]
+    def prefix_stable(cls, config: "CategoryColumnConfig") -> bool:
+        return True
 
+    @classmethod
+    def generate_data(cls, config: "CategoryColumnConfig", n_rows: int,
+                      rng: Optional[np.random.Generator] = None) -> pd.arrays.ArrowExtensionArray:
+        rng = rng or np.random.default_rng()
+        p = None
+        if config.weights:
+            p = np.asarray(config.weights, dtype=np.float64)
+            p = p / p.sum()
+        categories = pa.array(config.categories, type=pa.large_string())
+        return take_strings(categories, rng.choice(len(config.categories), size=n_rows, p=p))
+
+    @classmethod
+    def generate_reference(cls, config: "CategoryColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+        # Per-row baseline the vectorized sampler is checked against.
+        rnd = random.Random(int((rng or np.random.default_rng()).integers(0, 2 ** 63)))
+        return [rnd.choices(config.categories, weights=config.weights)[0] for _ in range(n_rows)]
@@ -1,21 +1,33 @@
-from pydantic import BaseModel, Field, ValidationError, conint, constr
-from enum import Enum
+import random
+from pydantic import Field, model_validator
 import numpy as np
-from typing import Optional, List, Union
+from typing import Literal, Optional, List
 import streamlit as st
-from faker import Faker
 from data_schema_config.base_column_configs import (
-    ColumnType, 
-    ColumnConfig, 
+    ColumnType,
+    ColumnConfig,
     register_column_config)
+from data_schema_config.distributions import (
+    Distribution, is_prefix_stable, narrowest_float_dtype, narrowest_int_dtype, reference_value, sample_numeric)
 
 
 @register_column_config(ColumnType.INTEGER)
 class IntegerColumnConfig(ColumnConfig):
-    type: ColumnType = ColumnType.INTEGER
+    type: Literal[ColumnType.INTEGER] = ColumnType.INTEGER
     format: str = "Numeric"
     min_value: int = 0
     max_value: int = 100
+    distribution: Distribution = Field(default_factory=Distribution)
+    dtype: Optional[Literal["int8", "int16", "int32", "int64"]] = None  # None picks the narrowest fitting dtype
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.min_value > self.max_value:
+            raise ValueError(f"min_value ({self.min_value}) is greater than max_value ({self.max_value}).")
+        needed = narrowest_int_dtype(self.min_value, self.max_value)
+        if self.dtype and np.dtype(self.dtype).itemsize < needed.itemsize:
+            raise ValueError(f"{self.dtype} cannot hold [{self.min_value}, {self.max_value}]; use {needed} or wider.")
+        return self
 
     @classmethod
     def from_form(cls, key_prefix="int_cfg") -> Optional["IntegerColumnConfig"]:
@@ -23,23 +35,54 @@ class IntegerColumnConfig(ColumnConfig):
             name = st.text_input("Column Name", key=f"{key_prefix}_name")
             min_val = st.number_input("Minimum Value", value=0, key=f"{key_prefix}_min")
             max_val = st.number_input("Maximum Value", value=100, key=f"{key_prefix}_max")
+            distribution = Distribution.from_form(key_prefix=f"{key_prefix}_dist")
+            dtype = st.selectbox("Storage Type", ["auto", "int8", "int16", "int32", "int64"], key=f"{key_prefix}_dtype")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
 
             if submit and name.strip():
-                return cls(name=name.strip(), min_value=min_val, max_value=max_val)
+                return cls(name=name.strip(), min_value=min_val, max_value=max_val, distribution=distribution,
+                           dtype=None if dtype == "auto" else dtype, null_fraction=null_fraction)
         return None
     
     @classmethod
-    def generate_data(cls, config: "IntegerColumnConfig", n_rows: int) -> List[int]:
-        return np.random.randint(config.min_value, config.max_value + 1, size=n_rows).tolist()
+    def prefix_stable(cls, config: "IntegerColumnConfig") -> bool:
+        return is_prefix_stable(config.distribution)
 
-    
+    @classmethod
+    def generate_data(cls, config: "IntegerColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        dtype = np.dtype(config.dtype) if config.dtype else narrowest_int_dtype(config.min_value, config.max_value)
+        return sample_numeric(config.distribution, config.min_value, config.max_value, n_rows,
+                              rng or np.random.default_rng(), dtype)
+
+    @classmethod
+    def generate_reference(cls, config: "IntegerColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> List[int]:
+        # Per-row baseline the vectorized sampler is checked against.
+        rnd = random.Random(int((rng or np.random.default_rng()).integers(0, 2 ** 63)))
+        lo, hi = config.min_value, config.max_value
+        return [int(round(min(max(reference_value(config.distribution, lo, hi, rnd, True), lo), hi)))
+                for _ in range(n_rows)]
+
+
+@register_column_config(ColumnType.FLOAT)
 class FloatColumnConfig(ColumnConfig):
-    type: ColumnType = ColumnType.FLOAT
+    type: Literal[ColumnType.FLOAT] = ColumnType.FLOAT
     format: str = "Numeric"
     min_value: float = 0.0
     max_value: float = 1.0
     precision: int = 2  # Number of decimal places
+    distribution: Distribution = Field(default_factory=Distribution)
+    dtype: Optional[Literal["float32", "float64"]] = None  # None picks the narrowest fitting dtype
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.min_value > self.max_value:
+            raise ValueError(f"min_value ({self.min_value}) is greater than max_value ({self.max_value}).")
+        if self.dtype == "float32" and narrowest_float_dtype(self.min_value, self.max_value,
+                                                             self.precision) != np.float32:
+            raise ValueError(f"float32 cannot hold [{self.min_value}, {self.max_value}] exactly at "
+                             f"{self.precision} decimal places; use float64.")
+        return self
 
     @classmethod
     def from_form(cls, key_prefix="float_cfg") -> Optional["FloatColumnConfig"]:
@@ -48,14 +91,32 @@ class FloatColumnConfig(ColumnConfig):
             min_val = st.number_input("Minimum Value", value=0.0, key=f"{key_prefix}_min")
             max_val = st.number_input("Maximum Value", value=1.0, key=f"{key_prefix}_max")
             precision = st.number_input("Decimal Precision", value=2, min_value=0, max_value=10, key=f"{key_prefix}_precision")
+            distribution = Distribution.from_form(key_prefix=f"{key_prefix}_dist")
+            dtype = st.selectbox("Storage Type", ["auto", "float32", "float64"], key=f"{key_prefix}_dtype")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
 
             if submit and name.strip():
-                return cls(name=name.strip(), min_value=min_val, max_value=max_val, precision=precision)
+                return cls(name=name.strip(), min_value=min_val, max_value=max_val, precision=precision,
+                           distribution=distribution, dtype=None if dtype == "auto" else dtype,
+                           null_fraction=null_fraction)
         return None
 
     @classmethod
-    def generate_data(cls, config: "FloatColumnConfig", n_rows: int) -> List[float]:
-        raw = np.random.uniform(config.min_value, config.max_value, size=n_rows)
-        return np.round(raw, decimals=config.precision).tolist()
-    
\ No newline at end of file
+    def prefix_stable(cls, config: "FloatColumnConfig") -> bool:
+        return is_prefix_stable(config.distribution)
+
+    @classmethod
+    def generate_data(cls, config: "FloatColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        dtype = (np.dtype(config.dtype) if config.dtype
+                 else narrowest_float_dtype(config.min_value, config.max_value, config.precision))
+        return sample_numeric(config.distribution, config.min_value, config.max_value, n_rows,
+                              rng or np.random.default_rng(), dtype, precision=config.precision)
+
+    @classmethod
+    def generate_reference(cls, config: "FloatColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> List[float]:
+        # Per-row baseline the vectorized sampler is checked against.
+        rnd = random.Random(int((rng or np.random.default_rng()).integers(0, 2 ** 63)))
+        lo, hi = config.min_value, config.max_value
+        return [round(min(max(reference_value(config.distribution, lo, hi, rnd, False), lo), hi), config.precision)
+                for _ in range(n_rows)]
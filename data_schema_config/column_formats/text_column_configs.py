@@ -1,16 +1,30 @@
-from pydantic import BaseModel, Field, ValidationError, conint, constr
-from enum import Enum
+from functools import lru_cache
 import numpy as np
-from typing import Optional, List, Union
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import ClassVar, Literal, Optional, List
 import streamlit as st
-from faker import Faker
-from data_schema_config.base_column_configs import ColumnType, BaseColumnConfig, ColumnFormat
+from data_schema_config.base_column_configs import (
+    ColumnType,
+    register_column_config)
+from data_schema_config.vocabulary import FakerColumnConfig, faker_elements, faker_vocabulary, reference_faker
 
-fake = Faker()
 
-class StringColumnConfig(BaseColumnConfig):
-    type: ColumnType = ColumnType.STRING
-    format: ColumnFormat = ColumnFormat.STRING
+@lru_cache(maxsize=None)
+def _truncated_words(max_length: int) -> pa.LargeStringArray:
+    return pc.utf8_slice_codeunits(faker_elements("word")[0], 0, max_length)
+
+
+@lru_cache(maxsize=None)
+def _single_line_addresses() -> pa.LargeStringArray:
+    return pc.replace_substring(faker_vocabulary("address"), "\n", ", ")
+
+
+@register_column_config(ColumnType.STRING)
+class StringColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.STRING] = ColumnType.STRING
+    format: str = "Text"
+    faker_provider: ClassVar[str] = "word"
     max_length: int = 20
 
     @classmethod
@@ -18,118 +32,147 @@ class StringColumnConfig(BaseColumnConfig):
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             name = st.text_input("Column Name", key=f"{key_prefix}_name")
             max_len = st.number_input("Max String Length", value=20, min_value=1, key=f"{key_prefix}_max_len")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
 
             if submit and name.strip():
-                return cls(name=name.strip(), max_length=max_len)
+                return cls(name=name.strip(), max_length=max_len, null_fraction=null_fraction)
         return None
     
     @classmethod
-    def generate_data(cls, config: "StringColumnConfig", n_rows: int) -> List[str]:
+    def vocabulary(cls, config: "StringColumnConfig") -> pa.LargeStringArray:
+        return _truncated_words(config.max_length)
+
+    @classmethod
+    def generate_reference(cls, config: "StringColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+        fake = reference_faker(rng)
         return [fake.word()[:config.max_length] for _ in range(n_rows)]
-    
 
-class PersonNameColumnConfig(BaseColumnConfig):
-    type: ColumnType = ColumnType.PERSON_NAME
-    format: ColumnFormat = ColumnFormat.STRING
+
+@register_column_config(ColumnType.PERSON_NAME)
+class PersonNameColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.PERSON_NAME] = ColumnType.PERSON_NAME
+    format: str = "Text"
+    faker_provider: ClassVar[str] = "name"
+    composed: ClassVar[bool] = True
+    storage_encoding: ClassVar[str] = "plain"
 
     @classmethod
     def from_form(cls, key_prefix="person_name_cfg") -> Optional["PersonNameColumnConfig"]:
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             col_label = "Column Name (e.g., 'Full Name')"
             name = st.text_input(col_label, key=f"{key_prefix}_name")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
 
             if submit and name.strip():
-                return cls(name=name.strip())
+                return cls(name=name.strip(), null_fraction=null_fraction)
         return None
 
-    @classmethod
-    def generate_data(cls, config: "PersonNameColumnConfig", n_rows: int) -> List[str]:
-        return [fake.name() for _ in range(n_rows)]
-    
-class FirstNameColumnConfig(BaseColumnConfig):
-    type: ColumnType = ColumnType.FIRST_NAME
-    format: ColumnFormat = ColumnFormat.STRING
+
+@register_column_config(ColumnType.FIRST_NAME)
+class FirstNameColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.FIRST_NAME] = ColumnType.FIRST_NAME
+    format: str = "Text"
+    faker_provider: ClassVar[str] = "first_name"
 
     @classmethod
     def from_form(cls, key_prefix="first_name_cfg") -> Optional["FirstNameColumnConfig"]:
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             name = st.text_input("Column Name (e.g., 'First Name')", key=f"{key_prefix}_name")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
             if submit and name.strip():
-                return cls(name=name.strip())
+                return cls(name=name.strip(), null_fraction=null_fraction)
         return None
 
-    @classmethod
-    def generate_data(cls, config: "FirstNameColumnConfig", n_rows: int) -> List[str]:
-        return [fake.first_name() for _ in range(n_rows)]
-    
-class LastNameColumnConfig(BaseColumnConfig):
-    type: ColumnType = ColumnType.LAST_NAME
-    format: ColumnFormat = ColumnFormat.STRING
+
+@register_column_config(ColumnType.LAST_NAME)
+class LastNameColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.LAST_NAME] = ColumnType.LAST_NAME
+    format: str = "Text"
+    faker_provider: ClassVar[str] = "last_name"
 
     @classmethod
     def from_form(cls, key_prefix="last_name_cfg") -> Optional["LastNameColumnConfig"]:
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             name = st.text_input("Column Name (e.g., 'Last Name')", key=f"{key_prefix}_name")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
             if submit and name.strip():
-                return cls(name=name.strip())
+                return cls(name=name.strip(), null_fraction=null_fraction)
         return None
 
-    @classmethod
-    def generate_data(cls, config: "LastNameColumnConfig", n_rows: int) -> List[str]:
-        return [fake.last_name() for _ in range(n_rows)]
-    
-class EmailColumnConfig(BaseColumnConfig):
-    type: ColumnType = ColumnType.EMAIL
-    format: ColumnFormat = ColumnFormat.STRING
+
+@register_column_config(ColumnType.EMAIL)
+class EmailColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.EMAIL] = ColumnType.EMAIL
+    format: str = "Text"
+    faker_provider: ClassVar[str] = "email"
+    composed: ClassVar[bool] = True
+    storage_encoding: ClassVar[str] = "plain"
 
     @classmethod
     def from_form(cls, key_prefix="email_cfg") -> Optional["EmailColumnConfig"]:
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             name = st.text_input("Column Name (e.g., 'Email')", key=f"{key_prefix}_name")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
             if submit and name.strip():
-                return cls(name=name.strip())
+                return cls(name=name.strip(), null_fraction=null_fraction)
         return None
 
-    @classmethod
-    def generate_data(cls, config: "EmailColumnConfig", n_rows: int) -> List[str]:
-        return [fake.email() for _ in range(n_rows)]
 
-class PhoneNumberColumnConfig(BaseColumnConfig):
-    type: ColumnType = ColumnType.PHONE_NUMBER
-    format: ColumnFormat = ColumnFormat.STRING
+@register_column_config(ColumnType.PHONE_NUMBER)
+class PhoneNumberColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.PHONE_NUMBER] = ColumnType.PHONE_NUMBER
+    format: str = "Text"
+    faker_provider: ClassVar[str] = "phone_number"
+    composed: ClassVar[bool] = True
+    storage_encoding: ClassVar[str] = "plain"
 
     @classmethod
     def from_form(cls, key_prefix="phone_cfg") -> Optional["PhoneNumberColumnConfig"]:
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             name = st.text_input("Column Name (e.g., 'Phone')", key=f"{key_prefix}_name")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
             if submit and name.strip():
-                return cls(name=name.strip())
+                return cls(name=name.strip(), null_fraction=null_fraction)
         return None
 
-    @classmethod
-    def generate_data(cls, config: "PhoneNumberColumnConfig", n_rows: int) -> List[str]:
-        return [fake.phone_number() for _ in range(n_rows)]
-
 
-class AddressColumnConfig(BaseColumnConfig):
-    type: ColumnType = ColumnType.ADDRESS
-    format: ColumnFormat = ColumnFormat.STRING
+@register_column_config(ColumnType.ADDRESS)
+class AddressColumnConfig(FakerColumnConfig):
+    type: Literal[ColumnType.ADDRESS] = ColumnType.ADDRESS
+    format: str = "Text"
+    faker_provider: ClassVar[str] = "address"
+    composed: ClassVar[bool] = True
+    storage_encoding: ClassVar[str] = "plain"
 
     @classmethod
     def from_form(cls, key_prefix="address_cfg") -> Optional["AddressColumnConfig"]:
         with st.form(f"{key_prefix}_form", clear_on_submit=True, border=False):
             name = st.text_input("Column Name (e.g., 'Address')", key=f"{key_prefix}_name")
+            null_fraction = cls.null_fraction_input(key_prefix)
             submit = st.form_submit_button("Add Column")
             if submit and name.strip():
-                return cls(name=name.strip())
+                return cls(name=name.strip(), null_fraction=null_fraction)
         return None
 
     @classmethod
-    def generate_data(cls, config: "AddressColumnConfig", n_rows: int) -> List[str]:
+    def vocabulary(cls, config: "AddressColumnConfig") -> pa.LargeStringArray:
+        return _single_line_addresses()
+
+    @classmethod
+    def sample_values(cls, config: "AddressColumnConfig", n_rows: int, rng: np.random.Generator) -> pa.Array:
+        return pc.replace_substring(super().sample_values(config, n_rows, rng), "\n", ", ")
+
+    @classmethod
+    def keyed_values(cls, config: "AddressColumnConfig", keys: np.ndarray) -> pa.Array:
+        return pc.replace_substring(super().keyed_values(config, keys), "\n", ", ")
+
+    @classmethod
+    def generate_reference(cls, config: "AddressColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+        fake = reference_faker(rng)
         return [fake.address().replace('\n', ', ') for _ in range(n_rows)]
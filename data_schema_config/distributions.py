@@ -0,0 +1,193 @@
+import math
+import random
+from enum import Enum
+from typing import List, Optional
+import numpy as np
+import streamlit as st
+from pydantic import BaseModel, Field, model_validator
+
+
+class DistributionType(str, Enum):
+    UNIFORM = "Uniform"
+    NORMAL = "Normal"
+    TRUNCATED_NORMAL = "Truncated Normal"
+    LOG_NORMAL = "Log-Normal"
+    EXPONENTIAL = "Exponential"
+    POISSON = "Poisson"
+    ZIPF = "Zipf"
+    EMPIRICAL = "Empirical"
+    DISCRETE = "Discrete"
+
+
+class Distribution(BaseModel):
+    kind: DistributionType = DistributionType.UNIFORM
+    mean: float = 0.0  # Normal / truncated normal location, log-normal log-mean
+    std: float = Field(default=1.0, gt=0)  # Normal / truncated normal scale, log-normal sigma
+    scale: float = Field(default=1.0, gt=0)  # Exponential scale (1 / rate)
+    lam: float = Field(default=1.0, ge=0)  # Poisson rate
+    exponent: float = Field(default=2.0, gt=1)  # Zipf exponent
+    bin_edges: List[float] = Field(default_factory=list)  # Empirical histogram
+    values: List[float] = Field(default_factory=list)  # Discrete: the only values drawn
+    weights: List[float] = Field(default_factory=list)  # Per histogram bin, or per discrete value
+
+    @model_validator(mode="after")
+    def check_histogram(self):
+        if self.kind == DistributionType.EMPIRICAL:
+            if len(self.bin_edges) != len(self.weights) + 1 or not self.weights:
+                raise ValueError("Empirical distribution needs len(bin_edges) == len(weights) + 1.")
+            if sum(self.weights) <= 0:
+                raise ValueError("Empirical weights must sum to a positive value.")
+        if self.kind == DistributionType.DISCRETE:
+            if len(self.values) != len(self.weights) or not self.weights:
+                raise ValueError("Discrete distribution needs one weight per value.")
+            if sum(self.weights) <= 0:
+                raise ValueError("Discrete weights must sum to a positive value.")
+        return self
+
+    @classmethod
+    def from_form(cls, key_prefix="dist") -> "Distribution":
+        # Rendered inside the caller's st.form; empirical and discrete frequencies come from inference, not the UI.
+        kinds = [k.value for k in DistributionType if k not in (DistributionType.EMPIRICAL, DistributionType.DISCRETE)]
+        kind = st.selectbox("Distribution", kinds, key=f"{key_prefix}_kind")
+        col1, col2, col3 = st.columns(3)
+        mean = col1.number_input("Mean / log-mean", value=0.0, key=f"{key_prefix}_mean")
+        std = col2.number_input("Std / sigma", value=1.0, min_value=1e-9, key=f"{key_prefix}_std")
+        scale = col3.number_input("Exponential scale", value=1.0, min_value=1e-9, key=f"{key_prefix}_scale")
+        col4, col5 = st.columns(2)
+        lam = col4.number_input("Poisson rate", value=1.0, min_value=0.0, key=f"{key_prefix}_lam")
+        exponent = col5.number_input("Zipf exponent", value=2.0, min_value=1.01, key=f"{key_prefix}_exp")
+        return cls(kind=DistributionType(kind), mean=mean, std=std, scale=scale, lam=lam, exponent=exponent)
+
+
+def _truncated_normal(dist: Distribution, low: float, high: float, n_rows: int,
+                      rng: np.random.Generator, max_rounds: int = 20) -> np.ndarray:
+    out = rng.normal(dist.mean, dist.std, size=n_rows)
+    # Redraw only the rejected slots; whatever still misses after max_rounds is clipped by the caller.
+    for _ in range(max_rounds):
+        bad = np.flatnonzero((out < low) | (out > high))
+        if not bad.size:
+            break
+        out[bad] = rng.normal(dist.mean, dist.std, size=bad.size)
+    return out
+
+
+def _choose(dist: Distribution, n_rows: int, rng: np.random.Generator) -> np.ndarray:
+    weights = np.asarray(dist.weights, dtype=np.float64)
+    return rng.choice(weights.size, size=n_rows, p=weights / weights.sum())
+
+
+def _empirical(dist: Distribution, low: float, high: float, n_rows: int,
+               rng: np.random.Generator) -> np.ndarray:
+    edges = np.asarray(dist.bin_edges, dtype=np.float64)
+    weights = np.asarray(dist.weights, dtype=np.float64)
+    # Bin and position within the bin come from one row of draws per value, so the sample is prefix-stable.
+    draws = rng.random((n_rows, 2))
+    bins = np.minimum(np.searchsorted(np.cumsum(weights / weights.sum()), draws[:, 0], side="right"), weights.size - 1)
+    out = draws[:, 1] * (edges[bins + 1] - edges[bins])
+    out += edges[bins]
+    return out
+
+
+_SAMPLERS = {
+    DistributionType.UNIFORM: lambda d, lo, hi, n, rng: rng.uniform(lo, hi, size=n),
+    DistributionType.NORMAL: lambda d, lo, hi, n, rng: rng.normal(d.mean, d.std, size=n),
+    DistributionType.TRUNCATED_NORMAL: _truncated_normal,
+    DistributionType.LOG_NORMAL: lambda d, lo, hi, n, rng: rng.lognormal(d.mean, d.std, size=n),
+    DistributionType.EXPONENTIAL: lambda d, lo, hi, n, rng: lo + rng.exponential(d.scale, size=n),
+    DistributionType.POISSON: lambda d, lo, hi, n, rng: (lo + rng.poisson(d.lam, size=n)).astype(np.float64),
+    DistributionType.ZIPF: lambda d, lo, hi, n, rng: (lo - 1 + rng.zipf(d.exponent, size=n)).astype(np.float64),
+    DistributionType.EMPIRICAL: _empirical,
+    DistributionType.DISCRETE: lambda d, lo, hi, n, rng: np.asarray(d.values, dtype=np.float64)[_choose(d, n, rng)],
+}
+
+
+def _reference_poisson(lam: float, rnd: random.Random) -> int:
+    # Knuth: count uniforms until their product drops below e^-lam.
+    limit, k, product = math.exp(-lam), 0, rnd.random()
+    while product > limit:
+        k += 1
+        product *= rnd.random()
+    return k
+
+
+def _reference_zipf(exponent: float, rnd: random.Random) -> int:
+    # Devroye's rejection sampler, the algorithm numpy's vectorized zipf uses.
+    am1, b = exponent - 1, 2 ** (exponent - 1)
+    while True:
+        u, v = 1 - rnd.random(), rnd.random()
+        x = math.floor(u ** (-1 / am1))
+        if x < 1 or x > 2 ** 62:
+            continue
+        t = (1 + 1 / x) ** am1
+        if v * x * (t - 1) / (b - 1) <= t / b:
+            return x
+
+
+def reference_value(dist: Distribution, low: float, high: float, rnd: random.Random, integral: bool,
+                    max_rounds: int = 20) -> float:
+    """One value drawn per call with Python's `random`: the per-row baseline `sample_numeric` is checked against.
+
+    Clipping and rounding are left to the caller, as in `sample_numeric`.
+    """
+    kind = dist.kind
+    if kind == DistributionType.UNIFORM:
+        return rnd.randint(int(low), int(high)) if integral else rnd.uniform(low, high)
+    if kind == DistributionType.NORMAL:
+        return rnd.gauss(dist.mean, dist.std)
+    if kind == DistributionType.TRUNCATED_NORMAL:
+        value = rnd.gauss(dist.mean, dist.std)
+        for _ in range(max_rounds):
+            if low <= value <= high:
+                break
+            value = rnd.gauss(dist.mean, dist.std)
+        return value
+    if kind == DistributionType.LOG_NORMAL:
+        return rnd.lognormvariate(dist.mean, dist.std)
+    if kind == DistributionType.EXPONENTIAL:
+        return low + rnd.expovariate(1 / dist.scale)
+    if kind == DistributionType.POISSON:
+        return low + _reference_poisson(dist.lam, rnd)
+    if kind == DistributionType.ZIPF:
+        return low - 1 + _reference_zipf(dist.exponent, rnd)
+    if kind == DistributionType.EMPIRICAL:
+        i = rnd.choices(range(len(dist.weights)), weights=dist.weights)[0]
+        return dist.bin_edges[i] + rnd.random() * (dist.bin_edges[i + 1] - dist.bin_edges[i])
+    return rnd.choices(dist.values, weights=dist.weights)[0]
+
+
+def is_prefix_stable(dist: Distribution) -> bool:
+    # Every sampler draws values in one sequential pass except the truncated normal, whose redraws depend
+    # on which of the requested rows were rejected.
+    return dist.kind != DistributionType.TRUNCATED_NORMAL
+
+
+def narrowest_int_dtype(low: int, high: int) -> np.dtype:
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def narrowest_float_dtype(low: float, high: float, precision: Optional[int]) -> np.dtype:
+    # float32 keeps 24 bits of mantissa: enough when every value at this precision is exactly distinguishable.
+    if precision is not None and max(abs(low), abs(high)) * 10 ** precision < 2 ** 24:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def sample_numeric(dist: Distribution, low: float, high: float, n_rows: int, rng: np.random.Generator,
+                   dtype: np.dtype, precision: Optional[int] = None) -> np.ndarray:
+    if np.issubdtype(dtype, np.integer):
+        if dist.kind == DistributionType.UNIFORM:
+            return rng.integers(low, high, size=n_rows, dtype=dtype, endpoint=True)
+        raw = _SAMPLERS[dist.kind](dist, low, high, n_rows, rng)
+        np.clip(raw, low, high, out=raw)
+        np.rint(raw, out=raw)
+        return raw.astype(dtype, copy=False)
+
+    raw = _SAMPLERS[dist.kind](dist, low, high, n_rows, rng)
+    np.clip(raw, low, high, out=raw)
+    if precision is not None:
+        np.round(raw, decimals=precision, out=raw)
+    return raw.astype(dtype, copy=False)
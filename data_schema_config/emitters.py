@@ -0,0 +1,375 @@
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel
+from data_schema_config.quality import QualityReport, sidecar_path
+from data_schema_config.table_schema import TableSchema
+
+# Every value is formatted column by column with Arrow kernels and rows are assembled with
+# binary_join_element_wise; no Python object is created per row or per cell.
+DEFAULT_ROWS_PER_STATEMENT = 1000
+EMIT_FORMATS = ("ndjson", "insert", "copy")
+
+Batch = Union[pd.DataFrame, pa.Table, pa.RecordBatch]
+
+
+def _text(value: str) -> pa.Scalar:
+    return pa.scalar(value, pa.large_string())
+
+
+def _concat(*parts) -> pa.Array:
+    return pc.binary_join_element_wise(*parts, _text(""))
+
+
+def _table(batch: Batch) -> pa.Table:
+    if isinstance(batch, pd.DataFrame):
+        return pa.Table.from_pandas(batch, preserve_index=False)
+    if isinstance(batch, pa.RecordBatch):
+        return pa.Table.from_batches([batch])
+    return batch
+
+
+def _column(array: Union[pa.Array, pa.ChunkedArray]) -> pa.Array:
+    array = array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+    if pa.types.is_dictionary(array.type):
+        array = array.cast(array.type.value_type)
+    return array
+
+
+def _replace(array: pa.Array, pairs, special: str) -> pa.Array:
+    # Generated text rarely contains anything to escape, so one regex scan usually saves every replace pass.
+    if not pc.any(pc.match_substring_regex(array, special)).as_py():
+        return array
+    for pattern, replacement in pairs:
+        array = pc.replace_substring(array, pattern, replacement)
+    return array
+
+
+def _kind(data_type: pa.DataType) -> str:
+    if pa.types.is_boolean(data_type):
+        return "bool"
+    if pa.types.is_integer(data_type) or pa.types.is_decimal(data_type):
+        return "int"
+    if pa.types.is_floating(data_type):
+        return "float"
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return "string"
+    if pa.types.is_temporal(data_type):
+        return "temporal"
+    raise ValueError(f"Columns of type {data_type} cannot be emitted.")
+
+
+def _numbers(array: pa.Array) -> pa.Array:
+    return array.cast(pa.large_string())
+
+
+def _finite(array: pa.Array) -> pa.Array:
+    # NaN and infinities have no SQL or JSON literal; they are written as null.
+    return pc.if_else(pc.is_finite(array), array, pa.scalar(None, array.type))
+
+
+def sql_literals(array: Union[pa.Array, pa.ChunkedArray]) -> pa.Array:
+    """SQL literal for every value: NULL, TRUE/FALSE, numbers, or single-quoted text."""
+    array = _column(array)
+    kind = _kind(array.type)
+    if kind == "bool":
+        values = pc.if_else(array, _text("TRUE"), _text("FALSE"))
+    elif kind == "int":
+        values = _numbers(array)
+    elif kind == "float":
+        values = _numbers(_finite(array))
+    else:
+        text = array.cast(pa.large_string())
+        values = _concat(_text("'"), _replace(text, [("'", "''")], "'"), _text("'"))
+    return values.fill_null(_text("NULL"))
+
+
+_JSON_ESCAPES = [("\\", "\\\\"), ('"', '\\"'), ("\n", "\\n"), ("\r", "\\r"), ("\t", "\\t"), ("\b", "\\b"),
+                 ("\f", "\\f")]
+
+
+def json_values(array: Union[pa.Array, pa.ChunkedArray]) -> pa.Array:
+    """JSON encoding of every value: null, true/false, numbers, or escaped strings (dates as ISO strings)."""
+    array = _column(array)
+    kind = _kind(array.type)
+    if kind == "bool":
+        values = pc.if_else(array, _text("true"), _text("false"))
+    elif kind == "int":
+        values = _numbers(array)
+    elif kind == "float":
+        values = _numbers(_finite(array))
+    else:
+        text = array.cast(pa.large_string())
+        escaped = _replace(text, _JSON_ESCAPES, r'["\\\x00-\x1f]')
+        values = _concat(_text('"'), escaped, _text('"'))
+        # Other control characters need \u escapes; they are rare enough to hand to json.dumps row by row.
+        odd = pc.fill_null(pc.match_substring_regex(text, r"[\x00-\x07\x0b\x0e-\x1f]"), False) \
+            if escaped is not text else None
+        if odd is not None and pc.any(odd).as_py():
+            rows = np.flatnonzero(odd.to_numpy(zero_copy_only=False))
+            fixed = pa.array([json.dumps(v) for v in text.take(pa.array(rows)).to_pylist()], pa.large_string())
+            values = pc.replace_with_mask(values, odd, fixed)
+    return values.fill_null(_text("null"))
+
+
+_COPY_ESCAPES = [("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r")]
+
+
+def copy_fields(array: Union[pa.Array, pa.ChunkedArray]) -> pa.Array:
+    """Postgres COPY text-format field for every value; nulls are \\N."""
+    array = _column(array)
+    kind = _kind(array.type)
+    if kind == "bool":
+        values = pc.if_else(array, _text("t"), _text("f"))
+    elif kind in ("int", "float"):
+        values = _numbers(array)  # Postgres reads nan/inf/-inf as float specials
+    else:
+        values = _replace(array.cast(pa.large_string()), _COPY_ESCAPES, r"[\\\t\n\r]")
+    return values.fill_null(_text("\\N"))
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_list(schema: pa.Schema) -> str:
+    return "(" + ", ".join(quote_identifier(name) for name in schema.names) + ")"
+
+
+def _buffer(rows: pa.Array) -> pa.Buffer:
+    # The values of a null-free large_string array sit back to back in its data buffer, so the whole
+    # chunk is one zero-copy slice.
+    if len(rows) == 0:
+        return pa.py_buffer(b"")
+    offsets = np.frombuffer(rows.buffers()[1], dtype=np.int64)[rows.offset:rows.offset + len(rows) + 1]
+    return rows.buffers()[2][int(offsets[0]):int(offsets[-1])]
+
+
+def ndjson_chunk(batch: Batch) -> pa.Buffer:
+    table = _table(batch)
+    parts = []
+    for i, name in enumerate(table.schema.names):
+        parts += [_text(("{" if i == 0 else ",") + json.dumps(name) + ":"), json_values(table.column(i))]
+    return _buffer(_concat(*parts, _text("}\n")))
+
+
+def insert_statements(batch: Batch, table_name: str,
+                      rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT) -> pa.Array:
+    """Multi-row INSERT statements for the batch, `rows_per_statement` rows each, ending in ";\\n"."""
+    table = _table(batch)
+    parts = [_text("(")]
+    for i in range(table.num_columns):
+        parts += [sql_literals(table.column(i)), _text(",")]
+    rows = _concat(*parts[:-1], _text(")"))
+    offsets = np.r_[np.arange(0, table.num_rows, rows_per_statement), table.num_rows].astype(np.int32)
+    bodies = pc.binary_join(pa.ListArray.from_arrays(pa.array(offsets), rows), _text(",\n"))
+    header = f"INSERT INTO {quote_identifier(table_name)} {_column_list(table.schema)} VALUES\n"
+    return _concat(_text(header), bodies, _text(";\n"))
+
+
+def copy_chunk(batch: Batch) -> pa.Buffer:
+    table = _table(batch)
+    fields = [copy_fields(table.column(i)) for i in range(table.num_columns)]
+    return _buffer(_concat(pc.binary_join_element_wise(*fields, _text("\t")), _text("\n")))
+
+
+def copy_statement(table_name: str, schema: pa.Schema) -> str:
+    return f"COPY {quote_identifier(table_name)} {_column_list(schema)} FROM STDIN"
+
+
+def _sql_type(data_type: pa.DataType) -> str:
+    if pa.types.is_boolean(data_type):
+        return "BOOLEAN"
+    if pa.types.is_integer(data_type):
+        # Unsigned values need the next wider signed type; uint64 has none and is stored as an exact decimal.
+        bits = data_type.bit_width * (1 if pa.types.is_signed_integer(data_type) else 2)
+        return "SMALLINT" if bits <= 16 else "INTEGER" if bits <= 32 else "BIGINT" if bits <= 64 else "NUMERIC(20)"
+    if pa.types.is_floating(data_type):
+        return "REAL" if data_type.bit_width <= 32 else "DOUBLE PRECISION"
+    if pa.types.is_date(data_type):
+        return "DATE"
+    if pa.types.is_timestamp(data_type):
+        return "TIMESTAMP"
+    if pa.types.is_dictionary(data_type):
+        return _sql_type(data_type.value_type)
+    return "TEXT"
+
+
+def create_table_sql(table_name: str, schema: pa.Schema) -> str:
+    """CREATE TABLE statement for the batch schema; the type names are understood by Postgres and SQLite."""
+    columns = ",\n".join(f"  {quote_identifier(f.name)} {_sql_type(f.type)}" for f in schema)
+    return f"CREATE TABLE IF NOT EXISTS {quote_identifier(table_name)} (\n{columns}\n);\n"
+
+
+class EmitStats(BaseModel):
+    rows: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes / 2**20 / self.seconds if self.seconds else 0.0
+
+
+def iter_chunks(batches: Iterable[Batch], fmt: str, table_name: str = "data",
+                rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT, create_table: bool = False) -> Iterator[bytes]:
+    """Encoded output of `batches` as byte chunks, one or more per batch."""
+    if fmt not in EMIT_FORMATS:
+        raise ValueError(f"Unsupported emit format: {fmt}")
+    first = True
+    for batch in batches:
+        table = _table(batch)
+        if first and create_table and fmt != "ndjson":
+            yield create_table_sql(table_name, table.schema).encode("utf-8")
+        if first and fmt == "copy":
+            yield f"{copy_statement(table_name, table.schema)};\n".encode("utf-8")
+        first = False
+        if fmt == "ndjson":
+            yield ndjson_chunk(table).to_pybytes()
+        elif fmt == "insert":
+            yield _buffer(insert_statements(table, table_name, rows_per_statement)).to_pybytes()
+        else:
+            yield copy_chunk(table).to_pybytes()
+    if fmt == "copy" and not first:
+        yield b"\\.\n"
+
+
+def write_file(batches: Iterable[Batch], destination: Union[str, Path, BinaryIO], fmt: str,
+               **kwargs) -> EmitStats:
+    """Stream `batches` into a file (or open binary file object) as NDJSON, INSERT statements or a psql COPY script."""
+    stats = EmitStats()
+    start = time.perf_counter()
+
+    def counted() -> Iterator[pa.Table]:
+        for batch in batches:
+            table = _table(batch)
+            stats.rows += table.num_rows
+            yield table
+
+    sink = open(destination, "wb") if isinstance(destination, (str, Path)) else destination
+    try:
+        for chunk in iter_chunks(counted(), fmt, **kwargs):
+            sink.write(chunk)
+            stats.bytes += len(chunk)
+    finally:
+        if sink is not destination:
+            sink.close()
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def load_sqlite(batches: Iterable[Batch], connection: sqlite3.Connection, table_name: str,
+                rows_per_statement: int = DEFAULT_ROWS_PER_STATEMENT, create_table: bool = True) -> EmitStats:
+    """Insert `batches` into an SQLite table with multi-row INSERT statements, in one transaction."""
+    stats = EmitStats()
+    start = time.perf_counter()
+    with connection:
+        for batch in batches:
+            table = _table(batch)
+            if create_table:
+                connection.execute(create_table_sql(table_name, table.schema))
+                create_table = False
+            for statement in insert_statements(table, table_name, rows_per_statement).to_pylist():
+                connection.execute(statement)
+                stats.bytes += len(statement)
+            stats.rows += table.num_rows
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def load_postgres(batches: Iterable[Batch], connection, table_name: str, create_table: bool = True) -> EmitStats:
+    """Stream `batches` into Postgres with COPY FROM STDIN over an open psycopg (3) or psycopg2 connection."""
+    stats = EmitStats()
+    start = time.perf_counter()
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        return stats
+    first = _table(first)
+    statement = copy_statement(table_name, first.schema)
+
+    def chunks() -> Iterator[bytes]:
+        for table in [first] + [_table(b) for b in batches]:
+            chunk = copy_chunk(table).to_pybytes()
+            stats.rows += table.num_rows
+            stats.bytes += len(chunk)
+            yield chunk
+
+    with connection.cursor() as cursor:
+        if create_table:
+            cursor.execute(create_table_sql(table_name, first.schema))
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(statement) as copy:
+                for chunk in chunks():
+                    copy.write(chunk)
+        else:  # psycopg2 reads from a file-like object
+            cursor.copy_expert(statement, _IterReader(chunks()))
+    connection.commit()
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+class _IterReader:
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._pending = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._pending) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emit generated rows as NDJSON, SQL INSERTs or a Postgres COPY "
+                                                 "stream, or load them straight into SQLite.")
+    parser.add_argument("schema", help="Schema file (.json or .yaml)")
+    parser.add_argument("--format", choices=EMIT_FORMATS, default="insert")
+    parser.add_argument("--out", help="Output file")
+    parser.add_argument("--sqlite", help="SQLite database to load into instead of writing a file")
+    parser.add_argument("--table", default="data")
+    parser.add_argument("--rows", type=int)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--rows-per-statement", type=int, default=DEFAULT_ROWS_PER_STATEMENT)
+    args = parser.parse_args()
+    if bool(args.out) == bool(args.sqlite):
+        parser.error("Give exactly one of --out or --sqlite.")
+
+    schema = TableSchema.load(args.schema)
+    if args.rows is not None:
+        schema.set_num_rows(args.rows)
+    if args.seed is not None:
+        schema.seed = args.seed
+    report = QualityReport()
+    batches = schema.generate_batches(args.batch_size, report=report)
+    if args.sqlite:
+        with sqlite3.connect(args.sqlite) as connection:
+            stats = load_sqlite(batches, connection, args.table, args.rows_per_statement)
+    else:
+        stats = write_file(batches, args.out, args.format, table_name=args.table,
+                           rows_per_statement=args.rows_per_statement, create_table=True)
+    report.save(sidecar_path(args.sqlite or args.out))
+    print(f"{stats.rows:,} rows, {stats.bytes / 2**20:,.1f} MB in {stats.seconds:.2f}s "
+          f"({stats.rows_per_second:,.0f} rows/s, {stats.megabytes_per_second:,.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import argparse
+import math
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel
+from data_schema_config.base_column_configs import ColumnConfig, load_column_configs
+from data_schema_config.vocabulary import faker_elements
+
+DEFAULT_REFERENCE_ROWS = 20_000
+DEFAULT_OPTIMIZED_ROWS = 200_000
+DEFAULT_ALPHA = 1e-3
+# Values expected at least this many times in the reference sample get their own cell and frequency check.
+MIN_CELL_COUNT = 10
+OTHER_CELL = "<other>"
+# Largest accepted difference in the share of distinct values between equally sized samples.
+DEFAULT_DISTINCT_TOLERANCE = 0.05
+# Settings each type is checked with by default; types that are not listed use their defaults.
+SAMPLE_CONFIGS = {
+    "Integer": {"min_value": 0, "max_value": 1000},
+    "Float": {"min_value": 0.0, "max_value": 100.0, "precision": 2},
+    "Price": {"min_value": 0.99, "max_value": 999.99, "precision": 2,
+              "distribution": {"kind": "Log-Normal", "mean": 3.0, "std": 1.0}},
+    "Boolean": {"true_probability": 0.3},
+    "Category": {"categories": ["bronze", "silver", "gold", "platinum"], "weights": [0.55, 0.25, 0.15, 0.05]},
+}
+
+
+def ks_2samp(a: np.ndarray, b: np.ndarray, b_effective: Optional[float] = None) -> Tuple[float, float]:
+    """Two-sample Kolmogorov-Smirnov statistic and its asymptotic p-value (conservative for tied values).
+
+    `b_effective` is the number of independent draws `b` is worth, when that is fewer than its length.
+    """
+    a, b = np.sort(a), np.sort(b)
+    points = np.concatenate([a, b])
+    d = float(np.max(np.abs(np.searchsorted(a, points, side="right") / len(a)
+                            - np.searchsorted(b, points, side="right") / len(b))))
+    n_b = b_effective or len(b)
+    en = math.sqrt(len(a) * n_b / (len(a) + n_b))
+    lam = (en + 0.12 + 0.11 / en) * d
+    k = np.arange(1, 101)
+    p = 2 * np.sum((-1.0) ** (k - 1) * np.exp(-2 * k ** 2 * lam ** 2))
+    return d, float(min(max(p, 0.0), 1.0)) if lam > 0 else 1.0
+
+
+def chi2_sf(x: float, df: int) -> float:
+    # Wilson-Hilferty: (x/df)^(1/3) is close to normal, accurate enough for the df seen here.
+    if df < 1:
+        return 1.0
+    z = ((x / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def chi2_homogeneity(a_counts: np.ndarray, b_counts: np.ndarray) -> Tuple[float, int, float]:
+    """Chi-square test that two count vectors over the same cells come from one distribution."""
+    total = a_counts + b_counts
+    keep = total > 0
+    a_counts, b_counts, total = a_counts[keep], b_counts[keep], total[keep]
+    if len(total) < 2:
+        return 0.0, 0, 1.0
+    n_a, n_b = a_counts.sum(), b_counts.sum()
+    share = total / total.sum()
+    expected_a, expected_b = share * n_a, share * n_b
+    stat = float(np.sum((a_counts - expected_a) ** 2 / expected_a) + np.sum((b_counts - expected_b) ** 2 / expected_b))
+    df = len(total) - 1
+    return stat, df, chi2_sf(stat, df)
+
+
+def _cells(a: np.ndarray, b: np.ndarray) -> Tuple[List, np.ndarray, np.ndarray]:
+    """Counts per value in both samples: values expected at least MIN_CELL_COUNT times in `a` get their own cell.
+
+    Rarer values are pooled into one trailing OTHER_CELL, so a sample that repeats values more (or less) often
+    than the other shifts mass into or out of it, however many distinct values either has.
+    """
+    counts = pd.concat([pd.Series(a).value_counts().rename("a"), pd.Series(b).value_counts().rename("b")],
+                       axis=1).fillna(0)
+    share = (counts["a"] + counts["b"]) / (len(a) + len(b))
+    common_mask = (share * len(a) >= MIN_CELL_COUNT).to_numpy()
+    common, rare = counts[common_mask], counts[~common_mask]
+    values = list(common.index)
+    a_counts, b_counts = common["a"].to_numpy(), common["b"].to_numpy()
+    if len(rare):
+        values.append(OTHER_CELL)
+        a_counts = np.append(a_counts, rare["a"].sum())
+        b_counts = np.append(b_counts, rare["b"].sum())
+    return values, a_counts, b_counts
+
+
+def _distinct_share(values: pa.Array) -> float:
+    return len(pc.unique(values)) / len(values) if len(values) else 0.0
+
+
+class EquivalenceResult(BaseModel):
+    type: str
+    reference_rows: int
+    optimized_rows: int
+    optimized_effective_rows: float
+    reference_rows_per_second: float
+    optimized_rows_per_second: float
+    reference_distinct_share: float
+    optimized_distinct_share: float  # Over the first reference_rows optimized values, so both shares are comparable
+    distinct_share_delta: float
+    value_ks: Optional[float] = None  # Numeric types: KS on the values themselves
+    value_ks_p: Optional[float] = None
+    length_ks: Optional[float] = None  # Other types: KS and chi-square on string lengths
+    length_ks_p: Optional[float] = None
+    length_chi2_p: Optional[float] = None
+    value_chi2: float
+    value_chi2_df: int
+    value_chi2_p: float
+    worst_value: Optional[str] = None
+    worst_frequency_z: float = 0.0
+    worst_frequency_p: float = 1.0  # Bonferroni-adjusted over all checked values
+    passed: bool = True
+
+    @property
+    def speedup(self) -> float:
+        return self.optimized_rows_per_second / self.reference_rows_per_second
+
+
+def compare_column(config: ColumnConfig, reference_rows: int = DEFAULT_REFERENCE_ROWS,
+                   optimized_rows: int = DEFAULT_OPTIMIZED_ROWS, alpha: float = DEFAULT_ALPHA,
+                   distinct_tolerance: float = DEFAULT_DISTINCT_TOLERANCE, seed: int = 0) -> EquivalenceResult:
+    """Sample a column's reference and optimized generators and test that they agree in distribution."""
+    config_class = type(config)
+    # Separate streams for the two generators; the reference seeds its own Faker (or random.Random) from its
+    # stream, so no global seed is touched and concurrent checks cannot disturb each other.
+    start = time.perf_counter()
+    reference = config_class.generate_reference(config, reference_rows, np.random.default_rng([seed, 1]))
+    reference_seconds = time.perf_counter() - start
+    config_class.generate_data(config, 256, np.random.default_rng([seed, 2]))  # Vocabulary built outside the timing
+    start = time.perf_counter()
+    optimized = config_class.generate_data(config, optimized_rows, np.random.default_rng([seed, 2]))
+    optimized_seconds = time.perf_counter() - start
+    optimized = pa.array(optimized)
+    if pa.types.is_string(optimized.type):
+        optimized = optimized.cast(pa.large_string())
+    # The reference in the optimized type, so float32 rounding or string width never counts as a difference.
+    reference = pa.array(reference).cast(optimized.type)
+    numeric = pa.types.is_integer(optimized.type) or pa.types.is_floating(optimized.type)
+
+    # Rows sampled from a vocabulary of V draws carry the vocabulary's own sampling noise, so the
+    # optimized sample is worth 1 / (1/m + 1/V) independent rows. The tests use that effective size:
+    # they accept the noise a vocabulary is designed to have and flag anything beyond it. Composed values
+    # and values sampled from Faker's element tables carry no such noise.
+    vocabulary = getattr(config_class, "vocabulary", None)
+    capped = (vocabulary is not None and not getattr(config_class, "composed", False)
+              and faker_elements(config_class.faker_provider) is None)
+    inverse = 1 / optimized_rows + (1 / len(vocabulary(config)) if capped else 0.0)
+    effective = 1 / inverse
+    scale = effective / optimized_rows
+
+    ref_values = reference.to_numpy(zero_copy_only=False)
+    opt_values = optimized.to_numpy(zero_copy_only=False)
+    tests = {}
+    if numeric:
+        tests["value_ks"], tests["value_ks_p"] = ks_2samp(ref_values, opt_values, effective)
+    else:
+        ref_lengths = pc.utf8_length(reference.cast(pa.large_string())).to_numpy(zero_copy_only=False)
+        opt_lengths = pc.utf8_length(optimized.cast(pa.large_string())).to_numpy(zero_copy_only=False)
+        tests["length_ks"], tests["length_ks_p"] = ks_2samp(ref_lengths, opt_lengths, effective)
+        _, ref_hist, opt_hist = _cells(ref_lengths, opt_lengths)
+        tests["length_chi2_p"] = chi2_homogeneity(ref_hist, opt_hist * scale)[2]
+
+    values, ref_counts, opt_counts = _cells(ref_values, opt_values)
+    value_chi2, value_df, value_p = chi2_homogeneity(ref_counts, opt_counts * scale)
+    # Largest frequency gap among individual values, in standard errors of the difference.
+    worst_value, worst_z, worst_p = None, 0.0, 1.0
+    if len(values) > 1:
+        p = (ref_counts + opt_counts * scale) / (reference_rows + effective)
+        se = np.sqrt(p * (1 - p) * (1 / reference_rows + inverse))
+        z = np.abs(ref_counts / reference_rows - opt_counts / optimized_rows) / np.where(se > 0, se, np.inf)
+        i = int(np.argmax(z))
+        worst_value, worst_z = str(values[i]), float(z[i])
+        worst_p = min(1.0, len(values) * math.erfc(worst_z / math.sqrt(2)))
+
+    # How often values repeat depends on sample size, so both shares are taken over reference_rows values.
+    reference_share = _distinct_share(reference)
+    optimized_share = _distinct_share(optimized.slice(0, reference_rows))
+    delta = optimized_share - reference_share
+    p_values = [p for name, p in tests.items() if name.endswith("_p")] + [value_p, worst_p]
+
+    return EquivalenceResult(
+        type=config.type_name, reference_rows=reference_rows, optimized_rows=optimized_rows,
+        optimized_effective_rows=effective,
+        reference_rows_per_second=reference_rows / reference_seconds,
+        optimized_rows_per_second=optimized_rows / max(optimized_seconds, 1e-9),
+        reference_distinct_share=reference_share, optimized_distinct_share=optimized_share,
+        distinct_share_delta=delta, **tests,
+        value_chi2=value_chi2, value_chi2_df=value_df, value_chi2_p=value_p,
+        worst_value=worst_value, worst_frequency_z=worst_z, worst_frequency_p=worst_p,
+        passed=min(p_values) >= alpha and abs(delta) <= distinct_tolerance,
+    )
+
+
+def reference_types() -> Dict[str, type]:
+    """Registered column types that keep a per-row reference implementation next to their fast path."""
+    return {name: cls for name, cls in load_column_configs().items() if hasattr(cls, "generate_reference")}
+
+
+def run(types: Optional[Sequence[str]] = None, **kwargs) -> pd.DataFrame:
+    available = reference_types()
+    results = []
+    for name in types or available:
+        if name not in available:
+            raise ValueError(f"Column type '{name}' has no reference generator to compare against.")
+        results.append(compare_column(available[name](name=name, **SAMPLE_CONFIGS.get(name, {})), **kwargs))
+    frame = pd.DataFrame([r.model_dump() for r in results]).set_index("type")
+    frame.insert(4, "speedup", [r.speedup for r in results])
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that each column type's optimized generator matches its "
+                                                 "per-row reference in distribution, and time both.")
+    parser.add_argument("--types", default="", help="Comma-separated column types (default: all with a reference)")
+    parser.add_argument("--reference-rows", type=int, default=DEFAULT_REFERENCE_ROWS)
+    parser.add_argument("--optimized-rows", type=int, default=DEFAULT_OPTIMIZED_ROWS)
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    parser.add_argument("--distinct-tolerance", type=float, default=DEFAULT_DISTINCT_TOLERANCE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    frame = run([t for t in args.types.split(",") if t], reference_rows=args.reference_rows,
+                optimized_rows=args.optimized_rows, alpha=args.alpha, distinct_tolerance=args.distinct_tolerance,
+                seed=args.seed)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(frame)
+    if args.json:
+        frame.reset_index().to_json(args.json, orient="records", indent=2)
+    sys.exit(0 if frame["passed"].all() else 1)
+
+
+if __name__ == "__main__":
+    main()
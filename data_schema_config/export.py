@@ -0,0 +1,310 @@
+import argparse
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+from data_schema_config.quality import QUALITY_FILE, QualityReport
+from data_schema_config.shards import MANIFEST_FILE, file_sha256
+from data_schema_config.table_schema import TableSchema
+
+DEFAULT_TARGET_BYTES = 128 * 1024 * 1024
+# Rows are buffered per partition up to this many before they are written, so Parquet row groups stay
+# reasonably large even when each incoming batch spreads over many partitions.
+ROW_GROUP_ROWS = 64 * 1024
+MIN_WRITE_ROWS = 1024
+DEFAULT_MAX_OPEN_FILES = 64
+# Hive's (and pyarrow.dataset's) directory name for null partition values.
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+EXPORT_FORMATS = {"parquet": ".parquet", "csv": ".csv"}
+# The View & Download page only writes exports below this directory.
+EXPORT_ROOT = os.environ.get("RETAILDATAFORGE_EXPORT_ROOT", "exports")
+
+
+class ExportFile(BaseModel):
+    path: str  # Relative to the export directory
+    partition: Dict[str, Optional[str]]
+    num_rows: int
+    num_bytes: int
+    sha256: str
+
+
+class ExportManifest(BaseModel):
+    file_format: str
+    partition_by: List[str]
+    target_bytes: int
+    max_rows_per_file: Optional[int] = None
+    num_rows: int
+    files: List[ExportFile]
+    created_at: str
+
+    def save(self, out_dir: Union[str, Path]):
+        path = Path(out_dir) / MANIFEST_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, out_dir: Union[str, Path]) -> "ExportManifest":
+        return cls.model_validate_json((Path(out_dir) / MANIFEST_FILE).read_text(encoding="utf-8"))
+
+
+def partition_dir(values: Dict[str, Optional[str]]) -> str:
+    return "/".join(f"{name}={NULL_PARTITION if value is None else quote(value, safe='')}"
+                    for name, value in values.items())
+
+
+def group_indices(table: pa.Table, columns: Sequence[str]) -> Tuple[np.ndarray, List[tuple]]:
+    """Row order that makes each distinct combination of `columns` contiguous, and (values, start, stop) per group.
+
+    The order is a stable argsort of the group ids, so rows keep their original order within a group;
+    only this batch is reordered.
+    """
+    if not columns:
+        return np.arange(table.num_rows), [({}, 0, table.num_rows)]
+    keys = np.zeros(table.num_rows, dtype=np.int64)
+    dictionaries, codes = [], []
+    for name in columns:
+        encoded = table.column(name).combine_chunks().dictionary_encode(null_encoding="encode")
+        code = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+        keys = keys * len(encoded.dictionary) + code
+        dictionaries.append(encoded.dictionary.to_pylist())
+        codes.append(code)
+    _, inverse = np.unique(keys, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.r_[0, np.cumsum(np.bincount(inverse))]
+    groups = []
+    for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        first = order[start]
+        values = {}
+        for name, dictionary, code in zip(columns, dictionaries, codes):
+            value = dictionary[code[first]]
+            values[name] = None if value is None else str(value)
+        groups.append((values, start, stop))
+    return order, groups
+
+
+class _OpenFile:
+    def __init__(self, path: Path, file_format: str, schema: pa.Schema):
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.sink = pa.OSFile(str(self.tmp), "wb")
+        self.writer = pq.ParquetWriter(self.sink, schema) if file_format == "parquet" \
+            else pa_csv.CSVWriter(self.sink, schema)
+        self.num_rows = 0
+
+    @property
+    def num_bytes(self) -> int:
+        return self.sink.tell()
+
+    def write(self, table: pa.Table):
+        self.writer.write_table(table)
+        self.num_rows += table.num_rows
+
+    def close(self) -> int:
+        self.writer.close()
+        self.sink.close()
+        # Renamed only once complete, so an interrupted export never leaves a file that looks finished.
+        os.replace(self.tmp, self.path)
+        return self.path.stat().st_size
+
+
+class _Partition:
+    def __init__(self, values: Dict[str, Optional[str]], directory: Path):
+        self.values = values
+        self.directory = directory
+        self.pending: List[pa.Table] = []
+        self.pending_rows = 0
+        self.file: Optional[_OpenFile] = None
+        self.next_part = 0
+
+
+class PartitionedWriter:
+    """Streams batches into Hive-style partition directories, rolling files at a target size.
+
+    The dataset is never sorted or held in memory beyond a row group per partition: each batch is split
+    by its partition values and appended to that partition's current file. Files roll over once they reach `target_bytes`
+    (approximately, estimated from the bytes per row written so far) or exactly `max_rows_per_file` rows.
+    Partition columns are encoded in the directory names and left out of the files.
+    """
+
+    def __init__(self, out_dir: Union[str, Path], partition_by: Sequence[str] = (), file_format: str = "parquet",
+                 target_bytes: int = DEFAULT_TARGET_BYTES, max_rows_per_file: Optional[int] = None,
+                 row_group_rows: int = ROW_GROUP_ROWS, max_open_files: int = DEFAULT_MAX_OPEN_FILES):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {file_format}")
+        if target_bytes < 1 or (max_rows_per_file is not None and max_rows_per_file < 1):
+            raise ValueError("File size and row limits must be positive.")
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.partition_by = list(partition_by)
+        self.file_format = file_format
+        self.target_bytes = target_bytes
+        self.max_rows_per_file = max_rows_per_file
+        self.row_group_rows = max(1, row_group_rows)
+        self.max_open_files = max(1, max_open_files)
+        self.schema: Optional[pa.Schema] = None
+        self.files: List[ExportFile] = []
+        self.num_rows = 0
+        self._partitions: Dict[str, _Partition] = {}
+        self._open: "OrderedDict[str, _Partition]" = OrderedDict()  # Least recently written first
+        self._written_rows = 0
+        self._written_bytes = 0
+
+    def __enter__(self) -> "PartitionedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _prepare(self, data: Union[pd.DataFrame, pa.Table, pa.RecordBatch]) -> pa.Table:
+        if isinstance(data, pd.DataFrame):
+            data = pa.Table.from_pandas(data, preserve_index=False)
+        elif isinstance(data, pa.RecordBatch):
+            data = pa.Table.from_batches([data])
+        if self.schema is None:
+            missing = [name for name in self.partition_by if name not in data.schema.names]
+            if missing:
+                raise ValueError(f"Partition column(s) not found: {', '.join(missing)}")
+            if len(self.partition_by) >= len(data.schema.names):
+                raise ValueError("At least one column must remain outside the partition columns.")
+            self.schema = pa.schema([f for f in data.schema if f.name not in self.partition_by])
+        return data
+
+    def write(self, data: Union[pd.DataFrame, pa.Table, pa.RecordBatch]):
+        table = self._prepare(data)
+        order, groups = group_indices(table, self.partition_by)
+        # One gather for the whole batch; each partition then gets a zero-copy slice of it.
+        ordered = table.drop_columns(self.partition_by).cast(self.schema).take(pa.array(order))
+        for values, start, stop in groups:
+            directory = partition_dir(values)
+            partition = self._partitions.get(directory)
+            if partition is None:
+                partition = self._partitions[directory] = _Partition(values, self.out_dir / directory)
+            partition.pending.append(ordered.slice(start, stop - start))
+            partition.pending_rows += stop - start
+            if partition.pending_rows >= self.row_group_rows:
+                self._flush(directory, partition)
+        self.num_rows += table.num_rows
+
+    def _bytes_per_row(self, partition: _Partition, table: pa.Table) -> float:
+        if partition.file is not None and partition.file.num_rows:
+            return partition.file.num_bytes / partition.file.num_rows
+        if self._written_rows:
+            return self._written_bytes / self._written_rows
+        return max(table.nbytes / max(table.num_rows, 1), 1.0)
+
+    def _flush(self, directory: str, partition: _Partition):
+        if not partition.pending_rows:
+            return
+        table = pa.concat_tables(partition.pending)
+        partition.pending, partition.pending_rows = [], 0
+        while table.num_rows:
+            if partition.file is None:
+                self._open_file(directory, partition)
+            file = partition.file
+            per_row = self._bytes_per_row(partition, table)
+            capacity = int((self.target_bytes - file.num_bytes) / per_row)
+            # Near the end of a file only half the estimated room is filled per write, so the estimate is
+            # corrected by each write and the last one overshoots by a few rows at most.
+            capacity = max(1, capacity if capacity <= MIN_WRITE_ROWS else capacity // 2)
+            if self.max_rows_per_file is not None:
+                capacity = min(capacity, self.max_rows_per_file - file.num_rows)
+            chunk, table = table.slice(0, capacity), table.slice(capacity)
+            before = file.num_bytes
+            file.write(chunk)
+            self._written_rows += chunk.num_rows
+            self._written_bytes += file.num_bytes - before
+            self._open.move_to_end(directory)
+            full_rows = self.max_rows_per_file is not None and file.num_rows >= self.max_rows_per_file
+            if full_rows or file.num_bytes + self._bytes_per_row(partition, chunk) > self.target_bytes:
+                self._close_file(partition)
+                self._open.pop(directory, None)
+
+    def _open_file(self, directory: str, partition: _Partition):
+        while len(self._open) >= self.max_open_files:
+            _, oldest = self._open.popitem(last=False)
+            self._close_file(oldest)
+        partition.directory.mkdir(parents=True, exist_ok=True)
+        path = partition.directory / f"part-{partition.next_part:05d}{EXPORT_FORMATS[self.file_format]}"
+        partition.next_part += 1
+        partition.file = _OpenFile(path, self.file_format, self.schema)
+        self._open[directory] = partition
+
+    def _close_file(self, partition: _Partition):
+        file, partition.file = partition.file, None
+        if file is None:
+            return
+        num_bytes = file.close()
+        self.files.append(ExportFile(path=file.path.relative_to(self.out_dir).as_posix(), partition=partition.values,
+                                     num_rows=file.num_rows, num_bytes=num_bytes, sha256=file_sha256(file.path)))
+
+    def close(self) -> ExportManifest:
+        for directory, partition in self._partitions.items():
+            self._flush(directory, partition)
+        for partition in list(self._open.values()):
+            self._close_file(partition)
+        self._open.clear()
+        manifest = ExportManifest(file_format=self.file_format, partition_by=self.partition_by,
+                                  target_bytes=self.target_bytes, max_rows_per_file=self.max_rows_per_file,
+                                  num_rows=self.num_rows, files=sorted(self.files, key=lambda f: f.path),
+                                  created_at=datetime.now(timezone.utc).isoformat())
+        manifest.save(self.out_dir)
+        return manifest
+
+
+def resolve_export_dir(name: str, root: Union[str, Path] = EXPORT_ROOT) -> Path:
+    """`root/name`, refusing absolute paths and `..` that would leave `root`."""
+    root = Path(root).resolve()
+    path = (root / name).resolve()
+    if not name.strip() or Path(name).is_absolute() or not path.is_relative_to(root):
+        raise ValueError(f"Export directory must be a relative path inside {root}.")
+    return path
+
+
+def export_batches(batches: Iterable[Union[pd.DataFrame, pa.Table, pa.RecordBatch]], out_dir: Union[str, Path],
+                   report: Optional[QualityReport] = None, **kwargs) -> ExportManifest:
+    """Write `batches` under `out_dir`; a report filled while they were generated is saved beside the manifest."""
+    writer = PartitionedWriter(out_dir, **kwargs)
+    for batch in batches:
+        writer.write(batch)
+    manifest = writer.close()
+    if report is not None:
+        report.save(Path(out_dir) / QUALITY_FILE)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a schema into Hive-partitioned files of a target size.")
+    parser.add_argument("schema", help="Schema file (.json or .yaml)")
+    parser.add_argument("out_dir")
+    parser.add_argument("--rows", type=int, help="Row count (defaults to the schema's num_rows)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--partition-by", default="", help="Comma-separated partition columns")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="parquet")
+    parser.add_argument("--target-mb", type=float, default=DEFAULT_TARGET_BYTES / 2**20)
+    parser.add_argument("--max-rows-per-file", type=int)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    schema = TableSchema.load(args.schema)
+    if args.rows is not None:
+        schema.set_num_rows(args.rows)
+    if args.seed is not None:
+        schema.seed = args.seed
+    report = QualityReport()
+    manifest = export_batches(schema.generate_batches(args.batch_size, report=report), args.out_dir, report=report,
+                              partition_by=[c for c in args.partition_by.split(",") if c], file_format=args.format,
+                              target_bytes=int(args.target_mb * 2**20), max_rows_per_file=args.max_rows_per_file)
+    print(f"Wrote {manifest.num_rows:,} rows into {len(manifest.files)} file(s) under {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel, Field
+from data_schema_config.nulls import apply_null_mask, null_mask
+from data_schema_config.streams import BLOCK_ROWS, NULLS_STREAM, block_rng, column_key, fresh_seed
+from data_schema_config.table_schema import TableSchema
+
+HISTORY_COLUMNS = ["version", "change", "valid_from", "valid_to"]
+
+
+class HistoryConfig(BaseModel):
+    """Daily SCD type 2 deltas on top of a TableSchema base table."""
+
+    days: int = Field(30, ge=0)
+    start_date: date = date(2024, 1, 1)
+    key_column: str = "id"
+    insert_fraction: float = Field(0.002, ge=0)  # New keys per day, relative to the base table
+    update_fraction: float = Field(0.01, ge=0, le=1)  # Share of live keys changed per day
+    delete_fraction: float = Field(0.001, ge=0, le=1)  # Share of live keys removed per day
+    update_columns: List[str] = Field(default_factory=list)  # Columns that change on update; empty = all
+
+
+# A column's values are kept in the chunks they were generated in; past this many, live values are compacted.
+MAX_CHUNKS = 64
+
+
+def _concat(arrays: list):
+    # Part of the documented ExtensionArray interface; avoids building a Series per chunk.
+    return type(arrays[0])._concat_same_type(arrays)
+
+
+class _Log:
+    # Values appended chunk by chunk as generated (numpy or Arrow-backed) and read back by position.
+    def __init__(self):
+        self.chunks = []
+        self.starts = [0]
+
+    def __len__(self) -> int:
+        return self.starts[-1]
+
+    def append(self, values) -> np.ndarray:
+        values = pd.array(values) if not isinstance(values, pd.api.extensions.ExtensionArray) else values
+        if self.chunks and values.dtype != self.chunks[0].dtype:
+            values = values.astype(self.chunks[0].dtype)
+        start = len(self)
+        self.chunks.append(values)
+        self.starts.append(start + len(values))
+        return np.arange(start, start + len(values))
+
+    def take(self, positions: np.ndarray):
+        if len(self.chunks) == 1:
+            return self.chunks[0].take(positions)
+        chunk = np.searchsorted(self.starts, positions, side="right") - 1
+        order = np.argsort(chunk, kind="stable")
+        bounds = np.searchsorted(chunk[order], np.arange(len(self.chunks) + 1))
+        pieces = [self.chunks[c].take(positions[order[lo:hi]] - self.starts[c])
+                  for c, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])) if hi > lo]
+        if not pieces:
+            return self.chunks[0][:0]
+        inverse = np.empty(len(order), dtype=np.intp)
+        inverse[order] = np.arange(len(order))
+        return _concat(pieces).take(inverse)
+
+
+class _State:
+    # The current version of every key seen so far, plus per-key version and valid_from. Columns stay in
+    # the numpy/Arrow arrays they were generated as: an update appends the new values of the changed keys
+    # to the column's log and repoints those keys, instead of rewriting the column.
+    def __init__(self, columns: List[str], mutable: List[str], capacity: int):
+        self.order = columns
+        self.logs = {name: _Log() for name in columns}
+        self.position = {name: np.zeros(capacity, dtype=np.int64) for name in mutable}
+        self.size = 0
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.version = np.zeros(capacity, dtype=np.int32)
+        self.valid_from = np.zeros(capacity, dtype=np.int32)
+
+    def append(self, frame: pd.DataFrame) -> np.ndarray:
+        keys = np.arange(self.size, self.size + len(frame))
+        for name in self.order:
+            positions = self.logs[name].append(frame[name].array)
+            if name in self.position:
+                self.position[name][keys] = positions
+            else:
+                self._compact(name)
+        self.size += len(frame)
+        return keys
+
+    def rows(self, keys: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({name: self.logs[name].take(self.position[name][keys] if name in self.position else keys)
+                             for name in self.order})
+
+    def update(self, name: str, keys: np.ndarray, values):
+        self.position[name][keys] = self.logs[name].append(values)
+        self._compact(name)
+
+    def _compact(self, name: str):
+        log = self.logs[name]
+        if len(log.chunks) <= MAX_CHUNKS:
+            return
+        if name in self.position:
+            # Superseded values are dropped, so a column never holds more than one value per key.
+            positions = self.position[name][:self.size]
+            log.chunks, log.starts = [log.take(positions)], [0, self.size]
+            self.position[name][:self.size] = np.arange(self.size)
+        else:
+            log.chunks, log.starts = [_concat(log.chunks)], [0, len(log)]
+
+
+def _dates(start: date, offsets: np.ndarray) -> np.ndarray:
+    return np.datetime64(start, "D") + offsets.astype("timedelta64[D]")
+
+
+def _versions(state: _State, keys: np.ndarray, change: str, config: HistoryConfig,
+              valid_to: Union[int, None]) -> pd.DataFrame:
+    frame = state.rows(keys)
+    frame.insert(0, config.key_column, keys.astype(np.int64))
+    frame["version"] = state.version[keys]
+    frame["change"] = pd.array([change] * len(keys), dtype=pd.ArrowDtype(pa.large_string()))
+    frame["valid_from"] = _dates(config.start_date, state.valid_from[keys])
+    frame["valid_to"] = (_dates(config.start_date, np.full(len(keys), valid_to)) if valid_to is not None
+                         else np.full(len(keys), np.datetime64("NaT"), dtype="datetime64[D]"))
+    return frame
+
+
+def iter_history(schema: TableSchema, config: HistoryConfig) -> Iterator[Tuple[date, pd.DataFrame]]:
+    """Yield (day, rows) partitions: the base snapshot first, then one delta per day.
+
+    A delta holds only changed keys: the closed previous version (valid_to set) and the new open version
+    for updates, the closed version for deletes, and the open version for inserts.
+    """
+    clash = [c for c in [config.key_column] + HISTORY_COLUMNS if c in {col.name for col in schema.columns}]
+    if clash:
+        raise ValueError(f"Column name(s) reserved for history tracking: {', '.join(clash)}")
+    names = {col.name for col in schema.columns}
+    unknown = [c for c in config.update_columns if c not in names]
+    if unknown:
+        raise ValueError(f"Unknown update column(s): {', '.join(unknown)}")
+
+    seed = schema.seed if schema.seed is not None else fresh_seed()
+    num_base = schema.num_rows
+    inserts_per_day = int(round(config.insert_fraction * num_base))
+    universe = schema.model_copy(update={"seed": seed, "num_rows": num_base + inserts_per_day * config.days})
+    plan = {col.name: (col, generate) for col, generate in universe.generation_plan()}
+    update_columns = config.update_columns or list(plan)
+    state = _State(list(plan), update_columns, universe.num_rows)
+
+    # Rows are generated block by block as each snapshot needs them: the base table first, then each
+    # day's inserts, which are simply the next rows of the same random-access row space.
+    for batch in universe.generate_range_batches(0, num_base, BLOCK_ROWS):
+        state.alive[state.append(batch)] = True
+    yield config.start_date, _versions(state, np.arange(num_base), "insert", config, None)
+    inserts = (universe.generate_range_batches(num_base, universe.num_rows, inserts_per_day)
+               if inserts_per_day else iter(()))
+
+    for day in range(1, config.days + 1):
+        rng = block_rng(seed, column_key("history:changes"), day)
+        live = np.flatnonzero(state.alive)
+        n_update = int(round(config.update_fraction * len(live)))
+        n_delete = int(round(config.delete_fraction * len(live)))
+        # One draw without replacement, split in two, so no key is updated and deleted on the same day.
+        changed = rng.choice(live, size=min(n_update + n_delete, len(live)), replace=False)
+        updated, deleted = np.sort(changed[:n_update]), np.sort(changed[n_update:])
+
+        pieces = [
+            _versions(state, updated, "update", config, day),
+            _versions(state, deleted, "delete", config, day),
+        ]
+        state.alive[deleted] = False
+
+        if len(updated):
+            for name in update_columns:
+                col, generate = plan[name]
+                key = column_key(f"history:{name}")
+                values = generate(col, len(updated), block_rng(seed, key, day))
+                values = apply_null_mask(values, null_mask(len(updated), col.null_fraction,
+                                                           block_rng(seed, key, day, NULLS_STREAM)))
+                state.update(name, updated, values)
+            state.version[updated] += 1
+            state.valid_from[updated] = day
+            pieces.append(_versions(state, updated, "update", config, None))
+
+        inserted = state.append(next(inserts)) if inserts_per_day else np.arange(0)
+        state.alive[inserted] = True
+        state.valid_from[inserted] = day
+        pieces.append(_versions(state, inserted, "insert", config, None))
+
+        yield config.start_date + timedelta(days=day), pd.concat(pieces, ignore_index=True)
+
+
+def write_history(schema: TableSchema, config: HistoryConfig, out_dir: Union[str, Path]) -> List[Path]:
+    """Write one append-only Parquet partition per day under `out_dir/change_date=YYYY-MM-DD/`."""
+    paths = []
+    for day, frame in iter_history(schema, config):
+        partition = Path(out_dir) / f"change_date={day.isoformat()}"
+        partition.mkdir(parents=True, exist_ok=True)
+        paths.append(partition / "part-0.parquet")
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), str(paths[-1]))
+    return paths
+
+
+def read_history(out_dir: Union[str, Path], key_column: str = "id") -> pd.DataFrame:
+    """Assemble the full SCD2 table: one row per (key, version), closed versions carrying their valid_to."""
+    frames = [pq.read_table(str(path)).to_pandas() for path in sorted(Path(out_dir).glob("change_date=*/*.parquet"))]
+    history = pd.concat(frames, ignore_index=True)
+    # A closed row supersedes the open row written for the same version on an earlier day.
+    history = history.sort_values([key_column, "version", "valid_to"], na_position="first")
+    return history.drop_duplicates([key_column, "version"], keep="last").reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a base table plus daily SCD2 delta partitions.")
+    parser.add_argument("schema", help="Schema file (.json or .yaml).")
+    parser.add_argument("out_dir")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--start-date", type=date.fromisoformat, default=date(2024, 1, 1))
+    parser.add_argument("--key-column", default="id")
+    parser.add_argument("--insert-fraction", type=float, default=0.002)
+    parser.add_argument("--update-fraction", type=float, default=0.01)
+    parser.add_argument("--delete-fraction", type=float, default=0.001)
+    parser.add_argument("--update-columns", default="", help="Comma-separated; defaults to every column.")
+    args = parser.parse_args()
+    config = HistoryConfig(days=args.days, start_date=args.start_date, key_column=args.key_column,
+                           insert_fraction=args.insert_fraction, update_fraction=args.update_fraction,
+                           delete_fraction=args.delete_fraction,
+                           update_columns=[c for c in args.update_columns.split(",") if c])
+    paths = write_history(TableSchema.load(args.schema), config, args.out_dir)
+    print(f"Wrote {len(paths)} partitions to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import re
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from data_schema_config.base_column_configs import ColumnConfig
+from data_schema_config.column_formats.categorical_column_configs import (
+    BooleanColumnConfig,
+    CategoryColumnConfig,
+    CityColumnConfig,
+    CountryColumnConfig,
+)
+from data_schema_config.column_formats.numeric_column_configs import FloatColumnConfig, IntegerColumnConfig
+from data_schema_config.column_formats.text_column_configs import (
+    AddressColumnConfig,
+    EmailColumnConfig,
+    FirstNameColumnConfig,
+    LastNameColumnConfig,
+    PersonNameColumnConfig,
+    PhoneNumberColumnConfig,
+    StringColumnConfig,
+)
+from data_schema_config.distributions import Distribution, DistributionType
+from data_schema_config.sketches import HeavyHitters, ReservoirSample
+from data_schema_config.table_schema import TableSchema
+
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[A-Za-z]{2,}$")
+PHONE_RE = re.compile(r"^[+()\d][\d\s().x+-]{6,}$")
+
+# Column-name hints for text columns that map onto a dedicated generator.
+NAME_HINTS = [
+    (re.compile(r"e_?mail"), EmailColumnConfig),
+    (re.compile(r"phone"), PhoneNumberColumnConfig),
+    (re.compile(r"first_?name"), FirstNameColumnConfig),
+    (re.compile(r"last_?name|surname"), LastNameColumnConfig),
+    (re.compile(r"address"), AddressColumnConfig),
+    (re.compile(r"country"), CountryColumnConfig),
+    (re.compile(r"city"), CityColumnConfig),
+    (re.compile(r"^(full_|customer_|person_)?name$"), PersonNameColumnConfig),
+]
+
+
+class ColumnProfile:
+    """Bounded-memory statistics for one column, updated batch by batch."""
+
+    def __init__(self, name: str, arrow_type: pa.DataType, sample_size: int = 8192, top_k: int = 64,
+                 seed: Optional[int] = None):
+        self.name = name
+        self.arrow_type = arrow_type
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.max_length = 0
+        self.true_count = 0
+        self.sample = ReservoirSample(sample_size, seed=seed)
+        self.heavy_hitters = HeavyHitters(top_k)
+
+    @property
+    def kind(self) -> str:
+        t = self.arrow_type
+        if pa.types.is_boolean(t):
+            return "boolean"
+        if pa.types.is_integer(t):
+            return "integer"
+        if pa.types.is_floating(t) or pa.types.is_decimal(t):
+            return "float"
+        return "text"
+
+    def update(self, array: pa.Array):
+        self.count += len(array)
+        self.nulls += array.null_count
+        values = array.drop_null()
+        if not len(values):
+            return
+
+        kind = self.kind
+        if kind == "boolean":
+            self.true_count += int(pc.sum(values).as_py() or 0)
+            return
+
+        if kind in ("integer", "float"):
+            bounds = pc.min_max(values)
+            lo, hi = bounds["min"].as_py(), bounds["max"].as_py()
+            self.min = lo if self.min is None else min(self.min, lo)
+            self.max = hi if self.max is None else max(self.max, hi)
+            self.sample.update(values.to_numpy(zero_copy_only=False).astype(np.float64, copy=False))
+            counts = pc.value_counts(values)
+            self.heavy_hitters.update_counts(counts.field("values").to_numpy(zero_copy_only=False),
+                                             counts.field("counts").to_numpy())
+            return
+
+        values = values.cast(pa.string())
+        self.max_length = max(self.max_length, int(pc.max(pc.utf8_length(values)).as_py()))
+        counts = pc.value_counts(values)
+        self.heavy_hitters.update_counts(counts.field("values").to_numpy(zero_copy_only=False),
+                                         counts.field("counts").to_numpy())
+        self.sample.update(values.to_numpy(zero_copy_only=False))
+
+    @property
+    def null_fraction(self) -> float:
+        return self.nulls / self.count if self.count else 0.0
+
+    def to_column_config(self, n_bins: int = 32, category_coverage: float = 0.99) -> ColumnConfig:
+        common = dict(name=self.name, null_fraction=round(self.null_fraction, 6))
+        kind = self.kind
+        non_null = self.count - self.nulls
+
+        if kind == "boolean":
+            return BooleanColumnConfig(true_probability=self.true_count / non_null if non_null else 0.5, **common)
+
+        if kind in ("integer", "float"):
+            if self.min is None:
+                return IntegerColumnConfig(**common) if kind == "integer" else FloatColumnConfig(**common)
+            if self.heavy_hitters.coverage() >= category_coverage:
+                # Few distinct values (flags, codes, quantities): keep exactly those values and their frequencies.
+                top = self.heavy_hitters.top()
+                distribution = Distribution(kind=DistributionType.DISCRETE, values=[float(v) for v, _ in top],
+                                            weights=[c / self.heavy_hitters.total for _, c in top])
+            else:
+                edges, weights = self.sample.histogram(n_bins)
+                distribution = Distribution(kind=DistributionType.EMPIRICAL, bin_edges=edges, weights=weights)
+            if kind == "integer":
+                return IntegerColumnConfig(min_value=int(self.min), max_value=int(self.max),
+                                           distribution=distribution, **common)
+            return FloatColumnConfig(min_value=float(self.min), max_value=float(self.max),
+                                     precision=_detect_precision(self.sample.values),
+                                     distribution=distribution, **common)
+
+        lowered = self.name.lower().replace(" ", "_")
+        sample = [v for v in self.sample.values if isinstance(v, str)]
+        if sample and all(EMAIL_RE.match(v) for v in sample):
+            return EmailColumnConfig(**common)
+        # Low-cardinality columns keep their observed frequencies, even when the name suggests a generator.
+        if self.heavy_hitters.coverage() >= category_coverage:
+            top = self.heavy_hitters.top()
+            return CategoryColumnConfig(categories=[str(v) for v, _ in top],
+                                        weights=[c / self.heavy_hitters.total for _, c in top], **common)
+        for pattern, config_cls in NAME_HINTS:
+            if pattern.search(lowered):
+                return config_cls(**common)
+        if sample and all(PHONE_RE.match(v) for v in sample):
+            return PhoneNumberColumnConfig(**common)
+        return StringColumnConfig(max_length=max(self.max_length, 1), **common)
+
+
+def _detect_precision(values: np.ndarray, max_precision: int = 6) -> int:
+    for precision in range(max_precision + 1):
+        if np.allclose(values, np.round(values, precision), rtol=0, atol=10 ** -(max_precision + 2)):
+            return precision
+    return max_precision
+
+
+def iter_record_batches(source: Union[str, Path, BinaryIO], batch_size: int = DEFAULT_BATCH_SIZE,
+                        file_format: Optional[str] = None) -> Iterator[pa.RecordBatch]:
+    # Both readers stream: only one batch (plus reader buffers) is resident at a time.
+    if file_format is None:
+        name = str(source) if isinstance(source, (str, Path)) else getattr(source, "name", "")
+        file_format = "parquet" if Path(name).suffix.lower() in (".parquet", ".pq") else "csv"
+    if file_format == "parquet":
+        yield from pq.ParquetFile(source).iter_batches(batch_size=batch_size)
+        return
+    # Empty cells (and the usual NULL / NA markers) are nulls in text columns too, not empty strings.
+    reader = pa_csv.open_csv(source, read_options=pa_csv.ReadOptions(block_size=batch_size * 256),
+                             convert_options=pa_csv.ConvertOptions(strings_can_be_null=True))
+    for batch in reader:
+        yield batch
+
+
+def profile_batches(batches: Iterator[pa.RecordBatch], sample_size: int = 8192, top_k: int = 64,
+                    seed: Optional[int] = None) -> Dict[str, ColumnProfile]:
+    profiles: Dict[str, ColumnProfile] = {}
+    for batch in batches:
+        if not profiles:
+            profiles = {field.name: ColumnProfile(field.name, field.type, sample_size, top_k, seed)
+                        for field in batch.schema}
+        for field, column in zip(batch.schema, batch.columns):
+            profiles[field.name].update(column)
+    return profiles
+
+
+def infer_table_schema(source: Union[str, Path, BinaryIO], batch_size: int = DEFAULT_BATCH_SIZE,
+                       sample_size: int = 8192, top_k: int = 64, n_bins: int = 32, seed: Optional[int] = None,
+                       file_format: Optional[str] = None) -> TableSchema:
+    profiles = profile_batches(iter_record_batches(source, batch_size, file_format), sample_size, top_k, seed)
+    schema = TableSchema()
+    for profile in profiles.values():
+        schema.add_col_config(profile.to_column_config(n_bins=n_bins))
+    rows = next(iter(profiles.values())).count if profiles else 0
+    schema.set_num_rows(max(rows, 1))
+    return schema
@@ -0,0 +1,129 @@
+import argparse
+import hashlib
+import os
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from data_schema_config.base_column_configs import get_column_config_class
+from data_schema_config.inference import DEFAULT_BATCH_SIZE, iter_record_batches
+from data_schema_config.vocabulary import FakerColumnConfig
+
+MASKING_KEY_ENV = "RETAILDATAFORGE_MASKING_KEY"
+
+
+def hash_key(secret: str, config: FakerColumnConfig) -> str:
+    # pandas' keyed SipHash takes a 16-character key. Deriving it per generator type means an email maps to
+    # the same fake email whatever the column is called, so masked files still join with each other.
+    return hashlib.blake2b(f"{config.type_name}|{secret}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+def count_collisions(values: pa.Array) -> int:
+    """How many of the fake values given to distinct inputs repeat one given to another input."""
+    return len(values) - len(pc.unique(values))
+
+
+def mask_array(array: Union[pa.Array, pa.ChunkedArray], config: FakerColumnConfig, secret: str,
+               collisions: Optional[Dict[str, int]] = None) -> pa.Array:
+    """Replace every value with a fake value derived from a keyed hash of it; nulls and blanks become null.
+
+    Distinct inputs can share a fake value. With `collisions`, the number that do within this array is added
+    to its entry for the generator type.
+    """
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    strings = array.cast(pa.string())
+    # Empty or blank cells are missing values, not values to mask.
+    strings = pc.if_else(pc.equal(pc.utf8_trim_whitespace(strings), ""), pa.scalar(None, pa.string()), strings)
+    # Only the distinct values of the batch are hashed; the row-level result is one take().
+    encoded = strings.dictionary_encode()
+    keys = pd.util.hash_array(encoded.dictionary.to_numpy(zero_copy_only=False), hash_key=hash_key(secret, config),
+                              categorize=False)
+    replacements = type(config).keyed_values(config, keys)
+    if collisions is not None:
+        collisions[config.type_name] = collisions.get(config.type_name, 0) + count_collisions(replacements)
+    masked = replacements.take(encoded.indices)
+    return masked.cast(array.type) if pa.types.is_string(array.type) or pa.types.is_large_string(array.type) \
+        else masked
+
+
+def mask_batches(batches: Iterator[pa.RecordBatch], columns: Dict[str, FakerColumnConfig],
+                 secret: str, collisions: Optional[Dict[str, int]] = None) -> Iterator[pa.RecordBatch]:
+    for batch in batches:
+        missing = [name for name in columns if name not in batch.schema.names]
+        if missing:
+            raise ValueError(f"Column(s) not found in input: {', '.join(missing)}")
+        arrays = [
+            mask_array(batch.column(i), columns[name], secret, collisions) if name in columns
+            else batch.column(i)
+            for i, name in enumerate(batch.schema.names)
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+def mask_file(source: Union[str, Path, BinaryIO], destination: Union[str, Path], columns: Dict[str, FakerColumnConfig],
+              secret: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+              file_format: Optional[str] = None, collisions: Optional[Dict[str, int]] = None) -> int:
+    """Stream `source` (CSV or Parquet) to `destination`, masking `columns`; returns the number of rows written.
+
+    Pass a dict as `collisions` to count, per generator type, distinct inputs of a batch that were given the
+    same fake value. Nothing is kept across batches, so memory stays bounded by the batch size.
+    """
+    secret = secret if secret is not None else os.environ.get(MASKING_KEY_ENV)
+    if not secret:
+        raise ValueError(f"A masking key is required (argument or {MASKING_KEY_ENV}).")
+    for name, config in columns.items():
+        if not isinstance(config, FakerColumnConfig):
+            raise ValueError(f"Column '{name}': {config.type_name} has no vocabulary to mask with.")
+
+    destination = Path(destination)
+    as_parquet = destination.suffix.lower() in (".parquet", ".pq")
+    writer = None
+    rows = 0
+    try:
+        for batch in mask_batches(iter_record_batches(source, batch_size, file_format), columns, secret,
+                                  collisions):
+            if writer is None:
+                writer = pq.ParquetWriter(str(destination), batch.schema) if as_parquet \
+                    else pa_csv.CSVWriter(str(destination), batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        destination.unlink(missing_ok=True)
+        raise
+    if writer is not None:
+        writer.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace PII columns of a CSV/Parquet file with consistent fake values.")
+    parser.add_argument("source")
+    parser.add_argument("destination", help="Output file; .parquet writes Parquet, anything else CSV.")
+    parser.add_argument("--column", action="append", default=[], metavar="NAME=TYPE",
+                        help="Column to mask and the generator to use, e.g. email=Email or name='Person Name'.")
+    parser.add_argument("--key", help=f"Masking key (defaults to ${MASKING_KEY_ENV}).")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--count-collisions", action="store_true",
+                        help="Report how many distinct values within a batch were masked to the same fake value.")
+    args = parser.parse_args()
+
+    columns = {}
+    for spec in args.column:
+        name, _, type_name = spec.partition("=")
+        columns[name] = get_column_config_class(type_name)(name=name)
+    collisions = {} if args.count_collisions else None
+    rows = mask_file(args.source, args.destination, columns, args.key, args.batch_size, collisions=collisions)
+    print(f"Masked {rows:,} rows into {args.destination}")
+    for type_name, count in (collisions or {}).items():
+        print(f"{type_name}: {count:,} distinct value(s) shared a fake value with another value of their batch")
+
+
+if __name__ == "__main__":
+    main()
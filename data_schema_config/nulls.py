@@ -0,0 +1,45 @@
+from typing import Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def arrow_array(values) -> pa.Array:
+    # pa.array goes through the public __arrow_array__ protocol and may hand back one chunk or several.
+    array = pa.array(values)
+    return array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+
+
+def null_mask(n_rows: int, null_fraction: float, rng: np.random.Generator) -> Optional[np.ndarray]:
+    # One Bernoulli draw per row; None means the column stays non-nullable.
+    if null_fraction <= 0:
+        return None
+    return rng.random(n_rows) < null_fraction
+
+
+def apply_null_mask(values: Union[np.ndarray, Sequence], mask: Optional[np.ndarray]):
+    if mask is None:
+        return values
+
+    # Masked pandas arrays wrap the generated buffer and the mask as-is (no copy).
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind in "iu":
+            return pd.arrays.IntegerArray(values, mask)
+        if values.dtype.kind == "f":
+            return pd.arrays.FloatingArray(values, mask)
+        if values.dtype.kind == "b":
+            return pd.arrays.BooleanArray(values, mask)
+
+    if isinstance(values, pd.arrays.ArrowExtensionArray):
+        array = arrow_array(values)
+        if array.null_count == 0 and array.offset == 0:
+            # Attach a validity bitmap to the existing offsets and character buffers (no copy of the data).
+            validity = pa.py_buffer(np.packbits(~mask, bitorder="little"))
+            array = pa.Array.from_buffers(array.type, len(array), [validity, *array.buffers()[1:]])
+        else:
+            array = pc.if_else(pa.array(mask), pa.scalar(None, array.type), array)
+        return pd.arrays.ArrowExtensionArray(array)
+
+    # Everything else becomes an Arrow array with a validity bitmap.
+    return pd.arrays.ArrowExtensionArray(pa.array(values, mask=mask, from_pandas=True))
@@ -0,0 +1,146 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from data_schema_config.sketches import HeavyHitters, HyperLogLog, RunningMoments
+
+# Report of a directory export, written inside it; the leading underscore keeps dataset readers from
+# taking it for a data file.
+QUALITY_FILE = "_quality.json"
+
+
+def sidecar_path(path: Union[str, Path]) -> Path:
+    """`out/data.parquet` -> `out/data.quality.json`."""
+    return Path(path).with_suffix(".quality.json")
+
+
+def _hash(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(values, categorize=False)
+
+
+class ColumnStats:
+    """Mergeable single-pass summary of one column."""
+
+    def __init__(self, name: str, top_k: int = 10, precision: int = 12):
+        self.name = name
+        self.dtype: Optional[str] = None
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.moments = RunningMoments()
+        self.distinct = HyperLogLog(precision)
+        self.top = HeavyHitters(top_k)
+
+    def update(self, array: pa.Array):
+        if self.dtype is None:
+            self.dtype = str(array.type)
+        self.count += len(array)
+        self.nulls += array.null_count
+        values = array.drop_null()
+        if not len(values):
+            return
+
+        if pa.types.is_integer(values.type) or pa.types.is_floating(values.type) or pa.types.is_boolean(values.type):
+            bounds = pc.min_max(values)
+            lo, hi = bounds["min"].as_py(), bounds["max"].as_py()
+            self.min = lo if self.min is None else min(self.min, lo)
+            self.max = hi if self.max is None else max(self.max, hi)
+            numbers = values.to_numpy(zero_copy_only=False)
+            self.moments.update(numbers)
+            self.distinct.update_hashes(_hash(numbers))
+            if not pa.types.is_floating(values.type):
+                self.top.update(numbers)
+            return
+
+        # Text and other types: one value_counts pass feeds both the distinct sketch and top-k,
+        # and only the (usually few) distinct values of the batch get hashed.
+        counts = pc.value_counts(values)
+        uniques = counts.field("values").to_numpy(zero_copy_only=False).astype(object, copy=False)
+        self.distinct.update_hashes(_hash(uniques))
+        self.top.update_counts(uniques.tolist(), counts.field("counts").to_numpy())
+
+    def merge(self, other: "ColumnStats"):
+        self.dtype = self.dtype or other.dtype
+        self.count += other.count
+        self.nulls += other.nulls
+        for bound, pick in (("min", min), ("max", max)):
+            mine, theirs = getattr(self, bound), getattr(other, bound)
+            setattr(self, bound, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+        self.moments.merge(other.moments)
+        self.distinct.merge(other.distinct)
+        self.top.merge(other.top)
+
+    def to_dict(self) -> dict:
+        has_moments = self.moments.count > 0
+        return {
+            "name": self.name,
+            "dtype": self.dtype,
+            "count": self.count,
+            "nulls": self.nulls,
+            "null_fraction": self.nulls / self.count if self.count else 0.0,
+            "min": _plain(self.min),
+            "max": _plain(self.max),
+            "mean": self.moments.mean if has_moments else None,
+            "std": float(np.sqrt(self.moments.variance)) if has_moments else None,
+            "distinct_estimate": int(round(min(self.distinct.estimate(), self.count - self.nulls))),
+            "top": [[_plain(v), c] for v, c in self.top.top()],
+        }
+
+
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class QualityReport:
+    """Per-column summary statistics accumulated while batches are generated."""
+
+    def __init__(self, top_k: int = 10, precision: int = 12):
+        self.top_k = top_k
+        self.precision = precision
+        self.columns: Dict[str, ColumnStats] = {}
+
+    @property
+    def num_rows(self) -> int:
+        return max((stats.count for stats in self.columns.values()), default=0)
+
+    def update(self, df: pd.DataFrame):
+        for name in df.columns:
+            stats = self.columns.get(name)
+            if stats is None:
+                stats = self.columns[name] = ColumnStats(name, self.top_k, self.precision)
+            stats.update(pa.array(df[name]))
+
+    def merge(self, other: "QualityReport"):
+        for name, stats in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(stats)
+            else:
+                self.columns[name] = stats
+
+    def to_dict(self) -> dict:
+        return {"num_rows": self.num_rows, "columns": [stats.to_dict() for stats in self.columns.values()]}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    def to_frame(self) -> pd.DataFrame:
+        return report_frame(self.to_dict())
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.write_text(self.to_json(), encoding="utf-8")
+        return path
+
+
+def report_frame(report: dict) -> pd.DataFrame:
+    # One row per column, with the top values flattened for display.
+    rows: List[dict] = []
+    for col in report["columns"]:
+        row = {k: v for k, v in col.items() if k != "top"}
+        row["top"] = ", ".join(f"{v} ({c})" for v, c in col["top"][:5])
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("name") if rows else pd.DataFrame()
@@ -0,0 +1,214 @@
+import atexit
+import io
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Stored results are split into record batches of this many rows; a slice only decodes the batches it touches.
+RESULT_BATCH_ROWS = 64 * 1024
+RESULT_COMPRESSION = "zstd"
+
+
+def _decoded_schema(schema: pa.Schema) -> pa.Schema:
+    return pa.schema([
+        field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+        for field in schema
+    ], metadata=schema.metadata)
+
+
+def _decode(data: Union[pa.Table, pa.RecordBatch]):
+    schema = _decoded_schema(data.schema)
+    return data if schema.equals(data.schema) else data.cast(schema)
+
+
+class _DecodingWriter:
+    def __init__(self, writer):
+        self._writer = writer
+
+    def write_batch(self, batch: pa.RecordBatch):
+        self._writer.write_batch(_decode(batch))
+
+    def close(self):
+        self._writer.close()
+
+
+# Writers for download payloads, keyed by format name. Batches arrive one at a time, still
+# dictionary-encoded: Parquet writes dictionary columns as they are, CSV needs the values.
+PAYLOAD_WRITERS: Dict[str, Callable[[io.BytesIO, pa.Schema], object]] = {
+    "csv": lambda sink, schema: _DecodingWriter(pa_csv.CSVWriter(sink, _decoded_schema(schema))),
+    "parquet": lambda sink, schema: pq.ParquetWriter(sink, schema),
+}
+
+
+class ResultHandle:
+    """Session-side reference to a stored result; releases its reference when dropped."""
+
+    def __init__(self, store: "ResultStore", result_id: str, num_rows: int, columns: List[str]):
+        self.result_id = result_id
+        self.num_rows = num_rows
+        self.columns = columns
+        self._store = store
+        # Session state disappears with the session, so garbage collection doubles as the session-end hook.
+        self._finalizer = weakref.finalize(self, store.release, result_id)
+
+    def release(self):
+        self._finalizer()
+
+    @property
+    def released(self) -> bool:
+        return not self._finalizer.alive
+
+    def table(self) -> pa.Table:
+        return self._store.table(self.result_id)
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self._store.head(self.result_id, n)
+
+    def slice(self, offset: int, length: int) -> pd.DataFrame:
+        return self._store.slice(self.result_id, offset, length)
+
+    def batches(self) -> Iterator[pa.RecordBatch]:
+        return self._store.batches(self.result_id)
+
+    def has_payload(self, fmt: str = "csv") -> bool:
+        return self._store.has_payload(self.result_id, fmt)
+
+    def payload(self, fmt: str = "csv") -> bytes:
+        return self._store.payload(self.result_id, fmt)
+
+
+class ResultStore:
+    """Reference-counted results kept as memory-mapped Arrow IPC files, shared by all sessions.
+
+    Files are compressed, with low-cardinality columns dictionary-encoded, and are decoded one record
+    batch at a time when a slice or payload needs them; nothing stays decoded in memory.
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        if root is None:
+            root = tempfile.mkdtemp(prefix="retaildataforge-results-")
+            atexit.register(shutil.rmtree, root, True)
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._refcounts: Dict[str, int] = {}
+        self._readers: Dict[str, pa.ipc.RecordBatchFileReader] = {}
+        self._offsets: Dict[str, np.ndarray] = {}
+        self._payloads: Dict[str, Dict[str, bytes]] = {}
+
+    def _path(self, result_id: str) -> Path:
+        return self.root / f"{result_id}.arrow"
+
+    def put(self, data: Union[pd.DataFrame, pa.Table], encodings: Optional[Dict[str, str]] = None) -> ResultHandle:
+        """Store a result; `encodings` maps column names to "dictionary" or "plain" (the default)."""
+        table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+        for name, encoding in (encodings or {}).items():
+            i = table.schema.get_field_index(name)
+            if encoding == "dictionary" and i >= 0 and not pa.types.is_dictionary(table.schema.field(i).type):
+                table = table.set_column(i, name, table.column(i).dictionary_encode())
+        result_id = uuid.uuid4().hex
+        batches = table.to_batches(max_chunksize=RESULT_BATCH_ROWS)
+        options = pa.ipc.IpcWriteOptions(compression=RESULT_COMPRESSION)
+        with pa.OSFile(str(self._path(result_id)), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+        with self._lock:
+            self._refcounts[result_id] = 1
+            self._offsets[result_id] = np.cumsum([0] + [batch.num_rows for batch in batches])
+        return ResultHandle(self, result_id, table.num_rows, table.column_names)
+
+    def acquire(self, result_id: str) -> ResultHandle:
+        with self._lock:
+            if result_id not in self._refcounts:
+                raise KeyError(f"Result '{result_id}' is not in the store.")
+            self._refcounts[result_id] += 1
+        reader = self._reader(result_id)
+        return ResultHandle(self, result_id, int(self._offsets[result_id][-1]), reader.schema.names)
+
+    def release(self, result_id: str):
+        with self._lock:
+            count = self._refcounts.get(result_id)
+            if count is None:
+                return
+            if count > 1:
+                self._refcounts[result_id] = count - 1
+                return
+            del self._refcounts[result_id]
+            self._readers.pop(result_id, None)
+            self._offsets.pop(result_id, None)
+            self._payloads.pop(result_id, None)
+        self._path(result_id).unlink(missing_ok=True)
+
+    def refcount(self, result_id: str) -> int:
+        return self._refcounts.get(result_id, 0)
+
+    def _reader(self, result_id: str) -> pa.ipc.RecordBatchFileReader:
+        with self._lock:
+            if result_id not in self._refcounts:
+                raise KeyError(f"Result '{result_id}' is not in the store.")
+            reader = self._readers.get(result_id)
+            if reader is None:
+                # The compressed file sits in the page cache, shared by every session.
+                reader = pa.ipc.open_file(pa.memory_map(str(self._path(result_id)), "r"))
+                self._readers[result_id] = reader
+            return reader
+
+    def _batches(self, result_id: str) -> Iterator[pa.RecordBatch]:
+        reader = self._reader(result_id)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+    def batches(self, result_id: str) -> Iterator[pa.RecordBatch]:
+        """The result's record batches in order, each decoded only when it is reached."""
+        for batch in self._batches(result_id):
+            yield _decode(batch)
+
+    def table(self, result_id: str) -> pa.Table:
+        """The whole result, decoded; prefer `slice` or `payload` for large results."""
+        return _decode(self._reader(result_id).read_all())
+
+    def slice(self, result_id: str, offset: int, length: int) -> pd.DataFrame:
+        reader = self._reader(result_id)
+        offsets = self._offsets[result_id]
+        first = max(int(np.searchsorted(offsets, offset, side="right")) - 1, 0)
+        last = min(int(np.searchsorted(offsets, offset + length, side="left")), reader.num_record_batches)
+        batches = [reader.get_batch(i) for i in range(first, last)]
+        if not batches:
+            return _decode(reader.schema.empty_table()).to_pandas()
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        return _decode(table.slice(offset - int(offsets[first]), length)).to_pandas()
+
+    def head(self, result_id: str, n: int = 5) -> pd.DataFrame:
+        return self.slice(result_id, 0, n)
+
+    def has_payload(self, result_id: str, fmt: str = "csv") -> bool:
+        return fmt in self._payloads.get(result_id, {})
+
+    def payload(self, result_id: str, fmt: str = "csv") -> bytes:
+        if fmt not in PAYLOAD_WRITERS:
+            raise ValueError(f"Unsupported download format: {fmt}")
+        cached = self._payloads.get(result_id, {}).get(fmt)
+        if cached is not None:
+            return cached
+        sink = io.BytesIO()
+        writer = PAYLOAD_WRITERS[fmt](sink, self._reader(result_id).schema)
+        try:
+            for batch in self._batches(result_id):
+                writer.write_batch(batch)
+        finally:
+            writer.close()
+        data = sink.getvalue()
+        with self._lock:
+            if result_id in self._refcounts:
+                data = self._payloads.setdefault(result_id, {}).setdefault(fmt, data)
+        return data
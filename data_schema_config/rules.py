@@ -0,0 +1,309 @@
+import ast
+import re
+import time
+from enum import Enum
+from typing import Callable, ClassVar, Dict, List, Literal, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel, Field, model_validator
+from typing_extensions import Annotated
+from data_schema_config.base_column_configs import ColumnConfig
+from data_schema_config.nulls import apply_null_mask, arrow_array, null_mask
+
+# Name -> (config, generate_data) for the columns of the schema being generated.
+ColumnPlan = Dict[str, Tuple[ColumnConfig, Callable]]
+
+
+class RuleAction(str, Enum):
+    REPAIR = "repair"  # Overwrite the failing values so the rule holds
+    RESAMPLE = "resample"  # Draw new values for the failing rows only, then repair what still fails
+    REPORT = "report"  # Count violations, change nothing
+
+
+class RuleStats(BaseModel):
+    name: str
+    rows_checked: int = 0
+    violations: int = 0
+    resampled: int = 0
+    repaired: int = 0
+    remaining: int = 0
+    seconds: float = 0.0
+
+
+class BaseRule(BaseModel):
+    name: str = ""
+    action: RuleAction = RuleAction.REPAIR
+    max_attempts: int = Field(3, ge=1)  # Resample rounds before falling back to repair
+    can_repair: ClassVar[bool] = False  # Whether `repair` can fix failing rows; otherwise they are only counted
+
+    @property
+    def label(self) -> str:
+        return self.name or self.describe()
+
+    def describe(self) -> str:
+        return self.kind
+
+    def columns(self) -> List[str]:
+        """Columns the rule reads; all must exist in the schema."""
+        return []
+
+    def violations(self, frame: pd.DataFrame) -> np.ndarray:
+        raise NotImplementedError
+
+    def resample_columns(self) -> List[str]:
+        return []
+
+    def repair(self, frame: pd.DataFrame, mask: np.ndarray, rng: np.random.Generator, plan: ColumnPlan):
+        """Overwrite the failing rows so the rule holds; rules that set `can_repair` override this."""
+
+    def apply(self, frame: pd.DataFrame, plan: ColumnPlan, rng: np.random.Generator, stats: RuleStats,
+              counted: slice = slice(None)):
+        # The whole frame is checked and fixed, but only the `counted` rows (those the caller returns) are
+        # counted, so padding past the requested range never shows up in the report.
+        start = time.perf_counter()
+        mask = self.violations(frame)
+        stats.rows_checked += len(range(len(frame))[counted])
+        stats.violations += int(mask[counted].sum())
+
+        if self.action == RuleAction.RESAMPLE:
+            for _ in range(self.max_attempts):
+                n_failing = int(mask.sum())
+                if not n_failing:
+                    break
+                for name in self.resample_columns():
+                    col, generate = plan[name]
+                    # Redrawn rows get nulls at the column's null_fraction, like every other row.
+                    values = generate(col, n_failing, rng)
+                    values = apply_null_mask(values, null_mask(n_failing, col.null_fraction, rng))
+                    _assign(frame, name, mask, values)
+                stats.resampled += int(mask[counted].sum())
+                mask = self.violations(frame)
+
+        if self.action != RuleAction.REPORT and mask.any() and self.can_repair:
+            stats.repaired += int(mask[counted].sum())
+            self.repair(frame, mask, rng, plan)
+            mask = self.violations(frame)
+        stats.remaining += int(mask[counted].sum())
+        stats.seconds += time.perf_counter() - start
+
+
+def _assign(frame: pd.DataFrame, name: str, mask: np.ndarray, values):
+    column = frame[name]
+    if isinstance(column.dtype, pd.ArrowDtype):
+        array = arrow_array(column)
+        if isinstance(values, pd.arrays.ArrowExtensionArray):
+            # String generators hand back Arrow arrays; keep them in Arrow instead of a round trip through objects.
+            replacement = arrow_array(values).cast(array.type)
+        else:
+            replacement = pa.array(np.asarray(values), type=array.type, from_pandas=True)
+        frame[name] = pd.arrays.ArrowExtensionArray(pc.replace_with_mask(array, pa.array(mask), replacement))
+        return
+    column = column.copy()
+    column[mask] = values
+    frame[name] = column
+
+
+def _codes(column: pd.Series, values: List) -> np.ndarray:
+    # Position of each row's value in `values` (-1 when absent), computed by Arrow's hash lookup.
+    array = pa.array(column)
+    codes = pc.index_in(array, value_set=pa.array(values).cast(array.type))
+    return codes.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int64)
+
+
+def _failing(condition: pd.Series) -> np.ndarray:
+    # Rows where an operand is null neither pass nor fail.
+    return (~condition.astype("boolean")).fillna(False).to_numpy(dtype=bool)
+
+
+_OPERATORS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+
+class CompareRule(BaseRule):
+    """`left <op> right`, where right is another column or a constant, e.g. discount <= price."""
+
+    kind: Literal["compare"] = "compare"
+    can_repair: ClassVar[bool] = True
+    left: str
+    op: Literal["<", "<=", ">", ">=", "==", "!="]
+    right: Optional[str] = None
+    value: Optional[float] = None
+
+    @model_validator(mode="after")
+    def check_operand(self):
+        if (self.right is None) == (self.value is None):
+            raise ValueError("A compare rule needs exactly one of 'right' (a column) or 'value' (a constant).")
+        return self
+
+    def describe(self) -> str:
+        return f"{self.left} {self.op} {self.right if self.right is not None else self.value}"
+
+    def columns(self) -> List[str]:
+        return [self.left] + ([self.right] if self.right is not None else [])
+
+    def _right(self, frame: pd.DataFrame):
+        return frame[self.right] if self.right is not None else self.value
+
+    def violations(self, frame: pd.DataFrame) -> np.ndarray:
+        return _failing(_OPERATORS[self.op](frame[self.left], self._right(frame)))
+
+    def resample_columns(self) -> List[str]:
+        return [self.left]
+
+    def repair(self, frame: pd.DataFrame, mask: np.ndarray, rng: np.random.Generator, plan: ColumnPlan):
+        # Move the left value onto the nearest value that satisfies the comparison, within the column's
+        # configured range and its dtype. Rows that cannot be moved there stay failing (and are reported).
+        right = self._right(frame)
+        right = np.asarray(right[mask] if isinstance(right, pd.Series) else np.full(int(mask.sum()), right),
+                           dtype=float)
+        dtype = frame[self.left].dtype
+        numpy_dtype = np.dtype(getattr(dtype, "numpy_dtype", dtype))
+        integral = numpy_dtype.kind in "iu"
+        limits = np.iinfo(numpy_dtype) if integral else np.finfo(numpy_dtype)
+        config = plan[self.left][0] if self.left in plan else None
+        lo = max(float(limits.min), getattr(config, "min_value", -np.inf))
+        hi = min(float(limits.max), getattr(config, "max_value", np.inf))
+        if integral:
+            lo, hi = np.ceil(lo), np.floor(hi)
+            below, at_most, above, at_least = np.ceil(right) - 1, np.floor(right), np.floor(right) + 1, np.ceil(right)
+        else:
+            right = right.astype(numpy_dtype)
+            below, at_most, at_least = np.nextafter(right, -np.inf), right, right
+            above = np.nextafter(right, np.inf)
+        target = {"<": below, "<=": at_most, ">": above, ">=": at_least, "==": at_least}.get(self.op)
+        if self.op == "!=":
+            # Either neighbour will do; step up where stepping down would leave the range.
+            target = np.where(below >= lo, below, above)
+        target = np.clip(target, lo, hi)
+        _assign(frame, self.left, mask, pd.array(target.astype(numpy_dtype)).astype(dtype))
+
+
+class MembershipRule(BaseRule):
+    """`column` must be one of `mapping[key_column]`, e.g. a city that belongs to the row's country.
+
+    Without `key_column`, the allowed values are `mapping["*"]`. Rows whose key is not in the mapping are
+    left alone.
+    """
+
+    kind: Literal["membership"] = "membership"
+    can_repair: ClassVar[bool] = True
+    column: str
+    key_column: Optional[str] = None
+    mapping: Dict[str, List[str]]
+
+    def describe(self) -> str:
+        return f"{self.column} in {self.key_column}'s values" if self.key_column else f"{self.column} in set"
+
+    def columns(self) -> List[str]:
+        return [self.column] + ([self.key_column] if self.key_column else [])
+
+    def _tables(self):
+        keys = list(self.mapping)
+        allowed = [np.asarray(self.mapping[k], dtype=object) for k in keys]
+        sizes = np.array([len(a) for a in allowed], dtype=np.int64)
+        return keys, np.concatenate(allowed) if allowed else np.empty(0, dtype=object), sizes
+
+    def _key_codes(self, frame: pd.DataFrame, keys: List[str]) -> np.ndarray:
+        if self.key_column is None:
+            return np.zeros(len(frame), dtype=np.int64)
+        return _codes(frame[self.key_column], keys)
+
+    def violations(self, frame: pd.DataFrame) -> np.ndarray:
+        keys, values, sizes = self._tables()
+        key_codes = self._key_codes(frame, keys)
+        # Each valid (key, value) pair becomes one integer, so membership is a single isin.
+        distinct = pd.unique(values).tolist()
+        value_codes = _codes(frame[self.column], distinct)
+        valid_pairs = np.repeat(np.arange(len(keys)), sizes) * len(distinct) + pd.Index(distinct).get_indexer(values)
+        pairs = key_codes * len(distinct) + value_codes
+        checked = (key_codes >= 0) & frame[self.column].notna().to_numpy()
+        return checked & ((value_codes < 0) | ~np.isin(pairs, valid_pairs))
+
+    def repair(self, frame: pd.DataFrame, mask: np.ndarray, rng: np.random.Generator, plan: ColumnPlan):
+        # Draw a replacement from each failing row's own allowed list: offsets[key] + floor(u * size[key]).
+        keys, values, sizes = self._tables()
+        key_codes = self._key_codes(frame, keys)[mask]
+        offsets = np.cumsum(sizes) - sizes
+        picks = offsets[key_codes] + (rng.random(len(key_codes)) * sizes[key_codes]).astype(np.int64)
+        _assign(frame, self.column, mask, values[picks])
+
+
+class ExpressionRule(BaseRule):
+    """A boolean `DataFrame.eval` expression, e.g. `end_date > start_date`; failing rows are resampled."""
+
+    kind: Literal["expression"] = "expression"
+    expr: str
+    resample: List[str] = Field(default_factory=list)  # Columns redrawn for failing rows
+    action: RuleAction = RuleAction.RESAMPLE
+    max_attempts: int = Field(10, ge=1)
+
+    @model_validator(mode="after")
+    def check_expression(self):
+        self.names()  # Raises for an expression that does not parse
+        if self.action == RuleAction.RESAMPLE and not self.resample:
+            raise ValueError(f"Expression rule '{self.label}' resamples, but names no 'resample' columns.")
+        return self
+
+    def describe(self) -> str:
+        return self.expr
+
+    def names(self) -> List[str]:
+        """Column names the expression reads, in order of appearance."""
+        # Backtick-quoted names (`unit price`) are swapped for placeholders so the rest parses as Python.
+        quoted = re.findall(r"`([^`]*)`", self.expr)
+        text = self.expr
+        for i, name in enumerate(quoted):
+            text = text.replace(f"`{name}`", f"__quoted_{i}__", 1)
+        try:
+            tree = ast.parse(text.replace("\n", " "), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Cannot parse expression '{self.expr}': {e.msg}") from e
+        functions = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and id(node) not in functions:
+                match = re.fullmatch(r"__quoted_(\d+)__", node.id)
+                names.append(quoted[int(match.group(1))] if match else node.id)
+        return list(dict.fromkeys(names))
+
+    def columns(self) -> List[str]:
+        return list(dict.fromkeys(self.names() + list(self.resample)))
+
+    def violations(self, frame: pd.DataFrame) -> np.ndarray:
+        return _failing(pd.Series(frame.eval(self.expr), index=frame.index))
+
+    def resample_columns(self) -> List[str]:
+        return list(self.resample)
+
+
+Rule = Annotated[Union[CompareRule, MembershipRule, ExpressionRule], Field(discriminator="kind")]
+
+
+class RuleSet:
+    """Applies a schema's rules to generated blocks and accumulates their cost."""
+
+    def __init__(self, rules: List[BaseRule]):
+        self.rules = rules
+        self.stats = [RuleStats(name=rule.label) for rule in rules]
+
+    def apply(self, frame: pd.DataFrame, plan: ColumnPlan, rng_for: Callable[[int], np.random.Generator],
+              counted: slice = slice(None)):
+        for i, (rule, stats) in enumerate(zip(self.rules, self.stats)):
+            rule.apply(frame, plan, rng_for(i), stats, counted)
+
+    def merge(self, stats: List[RuleStats]):
+        # Adds counts gathered by another process for the same rules.
+        for mine, theirs in zip(self.stats, stats):
+            for field in ("rows_checked", "violations", "resampled", "repaired", "remaining", "seconds"):
+                setattr(mine, field, getattr(mine, field) + getattr(theirs, field))
+
+    def report(self) -> pd.DataFrame:
+        return pd.DataFrame([s.model_dump() for s in self.stats]).set_index("name") if self.stats else pd.DataFrame()
@@ -0,0 +1,203 @@
+import argparse
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pydantic import BaseModel, Field
+from data_schema_config.column_formats.categorical_column_configs import CategoryColumnConfig, CityColumnConfig
+from data_schema_config.column_formats.text_column_configs import EmailColumnConfig, PersonNameColumnConfig
+from data_schema_config.distributions import Distribution, DistributionType, sample_numeric
+from data_schema_config.nulls import arrow_array
+from data_schema_config.streams import BLOCK_ROWS, block_rng, column_key
+from data_schema_config.table_schema import TableSchema
+from data_schema_config.vocabulary import faker_vocabulary, take_strings
+
+# Department -> (categories, median unit price).
+DEFAULT_CATEGORY_TREE: Dict[str, Tuple[List[str], float]] = {
+    "Grocery": (["Produce", "Dairy", "Bakery", "Pantry", "Frozen", "Beverages"], 3.5),
+    "Household": (["Cleaning", "Paper Goods", "Kitchen", "Storage"], 8.0),
+    "Health & Beauty": (["Personal Care", "Cosmetics", "Pharmacy"], 12.0),
+    "Apparel": (["Menswear", "Womenswear", "Kids", "Footwear"], 30.0),
+    "Electronics": (["Audio", "Accessories", "Computing", "Phones"], 80.0),
+}
+
+# Orders are generated in fixed blocks keyed like table columns, so any block can be produced on its own.
+ORDERS_PER_BLOCK = BLOCK_ROWS
+
+
+class RetailScenario(BaseModel):
+    """Product catalog, store network, customers and order lines generated as one consistent dataset."""
+
+    seed: int = 0
+    num_products: int = Field(5_000, ge=1)
+    num_stores: int = Field(50, ge=1)
+    num_customers: int = Field(100_000, ge=1)
+    num_orders: int = Field(1_000_000, ge=0)
+    basket_size: Distribution = Field(default_factory=lambda: Distribution(kind=DistributionType.POISSON, lam=2.5))
+    max_basket_size: int = Field(40, ge=1)
+    affinity: float = Field(0.7, ge=0, le=1)  # Share of basket lines drawn from the order's anchor category
+    popularity_exponent: float = Field(1.1, gt=0)  # Zipf-like skew of product and store popularity
+    categories: Dict[str, Tuple[List[str], float]] = Field(default_factory=lambda: dict(DEFAULT_CATEGORY_TREE))
+
+    def _rng(self, table: str, block: int = 0) -> np.random.Generator:
+        return block_rng(self.seed, column_key(table), block)
+
+    def _popularity(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        weights = 1.0 / np.arange(1, n + 1) ** self.popularity_exponent
+        return rng.permutation(weights)
+
+    def products(self) -> pd.DataFrame:
+        rng = self._rng("products")
+        departments = list(self.categories)
+        leaf_department = np.repeat(np.arange(len(departments)), [len(self.categories[d][0]) for d in departments])
+        leaf_names = pa.array([c for d in departments for c in self.categories[d][0]], type=pa.large_string())
+        department_names = pa.array(departments, type=pa.large_string())
+        medians = np.array([self.categories[d][1] for d in departments])
+
+        # Sorted by category so each category is a contiguous slice of the catalog.
+        category = np.sort(rng.integers(0, len(leaf_names), size=self.num_products))
+        department = leaf_department[category]
+        category_name = leaf_names.take(pa.array(category))
+        words = faker_vocabulary("word")
+        product_word = words.take(pa.array(rng.integers(0, len(words), size=self.num_products)))
+        price = np.round(medians[department] * rng.lognormal(0.0, 0.5, size=self.num_products), 2)
+
+        sku = pa.array(np.char.add("SKU-", np.char.zfill(np.arange(self.num_products).astype(str), 7)),
+                       type=pa.large_string())
+        return pd.DataFrame({
+            "sku": pd.arrays.ArrowExtensionArray(sku),
+            "product_name": pd.arrays.ArrowExtensionArray(
+                pc.binary_join_element_wise(category_name, pc.utf8_capitalize(product_word),
+                                            pa.scalar(" ", pa.large_string()))),
+            "department": take_strings(department_names, department),
+            "category": pd.arrays.ArrowExtensionArray(category_name),
+            "unit_price": price,
+            "popularity": self._popularity(self.num_products, rng),
+        })
+
+    def store_schema(self) -> TableSchema:
+        return TableSchema(num_rows=self.num_stores, seed=self.seed, columns=[
+            CityColumnConfig(name="city"),
+            CategoryColumnConfig(name="format", categories=["Hypermarket", "Supermarket", "Convenience", "Outlet"],
+                                 weights=[1, 4, 6, 1]),
+        ])
+
+    def customer_schema(self) -> TableSchema:
+        return TableSchema(num_rows=self.num_customers, seed=self.seed, columns=[
+            PersonNameColumnConfig(name="customer_name"),
+            EmailColumnConfig(name="email"),
+            CityColumnConfig(name="home_city"),
+            CategoryColumnConfig(name="loyalty_tier", categories=["none", "bronze", "silver", "gold"],
+                                 weights=[50, 30, 15, 5]),
+        ])
+
+    def stores(self) -> pd.DataFrame:
+        df = self.store_schema().generate_dataframe()
+        df.insert(0, "store_id", np.arange(self.num_stores, dtype=np.int32))
+        df["traffic"] = self._popularity(self.num_stores, self._rng("stores"))
+        return df
+
+    def customers(self) -> pd.DataFrame:
+        df = self.customer_schema().generate_dataframe()
+        df.insert(0, "customer_id", np.arange(self.num_customers, dtype=np.int64))
+        return df
+
+    def order_lines(self, products: Optional[pd.DataFrame] = None,
+                    stores: Optional[pd.DataFrame] = None) -> Iterator[pd.DataFrame]:
+        products = self.products() if products is None else products
+        stores = self.stores() if stores is None else stores
+        category = products["category"].to_numpy(dtype=object)
+        starts = np.flatnonzero(np.r_[True, category[1:] != category[:-1]])
+        # Cumulative popularity over the category-sorted catalog: a draw inside a category's slice of the
+        # cumulative mass lands on one of its products, so within-category sampling is one searchsorted.
+        cumulative = np.cumsum(products["popularity"].to_numpy())
+        category_start = np.r_[0.0, cumulative][starts]
+        category_mass = cumulative[np.r_[starts[1:], len(category)] - 1] - category_start
+        store_cdf = np.cumsum(stores["traffic"].to_numpy())
+        sku = arrow_array(products["sku"])
+        unit_price = products["unit_price"].to_numpy()
+
+        for block, first_order in enumerate(range(0, self.num_orders, ORDERS_PER_BLOCK)):
+            n_orders = min(ORDERS_PER_BLOCK, self.num_orders - first_order)
+            yield self._order_block(block, first_order, n_orders, cumulative, category_start, category_mass,
+                                    store_cdf, sku, unit_price)
+
+    def _order_block(self, block: int, first_order: int, n_orders: int, cumulative: np.ndarray,
+                     category_start: np.ndarray, category_mass: np.ndarray, store_cdf: np.ndarray,
+                     sku: pa.Array, unit_price: np.ndarray) -> pd.DataFrame:
+        rng = self._rng("order_lines", block)
+        sizes = sample_numeric(self.basket_size, 1, self.max_basket_size, n_orders, rng, np.dtype(np.int64))
+        order_store = np.minimum(np.searchsorted(store_cdf, rng.random(n_orders) * store_cdf[-1], side="right"),
+                                 len(store_cdf) - 1)
+        order_customer = rng.integers(0, self.num_customers, size=n_orders)
+        # Each basket leans towards one anchor category, picked in proportion to category popularity.
+        anchor = np.minimum(np.searchsorted(category_start + category_mass, rng.random(n_orders) * cumulative[-1],
+                                            side="right"), len(category_mass) - 1)
+
+        n_lines = int(sizes.sum())
+        line_order = np.repeat(np.arange(n_orders), sizes)
+        basket_start = np.cumsum(sizes) - sizes
+        line_number = np.arange(n_lines) - np.repeat(basket_start, sizes) + 1
+
+        from_anchor = rng.random(n_lines) < self.affinity
+        line_anchor = anchor[line_order]
+        u = rng.random(n_lines)
+        target = np.where(from_anchor, category_start[line_anchor] + u * category_mass[line_anchor], u * cumulative[-1])
+        product = np.minimum(np.searchsorted(cumulative, target, side="right"), len(cumulative) - 1)
+
+        quantity = rng.geometric(0.6, size=n_lines).astype(np.int16)
+        price = unit_price[product]
+        return pd.DataFrame({
+            "order_id": (first_order + line_order).astype(np.int64),
+            "line_number": line_number.astype(np.int16),
+            "store_id": order_store[line_order].astype(np.int32),
+            "customer_id": order_customer[line_order].astype(np.int64),
+            "sku": pd.arrays.ArrowExtensionArray(sku.take(pa.array(product))),
+            "quantity": quantity,
+            "unit_price": price,
+            "line_total": np.round(price * quantity, 2),
+        })
+
+    def write(self, out_dir: Union[str, Path]) -> List[Path]:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        products, stores = self.products(), self.stores()
+        paths = []
+        for name, df in (("products", products), ("stores", stores), ("customers", self.customers())):
+            paths.append(out_dir / f"{name}.parquet")
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), str(paths[-1]))
+
+        paths.append(out_dir / "order_lines.parquet")
+        writer = None
+        try:
+            for df in self.order_lines(products, stores):
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(str(paths[-1]), table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a retail scenario (catalog, stores, customers, order lines).")
+    parser.add_argument("out_dir")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--stores", type=int, default=50)
+    parser.add_argument("--customers", type=int, default=100_000)
+    args = parser.parse_args()
+    scenario = RetailScenario(seed=args.seed, num_orders=args.orders, num_products=args.products,
+                              num_stores=args.stores, num_customers=args.customers)
+    for path in scenario.write(args.out_dir):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
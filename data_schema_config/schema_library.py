@@ -0,0 +1,116 @@
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from pydantic import BaseModel
+from data_schema_config.table_schema import TableSchema
+
+DEFAULT_LIBRARY_DIR = os.environ.get("RETAILDATAFORGE_SCHEMA_DIR", "schemas")
+INDEX_FILE = "index.json"
+
+
+class SchemaEntry(BaseModel):
+    name: str
+    file: str
+    num_columns: int
+    num_rows: int
+    column_types: List[str]
+    updated_at: str
+
+
+class SchemaLibrary:
+    """Directory of saved schemas plus an index, so listing never has to open the schema files."""
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_LIBRARY_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index: Optional[Dict[str, SchemaEntry]] = None
+        self._index_mtime: Optional[float] = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_FILE
+
+    def _read_index(self) -> Dict[str, SchemaEntry]:
+        if not self.index_path.exists():
+            return self.rebuild_index()
+        mtime = self.index_path.stat().st_mtime
+        if self._index is None or mtime != self._index_mtime:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+            self._index = {name: SchemaEntry(**entry) for name, entry in raw.items()}
+            self._index_mtime = mtime
+        return self._index
+
+    def _write_index(self, index: Dict[str, SchemaEntry]):
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({n: e.model_dump() for n, e in sorted(index.items())}, indent=2), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+        self._index = index
+        self._index_mtime = self.index_path.stat().st_mtime
+
+    @staticmethod
+    def _file_name(name: str, fmt: str) -> str:
+        stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "schema"
+        return f"{stem}.{fmt}"
+
+    def _entry(self, name: str, file: str, schema: TableSchema) -> SchemaEntry:
+        return SchemaEntry(
+            name=name,
+            file=file,
+            num_columns=len(schema.columns),
+            num_rows=schema.num_rows,
+            column_types=[col.type_name for col in schema.columns],
+            updated_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+
+    def list(self) -> List[SchemaEntry]:
+        return list(self._read_index().values())
+
+    def names(self) -> List[str]:
+        return list(self._read_index().keys())
+
+    def save(self, name: str, schema: TableSchema, fmt: str = "json") -> SchemaEntry:
+        if fmt not in ("json", "yaml"):
+            raise ValueError(f"Unsupported schema format: {fmt}")
+        index = dict(self._read_index())
+        file = self._file_name(name, fmt)
+        # Different names can sanitize to the same file; refuse rather than overwrite another schema.
+        # Compared case-insensitively, as on the default macOS and Windows file systems.
+        owner = next((n for n, e in index.items() if n != name and e.file.casefold() == file.casefold()), None)
+        if owner is None and (self.root / file).exists() and (name not in index or index[name].file != file):
+            owner = file
+        if owner is not None:
+            raise ValueError(f"Schema '{name}' would be saved as {file}, which already holds '{owner}'; "
+                             f"choose another name.")
+        if name in index:
+            (self.root / index[name].file).unlink(missing_ok=True)
+        schema.save(self.root / file)
+        index[name] = self._entry(name, file, schema)
+        self._write_index(index)
+        return index[name]
+
+    def load(self, name: str) -> TableSchema:
+        index = self._read_index()
+        if name not in index:
+            raise KeyError(f"Schema '{name}' not found in {self.root}.")
+        return TableSchema.load(self.root / index[name].file)
+
+    def delete(self, name: str):
+        index = dict(self._read_index())
+        entry = index.pop(name, None)
+        if entry is None:
+            raise KeyError(f"Schema '{name}' not found in {self.root}.")
+        (self.root / entry.file).unlink(missing_ok=True)
+        self._write_index(index)
+
+    def rebuild_index(self) -> Dict[str, SchemaEntry]:
+        # Recovers the index from the schema files, e.g. after fixtures were copied in by hand.
+        index = {}
+        for path in sorted(self.root.iterdir()):
+            if path.name == INDEX_FILE or path.suffix.lower() not in (".json", ".yaml", ".yml"):
+                continue
+            index[path.stem] = self._entry(path.stem, path.name, TableSchema.load(path))
+        self._write_index(index)
+        return index
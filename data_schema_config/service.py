@@ -0,0 +1,323 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import ValidationError
+from data_schema_config.emitters import ndjson_chunk
+from data_schema_config.table_schema import TableSchema
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.status = status
+        self.reason = reason
+
+
+class _ChunkSink(io.RawIOBase):
+    # Write-only file object for the Arrow/Parquet writers; hands each write to `emit`.
+    def __init__(self, emit):
+        self._emit = emit
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        if data:
+            self._emit(data)
+            self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+
+def encode_batches(batches: Iterator[pd.DataFrame], fmt: str) -> Iterator[bytes]:
+    if fmt == "ndjson":
+        for df in batches:
+            yield ndjson_chunk(df).to_pybytes()
+        return
+
+    pending = []
+    sink = _ChunkSink(pending.append)
+    writer = None
+    schema = None
+    try:
+        for df in batches:
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_stream(sink, schema) if fmt == "arrow" else pq.ParquetWriter(sink, schema)
+            writer.write_table(table)
+            if pending:
+                yield b"".join(pending)
+                pending.clear()
+    finally:
+        if writer is not None:
+            writer.close()
+    if pending:
+        yield b"".join(pending)
+
+
+class _Broadcast:
+    """One in-flight generation shared by every request with the same schema, seed and format."""
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self.chunks: Dict[int, bytes] = {}
+        self.produced = 0
+        self.released = 0
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.positions: Dict[int, int] = {}
+        self.cancelled = threading.Event()
+        self._next_subscriber = 0
+        self._cond = asyncio.Condition()
+
+    def subscribe(self) -> Optional[int]:
+        # Late joiners are only admitted while the first chunk is still buffered.
+        if self.released or self.cancelled.is_set():
+            return None
+        sub_id = self._next_subscriber
+        self._next_subscriber += 1
+        self.positions[sub_id] = 0
+        return sub_id
+
+    async def publish(self, chunk: bytes):
+        async with self._cond:
+            # Backpressure: the producer waits for the slowest subscriber.
+            await self._cond.wait_for(lambda: self.cancelled.is_set() or not self.positions
+                                      or self.produced - min(self.positions.values()) < self.max_pending)
+            if not self.positions:
+                self.cancelled.set()
+            if self.cancelled.is_set():
+                return
+            self.chunks[self.produced] = chunk
+            self.produced += 1
+            self._cond.notify_all()
+
+    async def finish(self, error: Optional[BaseException] = None):
+        async with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    async def unsubscribe(self, sub_id: int):
+        async with self._cond:
+            self.positions.pop(sub_id, None)
+            if not self.positions and not self.done:
+                self.cancelled.set()
+            self._release()
+            self._cond.notify_all()
+
+    def _release(self):
+        floor = min(self.positions.values(), default=self.produced)
+        while self.released < floor:
+            self.chunks.pop(self.released, None)
+            self.released += 1
+
+    async def next_chunk(self, sub_id: int) -> Optional[bytes]:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.positions[sub_id] < self.produced or self.done)
+            position = self.positions[sub_id]
+            if position >= self.produced:
+                if self.error is not None:
+                    raise self.error
+                return None
+            chunk = self.chunks[position]
+            self.positions[sub_id] = position + 1
+            self._release()
+            self._cond.notify_all()
+            return chunk
+
+
+class GenerationService:
+    def __init__(self, max_workers: int = 4, max_pending_chunks: int = 8, default_batch_size: int = 50_000):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rdf-gen")
+        self.slots = asyncio.Semaphore(max_workers)
+        self.max_pending_chunks = max_pending_chunks
+        self.default_batch_size = default_batch_size
+        self.in_flight: Dict[str, _Broadcast] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, query, body = await self._read_request(reader)
+            if method == "GET" and path == "/health":
+                await self._send_simple(writer, 200, "OK", b"ok\n", "text/plain")
+            elif method == "POST" and path == "/generate":
+                await self._generate(writer, query, body)
+            else:
+                raise HTTPError(404, "Not Found")
+        except HTTPError as e:
+            await self._send_simple(writer, e.status, e.reason, f"{e}\n".encode("utf-8"), "text/plain")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request Header Fields Too Large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Bad Request", "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(400, "Bad Request", "Malformed Content-Length.")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Payload Too Large")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        return method.upper(), url.path, query, body
+
+    async def _send_simple(self, writer: asyncio.StreamWriter, status: int, reason: str, body: bytes,
+                           content_type: str):
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+    def _parse_job(self, query: Dict[str, str], body: bytes) -> Tuple[TableSchema, str, int]:
+        fmt = query.get("format", "ndjson")
+        if fmt not in CONTENT_TYPES:
+            raise HTTPError(400, "Bad Request", f"Unsupported format: {fmt}")
+        try:
+            schema = TableSchema.from_json(body)
+            if "rows" in query:
+                schema.set_num_rows(int(query["rows"]))
+            if "seed" in query:
+                schema.seed = int(query["seed"])
+            batch_size = int(query.get("batch_size", self.default_batch_size))
+        except (ValidationError, ValueError) as e:
+            raise HTTPError(400, "Bad Request", str(e))
+        if batch_size < 1:
+            raise HTTPError(400, "Bad Request", "batch_size must be at least 1.")
+        return schema, fmt, batch_size
+
+    def _subscribe(self, schema: TableSchema, fmt: str, batch_size: int) -> Tuple[_Broadcast, int]:
+        # Only seeded requests are reproducible, so only those are coalesced.
+        key = None
+        if schema.seed is not None:
+            key = hashlib.sha256(f"{fmt}|{batch_size}|{schema.to_json(indent=None)}".encode("utf-8")).hexdigest()
+            broadcast = self.in_flight.get(key)
+            if broadcast is not None:
+                sub_id = broadcast.subscribe()
+                if sub_id is not None:
+                    logger.info("Coalesced request onto in-flight generation %s", key[:12])
+                    return broadcast, sub_id
+
+        broadcast = _Broadcast(self.max_pending_chunks)
+        sub_id = broadcast.subscribe()
+        if key is not None:
+            self.in_flight[key] = broadcast
+        asyncio.get_running_loop().create_task(self._produce(key, broadcast, schema, fmt, batch_size))
+        return broadcast, sub_id
+
+    async def _produce(self, key: Optional[str], broadcast: _Broadcast, schema: TableSchema, fmt: str,
+                       batch_size: int):
+        loop = asyncio.get_running_loop()
+
+        def run():
+            for chunk in encode_batches(schema.generate_batches(batch_size), fmt):
+                if broadcast.cancelled.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(broadcast.publish(chunk), loop).result()
+
+        error = None
+        try:
+            async with self.slots:
+                await loop.run_in_executor(self.executor, run)
+        except Exception as e:
+            logger.exception("Generation failed")
+            error = e
+        finally:
+            if key is not None and self.in_flight.get(key) is broadcast:
+                del self.in_flight[key]
+            await broadcast.finish(error)
+
+    async def _generate(self, writer: asyncio.StreamWriter, query: Dict[str, str], body: bytes):
+        schema, fmt, batch_size = self._parse_job(query, body)
+        broadcast, sub_id = self._subscribe(schema, fmt, batch_size)
+        try:
+            writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: {CONTENT_TYPES[fmt]}\r\n"
+                         "Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n".encode("latin-1"))
+            while True:
+                chunk = await broadcast.next_chunk(sub_id)
+                if chunk is None:
+                    break
+                writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except ConnectionError:
+            logger.info("Client disconnected mid-stream")
+        except Exception:
+            # Headers are already sent; dropping the connection without the final chunk signals the failure.
+            logger.exception("Streaming response aborted")
+        finally:
+            await broadcast.unsubscribe(sub_id)
+
+
+async def serve(host: str, port: int, max_workers: int, max_pending_chunks: int, batch_size: int):
+    service = GenerationService(max_workers, max_pending_chunks, batch_size)
+    server = await service.start(host, port)
+    logger.info("Serving on %s", ", ".join(str(s.getsockname()) for s in server.sockets))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream synthetic data for a TableSchema over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending-chunks", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(args.host, args.port, args.workers, args.max_pending_chunks, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+from data_schema_config.quality import QualityReport, sidecar_path
+from data_schema_config.streams import BLOCK_ROWS, fresh_seed
+from data_schema_config.table_schema import TableSchema
+
+logger = logging.getLogger(__name__)
+
+# Leading underscores keep pyarrow.dataset (and Hive-style readers) from taking these for data files.
+MANIFEST_FILE = "_manifest.json"
+DEFAULT_SHARD_ROWS = 16 * BLOCK_ROWS
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+class ShardSpec(BaseModel):
+    index: int
+    start: int
+    stop: int
+    file: str
+
+
+class ShardResult(BaseModel):
+    index: int
+    start: int
+    stop: int
+    file: str
+    num_rows: int
+    num_bytes: int
+    sha256: str
+    attempts: int = 1
+    worker: str = ""
+
+
+class ShardManifest(BaseModel):
+    table_schema: str
+    seed: int
+    num_rows: int
+    shard_rows: int
+    shards: List[ShardResult]
+    failed: List[int] = []
+    created_at: str
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed and sum(s.num_rows for s in self.shards) == self.num_rows
+
+    def save(self, out_dir: Union[str, Path]):
+        path = Path(out_dir) / MANIFEST_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, out_dir: Union[str, Path]) -> "ShardManifest":
+        return cls.model_validate_json((Path(out_dir) / MANIFEST_FILE).read_text(encoding="utf-8"))
+
+
+def plan_shards(num_rows: int, shard_rows: int = DEFAULT_SHARD_ROWS) -> List[ShardSpec]:
+    # Shard boundaries are kept on block boundaries so no generator block is produced by two workers.
+    shard_rows = max(BLOCK_ROWS, -(-shard_rows // BLOCK_ROWS) * BLOCK_ROWS)
+    return [
+        ShardSpec(index=i, start=start, stop=min(start + shard_rows, num_rows), file=f"part-{i:05d}.parquet")
+        for i, start in enumerate(range(0, num_rows, shard_rows))
+    ]
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_shard(schema: TableSchema, spec: ShardSpec, out_dir: Union[str, Path],
+                batch_size: int = 50_000) -> ShardResult:
+    path = Path(out_dir) / spec.file
+    # Unique per attempt: a worker the coordinator gave up on may still be writing the same shard.
+    tmp = path.with_name(f"_{path.name}.{os.getpid()}-{uuid.uuid4().hex}.tmp")
+    report = QualityReport()
+    writer = None
+    try:
+        for df in schema.generate_range_batches(spec.start, spec.stop, batch_size, report):
+            table = pa.Table.from_pandas(df, schema=writer.schema if writer else None, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(str(tmp), table.schema)
+            writer.write_table(table)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        # A part file left half-written would only be overwritten by the retry anyway.
+        tmp.unlink(missing_ok=True)
+        raise
+    writer.close()
+    # Checksummed before the rename, so the result describes this attempt's file even if another lands later.
+    num_bytes, sha256 = tmp.stat().st_size, file_sha256(tmp)
+    # Renamed only once complete, so a crashed worker never leaves a part file that looks finished.
+    os.replace(tmp, path)
+    report.save(path.with_name("_" + sidecar_path(path).name))
+    return ShardResult(index=spec.index, start=spec.start, stop=spec.stop, file=spec.file,
+                       num_rows=spec.stop - spec.start, num_bytes=num_bytes, sha256=sha256)
+
+
+def shard_matches(out_dir: Union[str, Path], shard: ShardResult) -> bool:
+    path = Path(out_dir) / shard.file
+    return path.exists() and path.stat().st_size == shard.num_bytes and file_sha256(path) == shard.sha256
+
+
+def verify_manifest(out_dir: Union[str, Path]) -> List[int]:
+    """Return the indexes of shards whose part file is missing or does not match its checksum."""
+    manifest = ShardManifest.load(out_dir)
+    bad = [shard.index for shard in manifest.shards if not shard_matches(out_dir, shard)]
+    return sorted(bad + manifest.failed)
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict):
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    await writer.drain()
+
+
+async def _receive(reader: asyncio.StreamReader) -> dict:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed before a reply was received.")
+    return json.loads(line)
+
+
+class ShardWorker:
+    """Generates the shards it is sent over a socket, one JSON message per line, into a shared directory."""
+
+    def __init__(self, max_workers: int = 1):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rdf-shard")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_MESSAGE_BYTES)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    job = json.loads(line)
+                    schema = TableSchema.from_json(job["schema"])
+                    spec = ShardSpec.model_validate(job["shard"])
+                    Path(job["out_dir"]).mkdir(parents=True, exist_ok=True)
+                    result = await loop.run_in_executor(self.executor, write_shard, schema, spec, job["out_dir"],
+                                                        job.get("batch_size", 50_000))
+                    await _send(writer, {"ok": True, "result": result.model_dump()})
+                except Exception as e:
+                    logger.exception("Shard failed")
+                    await _send(writer, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class ShardCoordinator:
+    """Splits a schema's row space into shards and farms them out to workers, retrying each shard on its own."""
+
+    def __init__(self, workers: List[str], max_attempts: int = 3, batch_size: int = 50_000,
+                 shard_timeout: Optional[float] = None):
+        if not workers:
+            raise ValueError("At least one worker address is required.")
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.shard_timeout = shard_timeout
+
+    def run(self, schema: TableSchema, out_dir: Union[str, Path],
+            shard_rows: int = DEFAULT_SHARD_ROWS) -> ShardManifest:
+        return asyncio.run(self.arun(schema, out_dir, shard_rows))
+
+    async def arun(self, schema: TableSchema, out_dir: Union[str, Path],
+                   shard_rows: int = DEFAULT_SHARD_ROWS) -> ShardManifest:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        # Every worker must agree on the seed, so an unseeded schema gets one fixed here.
+        schema = schema.model_copy(update={"seed": schema.seed if schema.seed is not None else fresh_seed()})
+        schema_json = schema.to_json(indent=None)
+        specs = plan_shards(schema.num_rows, shard_rows)
+        done = self._reusable_results(out_dir, schema_json)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for spec in specs:
+            if spec.index not in done:
+                queue.put_nowait((spec, 1))
+        failed: List[int] = []
+        pending = {"count": queue.qsize()}
+        job = {"schema": schema_json, "out_dir": str(out_dir.resolve()), "batch_size": self.batch_size}
+
+        await asyncio.gather(*(self._drive(address, queue, job, done, failed, pending) for address in self.workers))
+        failed.extend(spec.index for spec, _ in self._drain(queue))
+        # A part file replaced after its result came back (by a worker that had timed out) no longer matches
+        # the checksum that was reported for it; it is recorded as failed so a rerun regenerates it.
+        for index in [i for i, result in done.items() if not shard_matches(out_dir, result)]:
+            logger.warning("Shard %d on disk does not match the checksum %s reported", index, done[index].worker)
+            del done[index]
+            failed.append(index)
+
+        manifest = ShardManifest(
+            table_schema=schema_json,
+            seed=schema.seed,
+            num_rows=schema.num_rows,
+            shard_rows=specs[0].stop - specs[0].start if specs else shard_rows,
+            shards=[done[i] for i in sorted(done)],
+            failed=sorted(failed),
+            created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+        manifest.save(out_dir)
+        return manifest
+
+    @staticmethod
+    def _drain(queue: asyncio.Queue) -> Iterator[Tuple[ShardSpec, int]]:
+        while not queue.empty():
+            yield queue.get_nowait()
+
+    @staticmethod
+    def _reusable_results(out_dir: Path, schema_json: str) -> Dict[int, ShardResult]:
+        # Rerunning against an earlier output directory only regenerates the shards that are missing or corrupt.
+        if not (out_dir / MANIFEST_FILE).exists():
+            return {}
+        previous = ShardManifest.load(out_dir)
+        if previous.table_schema != schema_json:
+            return {}
+        bad = set(verify_manifest(out_dir))
+        return {s.index: s for s in previous.shards if s.index not in bad}
+
+    async def _drive(self, address: str, queue: asyncio.Queue, job: dict, done: Dict[int, ShardResult],
+                     failed: List[int], pending: Dict[str, int]):
+        host, port = address.rsplit(":", 1)
+        reader = writer = None
+        while pending["count"]:
+            try:
+                spec, attempt = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                # Another worker holds the remaining shards; wait in case one of them is handed back.
+                await asyncio.sleep(0.05)
+                continue
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, int(port), limit=MAX_MESSAGE_BYTES)
+                await _send(writer, {**job, "shard": spec.model_dump()})
+                reply = await asyncio.wait_for(_receive(reader), self.shard_timeout)
+                if not reply["ok"]:
+                    raise RuntimeError(reply["error"])
+                result = ShardResult.model_validate(reply["result"])
+                done[spec.index] = result.model_copy(update={"attempts": attempt, "worker": address})
+                pending["count"] -= 1
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                # The worker itself is unreachable or wedged: hand the shard back and stop using this worker.
+                logger.warning("Worker %s failed on shard %d: %s", address, spec.index, e)
+                self._retry(queue, spec, attempt, failed, pending)
+                break
+            except RuntimeError as e:
+                logger.warning("Shard %d failed on %s (attempt %d): %s", spec.index, address, attempt, e)
+                self._retry(queue, spec, attempt, failed, pending)
+        if writer is not None:
+            writer.close()
+
+    def _retry(self, queue: asyncio.Queue, spec: ShardSpec, attempt: int, failed: List[int],
+               pending: Dict[str, int]):
+        if attempt < self.max_attempts:
+            queue.put_nowait((spec, attempt + 1))
+        else:
+            failed.append(spec.index)
+            pending["count"] -= 1
+
+
+@contextlib.contextmanager
+def local_workers(n: int, host: str = "127.0.0.1") -> Iterator[List[str]]:
+    """Start `n` worker processes on this machine as stand-in nodes and yield their addresses."""
+    procs = []
+    try:
+        for _ in range(n):
+            procs.append(subprocess.Popen(
+                [sys.executable, "-m", "data_schema_config.shards", "worker", "--host", host, "--port", "0"],
+                stdout=subprocess.PIPE, text=True,
+            ))
+        # Each worker announces the port it bound as its first line of output.
+        yield [proc.stdout.readline().strip() for proc in procs]
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+            proc.stdout.close()
+
+
+async def serve_worker(host: str, port: int, max_workers: int):
+    worker = ShardWorker(max_workers)
+    server = await worker.start(host, port)
+    bound_host, bound_port = server.sockets[0].getsockname()[:2]
+    print(f"{bound_host}:{bound_port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        worker.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a TableSchema as Parquet shards across worker processes.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="Run a shard worker.")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=8766)
+    worker.add_argument("--threads", type=int, default=1)
+
+    run = commands.add_parser("run", help="Coordinate a sharded generation.")
+    run.add_argument("schema", help="Schema file (.json or .yaml).")
+    run.add_argument("out_dir", help="Output directory; must be reachable by every worker.")
+    run.add_argument("--workers", default="", help="Comma-separated host:port worker addresses.")
+    run.add_argument("--local", type=int, default=0, help="Start this many local worker processes.")
+    run.add_argument("--rows", type=int)
+    run.add_argument("--seed", type=int)
+    run.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS)
+    run.add_argument("--max-attempts", type=int, default=3)
+
+    verify = commands.add_parser("verify", help="Check part files against the manifest checksums.")
+    verify.add_argument("out_dir")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "worker":
+        asyncio.run(serve_worker(args.host, args.port, args.threads))
+    elif args.command == "run":
+        schema = TableSchema.load(args.schema)
+        if args.rows is not None:
+            schema.set_num_rows(args.rows)
+        if args.seed is not None:
+            schema.seed = args.seed
+        addresses = [a for a in args.workers.split(",") if a]
+        with local_workers(args.local) if args.local else contextlib.nullcontext([]) as local:
+            coordinator = ShardCoordinator(addresses + local, max_attempts=args.max_attempts)
+            manifest = coordinator.run(schema, args.out_dir, args.shard_rows)
+        print(f"{len(manifest.shards)} shards written, {len(manifest.failed)} failed.")
+        sys.exit(0 if manifest.complete else 1)
+    else:
+        bad = verify_manifest(args.out_dir)
+        print("All shards verified." if not bad else f"Bad shards: {bad}")
+        sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
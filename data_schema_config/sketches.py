@@ -0,0 +1,150 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+class ReservoirSample:
+    """Fixed-size uniform sample of a stream (bottom-k by random priority), mergeable across batches."""
+
+    def __init__(self, capacity: int = 8192, seed: Optional[int] = None):
+        self.capacity = capacity
+        self._rng = np.random.default_rng(seed)
+        self._keys = np.empty(0, dtype=np.float64)
+        self._values: Optional[np.ndarray] = None
+
+    def update(self, values: np.ndarray):
+        if not len(values):
+            return
+        keys = self._rng.random(len(values))
+        if len(values) > self.capacity:
+            keep = np.argpartition(keys, self.capacity)[:self.capacity]
+            keys, values = keys[keep], values[keep]
+        if self._values is not None:
+            keys = np.concatenate([self._keys, keys])
+            values = np.concatenate([self._values, values])
+        if len(keys) > self.capacity:
+            keep = np.argpartition(keys, self.capacity)[:self.capacity]
+            keys, values = keys[keep], values[keep]
+        self._keys, self._values = keys, values
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values if self._values is not None else np.empty(0)
+
+    def quantiles(self, qs) -> np.ndarray:
+        return np.quantile(self.values, qs)
+
+    def histogram(self, n_bins: int = 32) -> Tuple[List[float], List[float]]:
+        # Equal-count bin edges adapt to skewed data better than equal-width ones.
+        edges = np.unique(self.quantiles(np.linspace(0.0, 1.0, n_bins + 1)))
+        if len(edges) < 2:
+            edges = np.array([edges[0], edges[0]])
+            return edges.tolist(), [1.0]
+        weights, _ = np.histogram(self.values, bins=edges)
+        return edges.tolist(), (weights / weights.sum()).tolist()
+
+
+class HeavyHitters:
+    """Misra-Gries summary: keeps at most k counters, any value with frequency > n/(k+1) survives."""
+
+    def __init__(self, k: int = 64):
+        self.k = k
+        self.counts: Dict = {}
+        self.total = 0
+
+    def update_counts(self, values, counts):
+        counts = np.asarray(counts, dtype=np.int64)
+        self.total += int(counts.sum())
+        if len(counts) > self.k:
+            # Reduce the batch to its own k counters with one vectorized decrement before merging it in;
+            # merged Misra-Gries summaries keep the same error bound, and high-cardinality batches stay cheap.
+            threshold = np.partition(counts, len(counts) - self.k - 1)[len(counts) - self.k - 1]
+            keep = np.flatnonzero(counts > threshold)
+            values, counts = np.asarray(values, dtype=object)[keep], counts[keep] - threshold
+        for value, count in zip(values, counts.tolist()):
+            self.counts[value] = self.counts.get(value, 0) + count
+        if len(self.counts) > self.k:
+            # Batched decrement: subtract the (k+1)-th largest count and drop everything at or below it.
+            threshold = sorted(self.counts.values(), reverse=True)[self.k]
+            self.counts = {v: c - threshold for v, c in self.counts.items() if c > threshold}
+
+    def update(self, values: np.ndarray):
+        uniques, counts = np.unique(values, return_counts=True)
+        self.update_counts(uniques.tolist(), counts)
+
+    def merge(self, other: "HeavyHitters"):
+        self.update_counts(list(other.counts), list(other.counts.values()))
+        # Counts the other summary already decremented away still belong to the stream total.
+        self.total += other.total - sum(other.counts.values())
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[object, int]]:
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+    def coverage(self) -> float:
+        # Lower bound on the share of the stream held by the tracked values.
+        return sum(self.counts.values()) / self.total if self.total else 0.0
+
+
+class RunningMoments:
+    """Count, mean and variance via Welford's update, merged batch by batch with Chan's formula."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray):
+        n = len(values)
+        if not n:
+            return
+        values = values.astype(np.float64, copy=False)
+        mean = float(values.mean())
+        m2 = float(np.square(values - mean).sum())
+        self.merge_moments(n, mean, m2)
+
+    def merge_moments(self, count: int, mean: float, m2: float):
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+
+    def merge(self, other: "RunningMoments"):
+        if other.count:
+            self.merge_moments(other.count, other.mean, other.m2)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class HyperLogLog:
+    """Approximate distinct count from 64-bit hashes; 2**precision one-byte registers, ~1.04/sqrt(m) error."""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update_hashes(self, hashes: np.ndarray):
+        if not len(hashes):
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+        # Bit length through frexp on the two 32-bit halves, which float64 holds exactly.
+        _, high_bits = np.frexp((rest >> np.uint64(32)).astype(np.float64))
+        _, low_bits = np.frexp((rest & np.uint64(0xFFFFFFFF)).astype(np.float64))
+        bit_length = np.where(high_bits > 0, high_bits + 32, low_bits)
+        rank = np.minimum(64 - bit_length + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)
+        return float(raw)
@@ -0,0 +1,25 @@
+import hashlib
+import numpy as np
+
+# Rows are generated in fixed blocks; each (seed, column, block, stream) has its own Philox key,
+# so any value is a pure function of the seed, the column name and the row index.
+BLOCK_ROWS = 1 << 16
+
+VALUES_STREAM = 0
+NULLS_STREAM = 1
+
+_UINT64_MASK = (1 << 64) - 1
+
+
+def column_key(name: str) -> int:
+    # Keyed by name rather than position, so adding or reordering columns leaves the others unchanged.
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def block_rng(seed: int, col_key: int, block: int, stream: int = VALUES_STREAM) -> np.random.Generator:
+    key = np.random.SeedSequence([seed & _UINT64_MASK, col_key, block, stream]).generate_state(2, np.uint64)
+    return np.random.Generator(np.random.Philox(key=key))
+
+
+def fresh_seed() -> int:
+    return int(np.random.SeedSequence().entropy) & _UINT64_MASK
@@ -1,27 +1,126 @@
-from typing import List, Type
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
 import pandas as pd
-from pydantic import BaseModel, Field, ValidationError
-from data_schema_config.column_schema import BaseColumnConfig, column_type_to_config_class
+from pydantic import BaseModel, Field, PrivateAttr, SerializeAsAny, ValidationError, field_validator, model_validator
+from data_schema_config.base_column_configs import ColumnConfig, get_column_config_class
+from data_schema_config.calibration import Engine, ExecutionPlan, available_workers, plan_execution
+from data_schema_config.nulls import apply_null_mask, null_mask
+from data_schema_config.quality import QualityReport
+from data_schema_config.rules import Rule, RuleSet, RuleStats
+from data_schema_config.streams import BLOCK_ROWS, NULLS_STREAM, block_rng, column_key, fresh_seed
+
+logger = logging.getLogger(__name__)
+
+_worker_schema: Optional["TableSchema"] = None
+
+_async_executor: Optional[ThreadPoolExecutor] = None
+_async_executor_lock = threading.Lock()
+
+
+def generation_executor() -> ThreadPoolExecutor:
+    """Executor shared by every `agenerate_batches` call; its size caps concurrent batch generation."""
+    global _async_executor
+    with _async_executor_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(available_workers(), thread_name_prefix="rdf-async")
+        return _async_executor
+
+
+def set_generation_concurrency(max_workers: int):
+    """Resize the shared executor; batches already running finish on the old one."""
+    global _async_executor
+    if max_workers < 1:
+        raise ValueError("Concurrency must be at least 1.")
+    with _async_executor_lock:
+        previous, _async_executor = _async_executor, ThreadPoolExecutor(max_workers, thread_name_prefix="rdf-async")
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def _init_pool_worker(schema_json: str):
+    global _worker_schema
+    _worker_schema = TableSchema.from_json(schema_json)
+
+
+def _pool_block(seed: int, block: int,
+                profile: bool = False) -> Tuple[pd.DataFrame, List[RuleStats], Optional[QualityReport]]:
+    # The block is summarized in the worker, only up to num_rows, and the reports merged by the parent.
+    _worker_schema._rule_set = RuleSet(_worker_schema.rules)
+    rows = slice(0, _worker_schema.num_rows - block * BLOCK_ROWS)
+    frame = _worker_schema._block_frame(seed, block, counted=rows)
+    report = None
+    if profile:
+        report = QualityReport()
+        report.update(frame.iloc[rows])
+    return frame, _worker_schema._rule_set.stats, report
+
 
 class TableSchema(BaseModel):
-    columns: List[BaseColumnConfig] = Field(default_factory=list)
+    columns: List[SerializeAsAny[ColumnConfig]] = Field(default_factory=list)
     num_rows: int = 100
+    seed: Optional[int] = None
+    rules: List[Rule] = Field(default_factory=list)
+
+    _plan_key: Optional[tuple] = PrivateAttr(default=None)
+    _plan: List[Tuple[ColumnConfig, Callable]] = PrivateAttr(default_factory=list)
+    _rule_set: RuleSet = PrivateAttr(default_factory=lambda: RuleSet([]))
+
+    @field_validator("columns", mode="before")
+    @classmethod
+    def dispatch_column_types(cls, columns):
+        # The registry acts as the discriminator on `type`: each entry is validated by its own
+        # config class (whose validator pydantic compiled once), so subclass fields round-trip.
+        return [
+            get_column_config_class(col["type"]).model_validate(col) if isinstance(col, dict) else col
+            for col in columns
+        ]
+
+    @model_validator(mode="after")
+    def check_rule_columns(self):
+        names = {col.name for col in self.columns}
+        for rule in self.rules:
+            missing = [c for c in rule.columns() if c not in names]
+            if missing:
+                raise ValueError(f"Rule '{rule.label}' refers to unknown column(s): {', '.join(missing)}")
+        return self
+
+    def add_rule(self, rule: Rule):
+        self.rules.append(rule)
+        self.check_rule_columns()
 
-    def add_col_config(self, config: BaseColumnConfig):
+    def add_col_config(self, config: ColumnConfig):
         if any(c.name == config.name for c in self.columns):
             raise ValueError(f"Column '{config.name}' already exists.")
         self.columns.append(config)
 
     def remove_column(self, name: str):
         self.columns = [col for col in self.columns if col.name != name]
+        self.rules = [rule for rule in self.rules if name not in rule.columns()]
 
-    def get_columns(self) -> List[BaseColumnConfig]:
+    def get_columns(self) -> List[ColumnConfig]:
         return self.columns
 
+    def storage_encodings(self) -> Dict[str, str]:
+        return {col.name: get_column_config_class(col.type).storage_encoding for col in self.columns}
+
+    def summary_frame(self) -> pd.DataFrame:
+        """One row per column, for listing the schema in a single table widget."""
+        return pd.DataFrame({
+            "Name": [col.name for col in self.columns],
+            "Type": [col.type_name for col in self.columns],
+            "Format": [col.format for col in self.columns],
+            "Null fraction": [col.null_fraction for col in self.columns],
+        })
+
     def clear(self):
         self.columns = []
 
-    def get_column_by_name(self, name: str) -> BaseColumnConfig | None:
+    def get_column_by_name(self, name: str) -> ColumnConfig | None:
         for col in self.columns:
             if col.name == name:
                 return col
@@ -35,12 +134,193 @@ class TableSchema(BaseModel):
     def get_num_rows(self) -> int:
         return self.num_rows
     
-    def generate_dataframe(self) -> pd.DataFrame:
-        data = {}
-        for col in self.columns:
-            print(f"Generating data for column: {col.name} of type {col.type}")
-            config_cls = column_type_to_config_class[col.type]
-            print(f"Using config class: {config_cls.__name__}")
-            print(config_cls)
-            data[col.name] = config_cls.generate_data(col, self.num_rows)
-        return pd.DataFrame(data)
\ No newline at end of file
+    def generation_plan(self) -> List[Tuple[ColumnConfig, Callable]]:
+        # Generators are looked up in the registry once per schema layout, not once per column per call.
+        key = tuple((id(col), col.type_name) for col in self.columns)
+        if key != self._plan_key:
+            self._plan = [(col, get_column_config_class(col.type).generate_data) for col in self.columns]
+            self._plan_key = key
+        return self._plan
+
+    def _column_block(self, col: ColumnConfig, generate: Callable, seed: int, block: int, n_rows: int = BLOCK_ROWS):
+        # The first n_rows of the block. Columns that are not prefix-stable always draw the whole block, so a
+        # row's value never depends on num_rows or on the requested range.
+        size = n_rows if get_column_config_class(col.type).prefix_stable(col) else BLOCK_ROWS
+        key = column_key(col.name)
+        values = generate(col, size, block_rng(seed, key, block))
+        mask = null_mask(size, col.null_fraction, block_rng(seed, key, block, NULLS_STREAM))
+        values = apply_null_mask(values, mask)
+        return values[:n_rows] if size != n_rows else values
+
+    def _block_frame(self, seed: int, block: int, n_rows: int = BLOCK_ROWS,
+                     counted: slice = slice(None)) -> pd.DataFrame:
+        plan = self.generation_plan()
+        if self.rules:
+            n_rows = BLOCK_ROWS
+        frame = pd.DataFrame({col.name: self._column_block(col, generate, seed, block, n_rows)
+                              for col, generate in plan},
+                             index=pd.RangeIndex(n_rows))
+        if self.rules:
+            # Rules see whole blocks and draw from their own block-keyed streams, so repaired rows stay
+            # a pure function of the seed and the row index.
+            self._rule_set.apply(frame, {col.name: (col, generate) for col, generate in plan},
+                                 lambda i: block_rng(seed, column_key(f"rule:{i}"), block), counted)
+        return frame
+
+    def _generate_range(self, start: int, stop: int, seed: int, cache: Optional[dict] = None,
+                        report: Optional[QualityReport] = None) -> pd.DataFrame:
+        if not 0 <= start <= stop <= self.num_rows:
+            raise ValueError(f"Row range [{start}, {stop}) is outside [0, {self.num_rows}).")
+        if start == stop:
+            return pd.DataFrame({col.name: [] for col in self.columns})
+        pieces = []
+        for block in range(start // BLOCK_ROWS, (stop - 1) // BLOCK_ROWS + 1):
+            offset = block * BLOCK_ROWS
+            if cache is not None and cache.get("block") == block:
+                frame = cache["frame"]
+            elif cache is not None:
+                # Streaming callers continue in the same block with their next batch, so it is drawn whole;
+                # rules count the rows up to the stream's end (cache["stop"], by default num_rows).
+                end = min(cache.get("stop", self.num_rows), offset + BLOCK_ROWS)
+                frame = self._block_frame(seed, block, counted=slice(max(start, offset) - offset, end - offset))
+                cache.update(block=block, frame=frame)
+            else:
+                # A one-off range (e.g. a preview) only draws its block as far as it reaches.
+                frame = self._block_frame(seed, block, min(stop - offset, BLOCK_ROWS),
+                                          slice(max(start, offset) - offset, min(stop, offset + BLOCK_ROWS) - offset))
+            piece = frame.iloc[max(start, offset) - offset:min(stop, offset + BLOCK_ROWS) - offset]
+            if report is not None:
+                # Summarized block by block, while each piece is still in cache.
+                report.update(piece)
+            pieces.append(piece)
+        frame = pieces[0] if len(pieces) == 1 else pd.concat(pieces)
+        frame.index = pd.RangeIndex(start, stop)
+        return frame
+
+    def rule_report(self) -> pd.DataFrame:
+        """Violations and time spent per rule during the last generation call."""
+        return self._rule_set.report()
+
+    def generate_range(self, start: int, stop: int) -> pd.DataFrame:
+        if self.seed is None:
+            raise ValueError("Random-access generation needs a seed; set TableSchema.seed first.")
+        self._rule_set = RuleSet(self.rules)
+        return self._generate_range(start, stop, self.seed)
+
+    def generate_range_batches(self, start: int, stop: int, batch_size: int = 50_000,
+                               report: Optional[QualityReport] = None) -> Iterator[pd.DataFrame]:
+        """Rows [start, stop) in batches of `batch_size`, drawing each block once however many batches span it."""
+        if self.seed is None:
+            raise ValueError("Random-access generation needs a seed; set TableSchema.seed first.")
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        self._rule_set = RuleSet(self.rules)
+        cache: dict = {"stop": stop}
+        for batch_start in range(start, stop, batch_size):
+            yield self._generate_range(batch_start, min(batch_start + batch_size, stop), self.seed, cache, report)
+
+    def generate_row(self, index: int) -> dict:
+        return self.generate_range(index, index + 1).iloc[0].to_dict()
+
+    def execution_plan(self) -> ExecutionPlan:
+        return plan_execution(self.columns, self.num_rows)
+
+    def _generate_pooled(self, seed: int, workers: int, report: Optional[QualityReport] = None) -> pd.DataFrame:
+        # Blocks are pure functions of (seed, block), so the pool's output matches serial generation exactly.
+        blocks = range((self.num_rows - 1) // BLOCK_ROWS + 1)
+        with ProcessPoolExecutor(workers, initializer=_init_pool_worker, initargs=(self.to_json(None),)) as pool:
+            results = list(pool.map(_pool_block, repeat(seed), blocks, repeat(report is not None)))
+        for _, stats, block_report in results:
+            self._rule_set.merge(stats)
+            if report is not None:
+                report.merge(block_report)
+        return pd.concat([frame for frame, _, _ in results], ignore_index=True).iloc[:self.num_rows]
+
+    def generate_dataframe(self, report: Optional[QualityReport] = None,
+                           plan: Optional[ExecutionPlan] = None) -> pd.DataFrame:
+        """Generate all rows, on the engine the machine's calibration profile predicts to be fastest."""
+        plan = plan or self.execution_plan()
+        logger.info("Generating %d rows: %s", self.num_rows, plan.describe())
+        self._rule_set = RuleSet(self.rules)
+        seed = self.seed if self.seed is not None else fresh_seed()
+        if plan.engine == Engine.PROCESS_POOL and plan.workers > 1:
+            frame = self._generate_pooled(seed, plan.workers, report)
+        else:
+            frame = self._generate_range(0, self.num_rows, seed, report=report)
+        return frame.reset_index(drop=True)
+
+    def generate_batches(self, batch_size: int = 50_000,
+                         report: Optional[QualityReport] = None) -> Iterator[pd.DataFrame]:
+        # Batches are slices of the same row space, so the output does not depend on batch_size.
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        seed = self.seed if self.seed is not None else fresh_seed()
+        self._rule_set = RuleSet(self.rules)
+        cache: dict = {}
+        for start in range(0, self.num_rows, batch_size):
+            batch = self._generate_range(start, min(start + batch_size, self.num_rows), seed, cache, report)
+            yield batch.reset_index(drop=True)
+
+    async def agenerate_batches(self, batch_size: int = 50_000, report: Optional[QualityReport] = None,
+                                executor: Optional[Executor] = None) -> AsyncIterator[pd.DataFrame]:
+        """`generate_batches` for event loops: each batch is built on `executor` while the loop stays free.
+
+        The next batch is generated while the caller handles the current one. Cancelling the consuming task
+        (or closing the iterator) stops generation at the next batch boundary; a batch already running on
+        a worker thread finishes there and is discarded. Without an explicit executor, all calls share
+        `generation_executor()`, so concurrent schemas never use more threads than it has.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        loop = asyncio.get_running_loop()
+        executor = executor or generation_executor()
+        seed = self.seed if self.seed is not None else fresh_seed()
+        self._rule_set = RuleSet(self.rules)
+        cache: dict = {}
+
+        def produce(start: int) -> pd.DataFrame:
+            batch = self._generate_range(start, min(start + batch_size, self.num_rows), seed, cache, report)
+            return batch.reset_index(drop=True)
+
+        starts = iter(range(0, self.num_rows, batch_size))
+        start = next(starts, None)
+        pending = loop.run_in_executor(executor, produce, start) if start is not None else None
+        try:
+            while pending is not None:
+                batch = await pending
+                start = next(starts, None)
+                # Only one batch per call is ever in flight, so the block cache is never shared between threads.
+                pending = loop.run_in_executor(executor, produce, start) if start is not None else None
+                yield batch
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return self.model_dump_json(indent=indent)
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "TableSchema":
+        return cls.model_validate_json(data)
+
+    def to_yaml(self) -> str:
+        import yaml  # Optional dependency, only needed for YAML schemas
+
+        return yaml.safe_dump(self.model_dump(mode="json"), sort_keys=False)
+
+    @classmethod
+    def from_yaml(cls, data: str) -> "TableSchema":
+        import yaml
+
+        return cls.model_validate(yaml.safe_load(data))
+
+    def save(self, path: Union[str, Path]):
+        path = Path(path)
+        text = self.to_yaml() if path.suffix.lower() in (".yaml", ".yml") else self.to_json()
+        path.write_text(text, encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TableSchema":
+        path = Path(path)
+        text = path.read_text(encoding="utf-8")
+        return cls.from_yaml(text) if path.suffix.lower() in (".yaml", ".yml") else cls.from_json(text)
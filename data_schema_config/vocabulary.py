@@ -0,0 +1,301 @@
+import os
+import re
+import string
+from functools import lru_cache
+from typing import Callable, ClassVar, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from faker import Faker
+from data_schema_config.base_column_configs import ColumnConfig
+
+# Vocabularies are drawn from a seeded Faker, so every process (and every host with the same
+# Faker version) samples from identical arrays. They are kept as Arrow large_string arrays: one
+# contiguous character buffer plus offsets instead of one Python object per value.
+VOCABULARY_SEED = 0
+# A plain vocabulary column has at most this many distinct values; composed columns (below) are not capped.
+VOCABULARY_SIZE = int(os.environ.get("RETAILDATAFORGE_VOCABULARY_SIZE", 8192))
+
+
+class Composition(NamedTuple):
+    formats: Union[str, Tuple[str, ...]]  # Faker provider attribute holding the formats, or the formats themselves
+    placeholders: str = ""  # Faker placeholder characters filled in the literal text of a format
+    slugify: bool = False  # Lowercased and reduced to word characters and hyphens, as Faker's @slugify does
+
+
+# Providers whose values are composed row by row from Faker's own format tables: each {{token}} is drawn
+# from its own vocabulary (or composed in turn) and numerify/bothify placeholders get random characters,
+# so values combine parts instead of repeating a fixed list of whole values.
+COMPOSITIONS = {
+    "name": Composition("formats"),
+    "address": Composition("address_formats"),
+    "street_address": Composition("street_address_formats"),
+    "street_name": Composition("street_name_formats"),
+    "building_number": Composition("building_number_formats", "#%$"),
+    "secondary_address": Composition("secondary_address_formats", "#%$"),
+    "phone_number": Composition("formats", "#%$"),
+    "user_name": Composition("user_name_formats", "#%$?", slugify=True),
+    "email": Composition(("{{user_name}}@{{safe_domain_name}}",)),  # Faker's email(safe=True)
+    "city": Composition("city_formats"),
+}
+# Providers that return random_element(<attribute>): sampled from that table itself, with Faker's weights
+# when it is a dict, instead of from a vocabulary of draws that loses the rarer values.
+ELEMENT_TABLES = {
+    "first_name": "first_names",
+    "first_name_female": "first_names_female",
+    "first_name_male": "first_names_male",
+    "last_name": "last_names",
+    "prefix_female": "prefixes_female",
+    "prefix_male": "prefixes_male",
+    "suffix_female": "suffixes_female",
+    "suffix_male": "suffixes_male",
+    "country": "countries",
+    "word": "word_list",
+    "city_prefix": "city_prefixes",
+    "city_suffix": "city_suffixes",
+    "street_suffix": "street_suffixes",
+    "safe_domain_name": "safe_domain_names",
+}
+PLACEHOLDER_CHARACTERS = {
+    "#": string.digits,
+    "%": string.digits[1:],
+    "$": string.digits[2:],
+    "?": string.ascii_letters,
+}
+_TOKEN_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+@lru_cache(maxsize=None)
+def faker_vocabulary(provider: str, size: int = VOCABULARY_SIZE, locale: str = "en_US") -> pa.LargeStringArray:
+    fake = Faker(locale)
+    fake.seed_instance(VOCABULARY_SEED)
+    method = getattr(fake, provider)
+    return pa.array([method() for _ in range(size)], type=pa.large_string())
+
+
+@lru_cache(maxsize=None)
+def distinct_vocabulary(provider: str, locale: str = "en_US") -> pa.LargeStringArray:
+    # Each distinct value once, for keyed values: uniform over these, distinct keys share values far less often.
+    return faker_vocabulary(provider, locale=locale).unique()
+
+
+@lru_cache(maxsize=None)
+def faker_elements(provider: str, locale: str = "en_US") -> Optional[Tuple[pa.LargeStringArray, np.ndarray]]:
+    """A provider's element table and the cumulative share of each element, or None if it has none."""
+    attribute = ELEMENT_TABLES.get(provider)
+    owner = attribute and next((p for p in Faker(locale).get_providers()
+                                if hasattr(p, provider) and hasattr(p, attribute)), None)
+    if not owner:
+        return None
+    elements = getattr(owner, attribute)
+    weights = np.asarray(list(elements.values()) if isinstance(elements, dict) else [1.0] * len(elements), dtype=float)
+    cdf = np.cumsum(weights / weights.sum())
+    cdf[-1] = 1.0
+    return pa.array(list(elements), type=pa.large_string()), cdf
+
+
+def reference_faker(rng: Optional[np.random.Generator] = None) -> Faker:
+    """A fresh Faker for per-row reference loops, seeded from `rng` when given; nothing touches Faker's global seed."""
+    fake = Faker()
+    if rng is not None:
+        fake.seed_instance(int(rng.integers(0, 2 ** 63)))
+    return fake
+
+
+def take_strings(vocabulary: pa.Array, indices: np.ndarray) -> pd.arrays.ArrowExtensionArray:
+    # Gathers straight into a new Arrow buffer; no Python str is created per row.
+    return pd.arrays.ArrowExtensionArray(vocabulary.take(pa.array(indices)))
+
+
+@lru_cache(maxsize=None)
+def _formats(provider: str, locale: str) -> Optional[Tuple[List[tuple], np.ndarray]]:
+    # Each format parsed into (literal, token) segments, plus the format weights; None when this
+    # locale's Faker has no format table for the provider.
+    composition = COMPOSITIONS.get(provider)
+    if composition is None:
+        return None
+    formats = composition.formats
+    if isinstance(formats, str):
+        owner = next((p for p in Faker(locale).get_providers() if hasattr(p, provider) and hasattr(p, formats)), None)
+        if owner is None:
+            return None
+        formats = getattr(owner, formats)
+    weights = np.asarray(list(formats.values()) if isinstance(formats, dict) else [1.0] * len(formats), dtype=float)
+    parsed = []
+    for fmt in formats:
+        parts = _TOKEN_RE.split(fmt)
+        parsed.append([(parts[i], parts[i + 1] if i + 1 < len(parts) else None) for i in range(0, len(parts), 2)])
+    return parsed, weights / weights.sum()
+
+
+def _stream(key: int, path: tuple) -> np.random.Generator:
+    state = np.random.SeedSequence([key, *path]).generate_state(2, np.uint64)
+    return np.random.Generator(np.random.Philox(key=state))
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    # SplitMix64 finalizer: spreads every input bit over the whole 64-bit output.
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _uniforms(key: int, path: tuple, n_rows: int, columns: int, row_keys: Optional[np.ndarray]) -> np.ndarray:
+    # (n_rows, columns) uniforms for one part: drawn in row order from the part's stream, so the first rows
+    # never depend on n_rows, or, given row_keys, a pure function of each row's key, so equal keys always
+    # get equal values.
+    if row_keys is None:
+        return _stream(key, path).random((n_rows, columns))
+    part = np.random.SeedSequence([key, *path]).generate_state(1, np.uint64)[0]
+    salts = part + np.arange(columns, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    return (_mix(row_keys[:, None] ^ salts) >> np.uint64(11)) * 2.0 ** -53
+
+
+def _fill(literal: str, placeholders: str, n_rows: int, uniforms: Callable[[int], np.ndarray]
+          ) -> Union[pa.Array, pa.Scalar]:
+    data = np.frombuffer(literal.encode("utf-8"), dtype=np.uint8)
+    slots = [i for i, byte in enumerate(data) if chr(byte) in placeholders]
+    if not slots:
+        return pa.scalar(literal, type=pa.large_string())
+    rows = np.tile(data, (n_rows, 1))
+    draws = uniforms(len(slots))  # One row of draws per value keeps the column prefix-stable
+    for j, i in enumerate(slots):
+        alphabet = np.frombuffer(PLACEHOLDER_CHARACTERS[chr(data[i])].encode("ascii"), dtype=np.uint8)
+        rows[:, i] = alphabet[(draws[:, j] * len(alphabet)).astype(np.intp)]
+    offsets = np.arange(n_rows + 1, dtype=np.int64) * len(data)
+    return pa.LargeStringArray.from_buffers(n_rows, pa.py_buffer(offsets), pa.py_buffer(rows.tobytes()))
+
+
+def _compose(provider: str, n_rows: int, key: int, path: tuple, locale: str,
+             row_keys: Optional[np.ndarray] = None) -> pa.Array:
+    formats, weights = _formats(provider, locale)
+    composition = COMPOSITIONS[provider]
+    if len(formats) > 1:
+        cdf = np.cumsum(weights)
+        choice = np.searchsorted(cdf / cdf[-1], _uniforms(key, path, n_rows, 1, row_keys)[:, 0], side="right")
+    else:
+        choice = np.zeros(n_rows, dtype=np.intp)
+    # Rows grouped by format; numpy's stable sort is a radix sort on 16-bit keys.
+    order = np.argsort(choice.astype(np.uint16), kind="stable")
+    counts = np.bincount(choice, minlength=len(formats))
+    starts = np.cumsum(counts) - counts
+    pieces = []
+    for f, segments in enumerate(formats):
+        m = int(counts[f])
+        if not m:
+            continue
+        # Every part has its own stream, drawn in row order, so the first rows of a format never depend
+        # on how many rows were requested.
+        keys = None if row_keys is None else row_keys[order[starts[f]:starts[f] + m]]
+        parts = []
+        for s, (literal, token) in enumerate(segments):
+            if literal:
+                parts.append(_fill(literal, composition.placeholders, m,
+                                   lambda columns: _uniforms(key, path + (f, s, 0), m, columns, keys)))
+            if token is None:
+                continue
+            if _formats(token, locale) is not None:
+                parts.append(_compose(token, m, key, path + (f, s, 1), locale, keys))
+            elif faker_elements(token, locale) is not None:
+                # Keyed picks are uniform over the elements, so distinct keys share values as rarely as possible.
+                elements, cdf = faker_elements(token, locale)
+                draws = _uniforms(key, path + (f, s, 1), m, 1, keys)[:, 0]
+                picks = (np.searchsorted(cdf, draws, side="right") if row_keys is None
+                         else (draws * len(elements)).astype(np.int64))
+                parts.append(elements.take(pa.array(picks)))
+            else:
+                vocabulary = (faker_vocabulary(token, locale=locale) if row_keys is None
+                              else distinct_vocabulary(token, locale))
+                picks = (_uniforms(key, path + (f, s, 1), m, 1, keys)[:, 0] * len(vocabulary)).astype(np.int64)
+                parts.append(vocabulary.take(pa.array(picks)))
+        arrays = [p for p in parts if isinstance(p, (pa.Array, pa.ChunkedArray))]
+        if not arrays:
+            parts.append(pa.nulls(m, pa.large_string()).fill_null(""))
+        pieces.append(pc.binary_join_element_wise(*parts, pa.scalar("", type=pa.large_string()))
+                      if len(parts) > 1 else parts[0])
+    position = np.empty(n_rows, dtype=np.intp)
+    position[order] = np.arange(n_rows)
+    values = pa.concat_arrays(pieces).take(pa.array(position))
+    return _slugify(values) if composition.slugify else values
+
+
+def _slugify(values: pa.Array) -> pa.Array:
+    values = pc.utf8_lower(pc.utf8_trim_whitespace(pc.replace_substring_regex(values, r"[^\w\s-]", "")))
+    return pc.replace_substring_regex(values, r"[-\s]+", "-")
+
+
+def compose_values(provider: str, n_rows: int, rng: np.random.Generator,
+                   locale: str = "en_US") -> Optional[pa.LargeStringArray]:
+    """`n_rows` values of a Faker provider composed from its format table, or None if it has none.
+
+    Only one number is drawn from `rng`, whatever `n_rows` is; it keys the streams of every part.
+    """
+    if _formats(provider, locale) is None:
+        return None
+    return _compose(provider, n_rows, int(rng.integers(0, 2 ** 63)), (), locale)
+
+
+def compose_keyed(provider: str, row_keys: np.ndarray, locale: str = "en_US") -> Optional[pa.LargeStringArray]:
+    """One composed value per 64-bit key, the same for the same key on every call; None without formats."""
+    if _formats(provider, locale) is None:
+        return None
+    return _compose(provider, len(row_keys), 0, (), locale, np.asarray(row_keys, dtype=np.uint64))
+
+
+class FakerColumnConfig(ColumnConfig):
+    """Column backed by a Faker provider, sampled from its element table (see ELEMENT_TABLES) or a fixed
+    vocabulary instead of calling Faker per row.
+
+    With `composed` set, values are built from independently drawn parts instead (see COMPOSITIONS), for
+    columns such as emails whose values should rarely repeat.
+    """
+
+    faker_provider: ClassVar[str] = ""
+    composed: ClassVar[bool] = False
+    storage_encoding: ClassVar[str] = "dictionary"
+
+    @classmethod
+    def prefix_stable(cls, config: "FakerColumnConfig") -> bool:
+        return True
+
+    @classmethod
+    def vocabulary(cls, config: "FakerColumnConfig") -> pa.LargeStringArray:
+        elements = faker_elements(cls.faker_provider)
+        return elements[0] if elements is not None else faker_vocabulary(cls.faker_provider)
+
+    @classmethod
+    def sample_values(cls, config: "FakerColumnConfig", n_rows: int, rng: np.random.Generator) -> pa.Array:
+        if cls.composed:
+            values = compose_values(cls.faker_provider, n_rows, rng)
+            if values is not None:
+                return values
+        vocabulary = cls.vocabulary(config)
+        elements = faker_elements(cls.faker_provider)
+        if elements is not None:
+            # The vocabulary is the element table, possibly transformed value by value, so Faker's weights still apply.
+            return vocabulary.take(pa.array(np.searchsorted(elements[1], rng.random(n_rows), side="right")))
+        return vocabulary.take(pa.array(rng.integers(0, len(vocabulary), size=n_rows)))
+
+    @classmethod
+    def keyed_values(cls, config: "FakerColumnConfig", keys: np.ndarray) -> pa.Array:
+        """One value per 64-bit key, the same for the same key on every call (used to mask real values)."""
+        if cls.composed:
+            values = compose_keyed(cls.faker_provider, keys)
+            if values is not None:
+                return values
+        vocabulary = cls.vocabulary(config).unique()
+        return vocabulary.take(pa.array(np.asarray(keys, dtype=np.uint64) % np.uint64(len(vocabulary))))
+
+    @classmethod
+    def generate_data(cls, config: "FakerColumnConfig", n_rows: int,
+                      rng: Optional[np.random.Generator] = None) -> pd.arrays.ArrowExtensionArray:
+        return pd.arrays.ArrowExtensionArray(cls.sample_values(config, n_rows, rng or np.random.default_rng()))
+
+    @classmethod
+    def generate_reference(cls, config: "FakerColumnConfig", n_rows: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+        # Original per-row Faker loop, kept as the baseline the vocabulary sampler is checked against.
+        method = getattr(reference_faker(rng), cls.faker_provider)
+        return [method() for _ in range(n_rows)]
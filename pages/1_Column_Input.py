@@ -1,9 +1,15 @@
 import streamlit as st
-from data_schema_config.base_column_configs import (
-    ColumnConfig, 
-    ColumnType, 
-    ColumnTypeGroup)
+from pydantic import ValidationError
+from data_schema_config.base_column_configs import ColumnConfig
 from data_schema_config.table_schema import TableSchema
+from data_schema_config.inference import infer_table_schema
+from data_schema_config.schema_library import SchemaLibrary
+
+
+
+@st.cache_resource
+def get_schema_library() -> SchemaLibrary:
+    return SchemaLibrary()
 
 
 st.title("Step 1: Define Columns")
@@ -15,28 +21,71 @@ if "table_schema" not in st.session_state:
 table_schema: TableSchema = st.session_state.table_schema
 
 
+with st.expander("📥 Learn Schema from a Sample File"):
+    sample_file = st.file_uploader("CSV or Parquet sample", type=["csv", "parquet"], key="sample_file")
+    if sample_file and st.button("Infer Columns", key="infer_schema"):
+        st.session_state.table_schema = infer_table_schema(sample_file)
+        st.rerun()
+
+
+with st.expander("💾 Schema Library"):
+    library = get_schema_library()
+    save_col, load_col = st.columns(2)
+    with save_col:
+        schema_name = st.text_input("Save current schema as", key="library_save_name")
+        if st.button("Save", key="library_save") and schema_name.strip():
+            try:
+                library.save(schema_name.strip(), table_schema)
+                st.success(f"Saved schema: {schema_name.strip()}")
+            except ValueError as e:
+                st.warning(str(e))
+    with load_col:
+        saved = library.names()
+        choice = st.selectbox("Saved schemas", saved, key="library_load_name")
+        if st.button("Load", key="library_load", disabled=not saved):
+            st.session_state.table_schema = library.load(choice)
+            st.rerun()
+
+
 with st.expander("➕ Add New Column", expanded=True):
-    col_config = ColumnConfig.select_col_form()
-    print("!!!!!!!!Column config selected:", col_config)
-    print(f"Column config selected: {col_config}")
-    if col_config:
-        try:
+    try:
+        col_config = ColumnConfig.select_col_form()
+        if col_config:
             table_schema.add_col_config(col_config)
             st.success(f"Added column: {col_config}")
-        except ValueError as e:
-            st.warning(str(e))
+    except ValueError as e:
+        st.warning(str(e))
 
-# Display list of columns with delete buttons
+# One editable table instead of a row of widgets per column, so reruns stay fast on wide schemas.
 st.subheader("📋 Current Columns")
 
-columns = table_schema.get_columns()
-
-if columns:
-    for idx, col in enumerate(columns, 1):
-        col_container = st.container()
-        with col_container:
-            col1, col2 = st.columns([6, 1])
-            col1.markdown(f"**{idx}.** `{col.name}` – *{col.type.value}*")
-            if col2.button("❌", key=f"delete_{col.name}"):
-                table_schema.remove_column(col.name)
-                st.rerun()
\ No newline at end of file
+if table_schema.get_columns():
+    summary = table_schema.summary_frame()
+    summary["Remove"] = False
+    editor_key = f"column_editor_{st.session_state.get('column_editor_version', 0)}"
+    edited = st.data_editor(
+        summary,
+        key=editor_key,
+        hide_index=True,
+        use_container_width=True,
+        disabled=["Name", "Type", "Format"],
+        column_config={
+            "Null fraction": st.column_config.NumberColumn(min_value=0.0, max_value=1.0, step=0.01),
+            "Remove": st.column_config.CheckboxColumn(),
+        },
+    )
+    changed = edited["Remove"].any() or not edited["Null fraction"].equals(summary["Null fraction"])
+    if changed and st.button("Apply Changes", key="apply_column_edits"):
+        try:
+            # Validated copies: a cleared cell arrives as NaN, which plain attribute assignment would store.
+            updated = [type(col).model_validate({**col.model_dump(), "null_fraction": null_fraction})
+                       for col, null_fraction in zip(table_schema.get_columns(), edited["Null fraction"])]
+        except ValidationError:
+            st.warning("Every null fraction must be a number between 0 and 1.")
+        else:
+            table_schema.columns = updated
+            for name in edited.loc[edited["Remove"], "Name"]:
+                table_schema.remove_column(name)
+            # A fresh key drops the editor's pending edits, which refer to the old row positions.
+            st.session_state.column_editor_version = st.session_state.get("column_editor_version", 0) + 1
+            st.rerun()
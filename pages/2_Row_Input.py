@@ -1,6 +1,10 @@
+import os
 import streamlit as st
 from data_schema_config.table_schema import TableSchema
 
+# Rows generated in memory by Step 3; larger datasets are better written with the export command line.
+MAX_PAGE_ROWS = int(os.environ.get("RETAILDATAFORGE_MAX_PAGE_ROWS", 10_000_000))
+
 st.title("Step 2: Choose Number of Rows")
 
 # Check and fetch the table schema from session state
@@ -16,10 +20,15 @@ if not table_schema.get_columns():
 
 # Use existing value or default
 default_rows = table_schema.get_num_rows() if hasattr(table_schema, "get_num_rows") else 100
+if default_rows > MAX_PAGE_ROWS:
+    # An inferred schema carries its sample's row count, which can exceed what this page generates.
+    st.info(f"The schema asks for {default_rows:,} rows; this page generates at most {MAX_PAGE_ROWS:,}. "
+            f"Use `python -m data_schema_config.export` for the full count.")
+    default_rows = MAX_PAGE_ROWS
 
 num = st.number_input(
     "How many rows of synthetic data would you like to generate?",
-    min_value=1, max_value=100000, step=10, value=default_rows
+    min_value=1, max_value=MAX_PAGE_ROWS, step=10, value=default_rows
 )
 
 # Update schema directly
@@ -30,7 +39,6 @@ st.session_state.table_schema = table_schema
 
 # Show summary
 st.subheader("📋 Column Schema Preview")
-for idx, col in enumerate(table_schema.get_columns(), 1):
-    st.markdown(f"**{idx}.** `{col.name}` – *{col.type.value}*")
+st.dataframe(table_schema.summary_frame(), hide_index=True, use_container_width=True)
 
 st.success(f"Number of rows set to: {table_schema.get_num_rows()}")
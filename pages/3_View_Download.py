@@ -1,6 +1,21 @@
 import streamlit as st
-import pandas as pd
 from data_schema_config.table_schema import TableSchema
+from data_schema_config.result_store import ResultHandle, ResultStore
+from data_schema_config.quality import QualityReport, sidecar_path
+from data_schema_config.export import DEFAULT_TARGET_BYTES, EXPORT_FORMATS, EXPORT_ROOT, export_batches, \
+    resolve_export_dir
+
+DOWNLOAD_FORMATS = {
+    "CSV": ("csv", "synthetic_data.csv", "text/csv"),
+    "Parquet": ("parquet", "synthetic_data.parquet", "application/vnd.apache.parquet"),
+}
+
+
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    # One store per server process; sessions only keep a handle in session state.
+    return ResultStore()
+
 
 st.title("Step 3: Generate & Preview Synthetic Data")
 
@@ -10,25 +25,74 @@ if "table_schema" not in st.session_state or not st.session_state.table_schema.g
     st.stop()
 
 table_schema: TableSchema = st.session_state.table_schema
+store = get_result_store()
 
 # Button to generate
 if st.button("🚀 Generate Synthetic Data"):
-    df = table_schema.generate_dataframe()
-    st.session_state.generated_data = df
+    report = QualityReport()
+    handle = store.put(table_schema.generate_dataframe(report=report), table_schema.storage_encodings())
+    st.session_state.quality_report = report
+    st.session_state.rule_report = table_schema.rule_report() if table_schema.rules else None
+    previous = st.session_state.get("result_handle")
+    if previous is not None:
+        previous.release()
+    st.session_state.result_handle = handle
     st.success("Synthetic data generated successfully!")
 
-# Download button
-if "generated_data" in st.session_state:
-    csv = st.session_state.generated_data.to_csv(index=False).encode('utf-8')
-    st.download_button(
-        label="Download CSV",
-        data=csv,
-        file_name='synthetic_data.csv',
-        mime='text/csv',
-        key='download-csv'
-    )
-
-# Display table
-if "generated_data" in st.session_state:
+handle: ResultHandle = st.session_state.get("result_handle")
+if handle is not None and not handle.released:
+    # Download payloads are encoded once per result and shared by every rerun and session.
+    label = st.radio("Download format", list(DOWNLOAD_FORMATS), horizontal=True, key="download_format")
+    fmt, file_name, mime = DOWNLOAD_FORMATS[label]
+    if handle.has_payload(fmt) or st.button(f"Prepare {label} Download", key=f"prepare_{fmt}"):
+        st.download_button(
+            label=f"Download {label}",
+            data=handle.payload(fmt),
+            file_name=file_name,
+            mime=mime,
+            key=f"download-{fmt}"
+        )
+        if "quality_report" in st.session_state:
+            st.download_button(
+                label="Download Quality Report (JSON)",
+                data=st.session_state.quality_report.to_json(),
+                file_name=sidecar_path(file_name).name,
+                mime="application/json",
+                key=f"download-quality-{fmt}"
+            )
+
+    with st.expander("📦 Partitioned export"):
+        # Written on the server, for loaders that read Hive-style directories instead of one download.
+        partition_by = st.multiselect("Partition by", handle.columns, key="export_partition_by")
+        export_format = st.radio("File format", list(EXPORT_FORMATS), horizontal=True, key="export_format")
+        target_mb = st.number_input("Target file size (MB)", min_value=1, value=DEFAULT_TARGET_BYTES // 2**20,
+                                    key="export_target_mb")
+        out_dir = st.text_input(f"Output directory (under {EXPORT_ROOT})", value="export", key="export_dir")
+        if st.button("Write Partitioned Export", key="export_write"):
+            try:
+                st.session_state.export_manifest = export_batches(
+                    handle.batches(), resolve_export_dir(out_dir), report=st.session_state.get("quality_report"),
+                    partition_by=partition_by, file_format=export_format,
+                    target_bytes=int(target_mb) * 2**20)
+            except (OSError, ValueError) as e:
+                st.error(f"Export failed: {e}")
+        manifest = st.session_state.get("export_manifest")
+        if manifest is not None:
+            st.caption(f"{manifest.num_rows:,} rows in {len(manifest.files)} file(s); _manifest.json lists them.")
+            st.dataframe([f.model_dump(exclude={"partition", "sha256"}) for f in manifest.files],
+                         use_container_width=True)
+
+    # Display table
     st.subheader("📊 Preview of Generated Data")
-    st.dataframe(st.session_state.generated_data.head(), use_container_width=True)
+    st.caption(f"{handle.num_rows:,} rows × {len(handle.columns)} columns")
+    st.dataframe(handle.head(), use_container_width=True)
+
+    if "quality_report" in st.session_state:
+        st.subheader("🔎 Data Quality")
+        st.caption("Computed while the data was generated; distinct counts and top values are approximate.")
+        st.dataframe(st.session_state.quality_report.to_frame(), use_container_width=True)
+
+    if st.session_state.get("rule_report") is not None:
+        st.subheader("📏 Rules")
+        st.caption("Violations found, rows resampled or repaired, and time spent per rule.")
+        st.dataframe(st.session_state.rule_report, use_container_width=True)
@@ -0,0 +1,19 @@
+import pytest
+from pydantic import ValidationError
+from data_schema_config.column_formats.categorical_column_configs import CategoryColumnConfig
+
+
+@pytest.mark.parametrize("settings", [
+    {"categories": []},
+    {"categories": ["a", "b"], "weights": [1.0]},
+    {"categories": ["a", "b"], "weights": [1.0, -0.5]},
+    {"categories": ["a", "b"], "weights": [0.0, 0.0]},
+])
+def test_category_rejects_unusable_settings(settings):
+    with pytest.raises(ValidationError):
+        CategoryColumnConfig(name="c", **settings)
+
+
+def test_category_accepts_zero_weight_category():
+    config = CategoryColumnConfig(name="c", categories=["a", "b"], weights=[1.0, 0.0])
+    assert set(CategoryColumnConfig.generate_data(config, 100)) == {"a"}
@@ -0,0 +1,14 @@
+from streamlit.testing.v1 import AppTest
+
+
+def test_null_fraction_is_part_of_the_add_column_form(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The page's schema library lives in ./schemas
+    app = AppTest.from_file("../pages/1_Column_Input.py", default_timeout=30)
+    app.run()
+    app.text_input(key="add_column_integer_name").set_value("qty")
+    app.slider(key="add_column_integer_null_fraction").set_value(0.25)
+    next(b for b in app.button if b.label == "Add Column").click()
+    app.run()
+    assert not app.exception
+    (column,) = app.session_state["table_schema"].get_columns()
+    assert (column.name, column.null_fraction) == ("qty", 0.25)
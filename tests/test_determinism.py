@@ -0,0 +1,118 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from data_schema_config.base_column_configs import load_column_configs
+from data_schema_config.calibration import Engine, ExecutionPlan
+from data_schema_config.column_formats.categorical_column_configs import (
+    BooleanColumnConfig, CategoryColumnConfig, CityColumnConfig, CountryColumnConfig)
+from data_schema_config.column_formats.numeric_column_configs import FloatColumnConfig, IntegerColumnConfig
+from data_schema_config.column_formats.text_column_configs import (
+    AddressColumnConfig, EmailColumnConfig, PersonNameColumnConfig, PhoneNumberColumnConfig, StringColumnConfig)
+from data_schema_config.distributions import Distribution
+from data_schema_config.equivalence import SAMPLE_CONFIGS
+from data_schema_config.rules import CompareRule, ExpressionRule
+from data_schema_config.streams import BLOCK_ROWS
+from data_schema_config.table_schema import TableSchema
+
+NUM_ROWS = 2 * BLOCK_ROWS + 1234  # Two whole blocks and part of a third
+SERIAL = ExecutionPlan(engine=Engine.SERIAL)
+
+
+def _schema(num_rows: int = NUM_ROWS, seed: int = 21) -> TableSchema:
+    schema = TableSchema(seed=seed, num_rows=num_rows)
+    for config in [
+        IntegerColumnConfig(name="qty", min_value=1, max_value=40, null_fraction=0.05),
+        # The truncated normal redraws rejected rows, so this column always draws whole blocks.
+        IntegerColumnConfig(name="age", min_value=18, max_value=90,
+                            distribution=Distribution(kind="Truncated Normal", mean=40, std=15)),
+        FloatColumnConfig(name="price", min_value=1.0, max_value=500.0, precision=2, null_fraction=0.1),
+        FloatColumnConfig(name="discount", min_value=0.0, max_value=600.0, precision=2),
+        BooleanColumnConfig(name="active", null_fraction=0.2),
+        CategoryColumnConfig(name="tier", categories=["bronze", "silver", "gold"], weights=[6, 3, 1]),
+        CountryColumnConfig(name="country"),
+        CityColumnConfig(name="city", null_fraction=0.1),
+        StringColumnConfig(name="word", max_length=5),
+        PersonNameColumnConfig(name="name"),
+        EmailColumnConfig(name="email", null_fraction=0.1),
+        PhoneNumberColumnConfig(name="phone"),
+        AddressColumnConfig(name="address"),
+    ]:
+        schema.add_col_config(config)
+    schema.add_rule(CompareRule(left="discount", op="<=", right="price"))
+    schema.add_rule(ExpressionRule(expr="qty > 3", resample=["qty"]))
+    return schema
+
+
+@pytest.fixture(scope="module")
+def full() -> pd.DataFrame:
+    return _schema().generate_dataframe(plan=SERIAL)
+
+
+def _rule_counts(schema: TableSchema) -> pd.DataFrame:
+    return schema.rule_report().drop(columns="seconds")
+
+
+def test_same_seed_same_rows(full):
+    pd.testing.assert_frame_equal(_schema().generate_dataframe(plan=SERIAL), full)
+
+
+def test_process_pool_matches_serial(full):
+    schema = _schema()
+    pooled = schema.generate_dataframe(plan=ExecutionPlan(engine=Engine.PROCESS_POOL, workers=2, blocks=3))
+    pd.testing.assert_frame_equal(pooled, full)
+    serial = _schema()
+    serial.generate_dataframe(plan=SERIAL)
+    pd.testing.assert_frame_equal(_rule_counts(schema), _rule_counts(serial))
+
+
+@pytest.mark.parametrize("start,stop", [(0, 1), (10, 20), (BLOCK_ROWS - 5, BLOCK_ROWS + 5),
+                                        (BLOCK_ROWS, 2 * BLOCK_ROWS), (NUM_ROWS - 7, NUM_ROWS)])
+def test_range_matches_slice_of_full_frame(full, start, stop):
+    frame = _schema().generate_range(start, stop).reset_index(drop=True)
+    pd.testing.assert_frame_equal(frame, full.iloc[start:stop].reset_index(drop=True))
+
+
+def test_single_row_matches_full_frame(full):
+    row = _schema().generate_row(BLOCK_ROWS + 3)
+    expected = full.iloc[BLOCK_ROWS + 3].to_dict()
+    assert {k: None if pd.isna(v) else v for k, v in row.items()} == \
+        {k: None if pd.isna(v) else v for k, v in expected.items()}
+
+
+@pytest.mark.parametrize("batch_size", [1000, 50_000, BLOCK_ROWS + 1])
+def test_batches_match_full_frame(full, batch_size):
+    batches = list(_schema().generate_batches(batch_size))
+    assert all(len(b) == batch_size for b in batches[:-1])
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), full)
+
+
+def test_range_batches_and_async_batches_match_full_frame(full):
+    start, stop = 1000, NUM_ROWS - 1000
+    ranged = pd.concat(_schema().generate_range_batches(start, stop, 30_000), ignore_index=True)
+    pd.testing.assert_frame_equal(ranged, full.iloc[start:stop].reset_index(drop=True))
+
+    async def collect():
+        return [batch async for batch in _schema().agenerate_batches(40_000)]
+
+    pd.testing.assert_frame_equal(pd.concat(asyncio.run(collect()), ignore_index=True), full)
+
+
+@pytest.mark.parametrize("num_rows", [1, 777, BLOCK_ROWS, BLOCK_ROWS + 1])
+def test_fewer_rows_are_a_prefix(full, num_rows):
+    frame = _schema(num_rows).generate_dataframe(plan=SERIAL)
+    pd.testing.assert_frame_equal(frame, full.iloc[:num_rows].reset_index(drop=True))
+
+
+@pytest.mark.parametrize("type_name", sorted(load_column_configs()))
+def test_prefix_stable_types_draw_prefixes(type_name):
+    config_class = load_column_configs()[type_name]
+    try:
+        config = config_class(name="c", **SAMPLE_CONFIGS.get(type_name, {}))
+    except ValueError:
+        pytest.skip(f"'{type_name}' has no usable default settings")
+    if not config_class.prefix_stable(config):
+        pytest.skip(f"'{type_name}' is not prefix-stable")
+    short = config_class.generate_data(config, 100, np.random.default_rng(4))
+    long = config_class.generate_data(config, 5000, np.random.default_rng(4))
+    assert pd.Series(short).equals(pd.Series(long[:100]))
@@ -0,0 +1,55 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from data_schema_config.column_formats.categorical_column_configs import BooleanColumnConfig, CategoryColumnConfig
+from data_schema_config.column_formats.numeric_column_configs import FloatColumnConfig, IntegerColumnConfig
+from data_schema_config.column_formats.text_column_configs import AddressColumnConfig
+from data_schema_config.emitters import create_table_sql, load_sqlite
+from data_schema_config.table_schema import TableSchema
+
+AWKWARD_TEXT = ["O'Brien", 'say "hi"', "tab\there", "two\nlines", "cr\rlf", "back\\slash", "bell\x07", "",
+                "'; DROP TABLE t; --", "naïve café"]
+
+
+def _schema():
+    schema = TableSchema(seed=11)
+    schema.add_col_config(IntegerColumnConfig(name="qty", min_value=-5, max_value=500, null_fraction=0.1))
+    schema.add_col_config(FloatColumnConfig(name="price", min_value=0.0, max_value=1000.0, precision=3,
+                                            dtype="float32", null_fraction=0.1))
+    schema.add_col_config(BooleanColumnConfig(name="active", null_fraction=0.2))
+    schema.add_col_config(CategoryColumnConfig(name="note", categories=AWKWARD_TEXT, null_fraction=0.1))
+    schema.add_col_config(AddressColumnConfig(name="address"))
+    schema.set_num_rows(5_000)
+    return schema
+
+
+def _values(column: pd.Series) -> list:
+    return [None if pd.isna(v) else v for v in column.tolist()]
+
+
+def test_sqlite_round_trip_matches_generated_frame():
+    schema = _schema()
+    expected = schema.generate_dataframe()
+    connection = sqlite3.connect(":memory:")
+    stats = load_sqlite(schema.generate_batches(1_234), connection, "t", rows_per_statement=250)
+    assert stats.rows == len(expected)
+    loaded = pd.read_sql_query("SELECT * FROM t", connection)
+
+    assert loaded["qty"].astype("Int64").equals(expected["qty"].astype("Int64"))
+    assert loaded["active"].astype("boolean").equals(expected["active"].astype("boolean"))
+    # float32 values are written at float32 precision, so they compare equal once read back into float32.
+    np.testing.assert_array_equal(loaded["price"].astype("float32").to_numpy(),
+                                  expected["price"].astype("Float32").to_numpy(dtype="float32", na_value=np.nan))
+    for name in ("note", "address"):
+        assert _values(loaded[name]) == _values(expected[name])
+    assert set(AWKWARD_TEXT) <= set(loaded["note"].dropna())
+
+
+@pytest.mark.parametrize("data_type,sql_type", [
+    (pa.int8(), "SMALLINT"), (pa.uint16(), "INTEGER"), (pa.int64(), "BIGINT"), (pa.uint32(), "BIGINT"),
+    (pa.uint64(), "NUMERIC(20)"), (pa.float32(), "REAL"), (pa.bool_(), "BOOLEAN"),
+])
+def test_column_types(data_type, sql_type):
+    assert f'"c" {sql_type}' in create_table_sql("t", pa.schema([("c", data_type)]))
@@ -0,0 +1,93 @@
+from typing import ClassVar
+import numpy as np
+import pyarrow as pa
+import pytest
+from data_schema_config.column_formats.categorical_column_configs import BooleanColumnConfig
+from data_schema_config.column_formats.numeric_column_configs import FloatColumnConfig, IntegerColumnConfig
+from data_schema_config.column_formats.text_column_configs import EmailColumnConfig, StringColumnConfig
+from data_schema_config.distributions import Distribution
+from data_schema_config.equivalence import SAMPLE_CONFIGS, compare_column, reference_types
+from data_schema_config.vocabulary import faker_vocabulary
+
+REFERENCE_ROWS = 5_000
+OPTIMIZED_ROWS = 50_000
+
+
+def _compare(config, seed=0):
+    return compare_column(config, reference_rows=REFERENCE_ROWS, optimized_rows=OPTIMIZED_ROWS, seed=seed)
+
+
+@pytest.mark.parametrize("type_name", sorted(reference_types()))
+def test_optimized_matches_reference(type_name):
+    config_class = reference_types()[type_name]
+    result = _compare(config_class(name="c", **SAMPLE_CONFIGS.get(type_name, {})))
+    assert result.passed, result.model_dump()
+
+
+@pytest.mark.parametrize("type_name,test", [("Integer", "value_ks_p"), ("Float", "value_ks_p"),
+                                            ("Price", "value_ks_p"), ("Boolean", "value_chi2_p"),
+                                            ("Category", "value_chi2_p")])
+def test_numeric_and_categorical_types_are_covered(type_name, test):
+    available = reference_types()
+    if type_name not in available:
+        pytest.skip(f"No '{type_name}' column config with a reference generator is registered")
+    result = _compare(available[type_name](name="c", **SAMPLE_CONFIGS[type_name]))
+    assert getattr(result, test) is not None
+    assert result.passed, result.model_dump()
+
+
+@pytest.mark.parametrize("distribution", [
+    {"kind": "Normal", "mean": 50.0, "std": 15.0},
+    {"kind": "Truncated Normal", "mean": 20.0, "std": 30.0},
+    {"kind": "Log-Normal", "mean": 2.0, "std": 0.8},
+    {"kind": "Exponential", "scale": 10.0},
+    {"kind": "Poisson", "lam": 4.0},
+    {"kind": "Zipf", "exponent": 2.0},
+    {"kind": "Empirical", "bin_edges": [0.0, 10.0, 50.0, 100.0], "weights": [0.2, 0.5, 0.3]},
+    {"kind": "Discrete", "values": [1.0, 5.0, 10.0], "weights": [0.6, 0.3, 0.1]},
+], ids=lambda d: d["kind"])
+@pytest.mark.parametrize("config_class", [IntegerColumnConfig, FloatColumnConfig], ids=lambda c: c.__name__)
+def test_distributions_match_reference(config_class, distribution):
+    config = config_class(name="c", min_value=0, max_value=100, distribution=Distribution(**distribution))
+    result = _compare(config)
+    assert result.passed, result.model_dump()
+
+
+class SkewedBoolean(BooleanColumnConfig):
+    @classmethod
+    def generate_data(cls, config, n_rows, rng=None):
+        return super().generate_data(config.model_copy(update={"true_probability": 0.35}), n_rows, rng)
+
+
+class CommonWords(StringColumnConfig):
+    # Only the first hundred words: loses the tail that the pooled cell accounts for.
+    @classmethod
+    def sample_values(cls, config, n_rows, rng):
+        return cls.vocabulary(config).take(pa.array(rng.integers(0, 100, size=n_rows)))
+
+
+class FewEmails(EmailColumnConfig):
+    composed: ClassVar[bool] = False
+
+    @classmethod
+    def vocabulary(cls, config):
+        return faker_vocabulary("email", 256)
+
+
+def test_wrong_probability_fails():
+    result = _compare(SkewedBoolean(name="c", **SAMPLE_CONFIGS["Boolean"]))
+    assert not result.passed
+    assert result.value_chi2_p < 1e-3
+
+
+def test_missing_tail_fails():
+    result = _compare(CommonWords(name="c"))
+    assert not result.passed
+    assert result.worst_value is not None
+
+
+def test_repeated_values_fail_distinct_share():
+    result = _compare(FewEmails(name="c"))
+    assert not result.passed
+    assert result.distinct_share_delta < -0.5
+    assert np.isclose(result.reference_distinct_share, 1.0, atol=0.05)
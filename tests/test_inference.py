@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+from data_schema_config.inference import infer_table_schema
+from data_schema_config.table_schema import TableSchema
+
+SAMPLE_ROWS = 150_000
+
+
+def _sample(path):
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "quantity": rng.integers(1, 20, SAMPLE_ROWS),
+        "price": rng.lognormal(3, 1, SAMPLE_ROWS).round(2),
+        "segment": rng.choice(["bronze", "silver", "gold"], SAMPLE_ROWS, p=[0.6, 0.3, 0.1]),
+    }).to_parquet(path)
+    return path
+
+
+def test_inferred_schema_round_trips(tmp_path):
+    schema = infer_table_schema(_sample(tmp_path / "sample.parquet"))
+    assert schema.get_num_rows() == SAMPLE_ROWS
+    restored = TableSchema.from_json(schema.to_json())
+    assert restored.get_num_rows() == SAMPLE_ROWS
+    assert [c.model_dump() for c in restored.get_columns()] == [c.model_dump() for c in schema.get_columns()]
+    restored.set_num_rows(1000)
+    frame = restored.generate_dataframe()
+    assert list(frame.columns) == ["quantity", "price", "segment"]
+
+
+def test_row_input_page_accepts_large_inferred_schema(tmp_path):
+    schema = infer_table_schema(_sample(tmp_path / "sample.parquet"))
+    app = AppTest.from_file("../pages/2_Row_Input.py")
+    app.session_state["table_schema"] = schema
+    app.run()
+    assert not app.exception
+    assert app.number_input[0].value == SAMPLE_ROWS
@@ -0,0 +1,29 @@
+import pandas as pd
+import pyarrow as pa
+from data_schema_config.base_column_configs import get_column_config_class
+from data_schema_config.masking import mask_array, mask_file
+
+
+def _config(type_name):
+    return get_column_config_class(type_name)(name="c")
+
+
+def test_masking_is_consistent_and_keeps_blanks_null():
+    first = mask_array(pa.array(["x@y.com", None, " ", "q@r.com"]), _config("Email"), "secret")
+    second = mask_array(pa.array(["q@r.com", "x@y.com"]), _config("Email"), "secret")
+    assert first.to_pylist()[1:3] == [None, None]
+    assert second.to_pylist() == [first[3].as_py(), first[0].as_py()]
+
+
+def test_many_distinct_values_mask_without_failing(tmp_path):
+    source = tmp_path / "in.parquet"
+    pd.DataFrame({"name": [f"person {i}" for i in range(200_000)],
+                  "country": [f"country {i % 60}" for i in range(200_000)]}).to_parquet(source)
+    collisions = {}
+    rows = mask_file(source, tmp_path / "out.parquet", {"name": _config("Person Name"), "country": _config("Country")},
+                     secret="secret", batch_size=50_000, collisions=collisions)
+    out = pd.read_parquet(tmp_path / "out.parquet")
+    assert rows == len(out) == 200_000
+    assert out["name"].notna().all()
+    assert set(collisions) == {"Person Name", "Country"}
+    assert collisions["Country"] > 0
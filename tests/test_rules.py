@@ -0,0 +1,29 @@
+import numpy as np
+from data_schema_config.column_formats.numeric_column_configs import IntegerColumnConfig
+from data_schema_config.rules import CompareRule, ExpressionRule, MembershipRule
+from data_schema_config.table_schema import TableSchema
+
+
+def test_resampled_rows_keep_the_null_fraction():
+    schema = TableSchema(seed=5)
+    schema.add_col_config(IntegerColumnConfig(name="a", min_value=0, max_value=100, null_fraction=0.3))
+    schema.add_col_config(IntegerColumnConfig(name="b", min_value=0, max_value=100))
+    # `a` is redrawn with `b` for most rows, but does not take part in the condition.
+    schema.add_rule(ExpressionRule(expr="b > 30", resample=["a", "b"], max_attempts=20))
+    schema.set_num_rows(200_000)
+    frame = schema.generate_dataframe()
+    assert (frame["b"] > 30).all()
+    assert abs(frame["a"].isna().mean() - 0.3) < 0.01
+
+
+def test_only_repairable_rules_repair():
+    assert CompareRule.can_repair and MembershipRule.can_repair
+    assert not ExpressionRule.can_repair
+    schema = TableSchema(seed=5)
+    schema.add_col_config(IntegerColumnConfig(name="b", min_value=0, max_value=100))
+    schema.add_rule(ExpressionRule(expr="b > 200", resample=["b"], max_attempts=1))
+    schema.set_num_rows(1000)
+    schema.generate_dataframe()
+    (stats,) = schema.rule_report().to_dict("records")
+    assert stats["repaired"] == 0
+    assert stats["remaining"] == 1000
@@ -0,0 +1,84 @@
+import asyncio
+import http.client
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from data_schema_config.column_formats.numeric_column_configs import IntegerColumnConfig
+from data_schema_config.column_formats.text_column_configs import EmailColumnConfig
+from data_schema_config.service import GenerationService
+from data_schema_config.table_schema import TableSchema
+
+
+@pytest.fixture
+def address():
+    loop = asyncio.new_event_loop()
+    service = GenerationService(max_workers=2, max_pending_chunks=2)
+    server = loop.run_until_complete(service.start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server.sockets[0].getsockname()[:2]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+    service.close()
+
+
+def _schema_json():
+    schema = TableSchema()
+    schema.add_col_config(IntegerColumnConfig(name="qty", min_value=1, max_value=9))
+    schema.add_col_config(EmailColumnConfig(name="email"))
+    schema.set_num_rows(10)
+    return schema.to_json(indent=None).encode("utf-8")
+
+
+def _send(address, path="/generate?format=ndjson&seed=3&rows=300000&batch_size=20000", body=b"", headers=None):
+    connection = http.client.HTTPConnection(*address, timeout=60)
+    connection.request("POST", path, body=body, headers=headers or {})
+    return connection
+
+
+def test_identical_seeded_requests_share_one_generation(address, caplog):
+    caplog.set_level(logging.INFO, logger="data_schema_config.service")
+    # Both requests are sent before either response is read, so the second joins the first's generation.
+    # They are read concurrently: the shared generation only runs as fast as its slowest reader.
+    connections = [_send(address, body=_schema_json()), _send(address, body=_schema_json())]
+    with ThreadPoolExecutor(2) as pool:
+        bodies = list(pool.map(lambda connection: connection.getresponse().read(), connections))
+    assert bodies[0] == bodies[1]
+    assert "Coalesced request" in caplog.text
+    frame = pd.read_json(io.BytesIO(bodies[0]), lines=True)
+    schema = TableSchema.from_json(_schema_json())
+    schema.seed, schema.num_rows = 3, 300_000
+    expected = schema.generate_dataframe()
+    assert frame["qty"].tolist() == expected["qty"].tolist()
+    assert frame["email"].tolist() == expected["email"].tolist()
+
+
+def test_bad_body_is_rejected(address):
+    response = _send(address, body=b"{not json").getresponse()
+    assert response.status == 400
+
+
+@pytest.mark.parametrize("headers,status", [
+    ({"Content-Length": "abc"}, 400),
+    ({"Content-Length": "-5"}, 400),
+    ({"X-Padding": "x" * (70 * 1024)}, 431),
+])
+def test_bad_headers_are_rejected(address, headers, status):
+    connection = http.client.HTTPConnection(*address, timeout=10)
+    connection.putrequest("POST", "/generate", skip_accept_encoding=True)
+    for name, value in headers.items():
+        connection.putheader(name, value)
+    connection.endheaders()
+    assert connection.getresponse().status == status
+
+
+def test_health(address):
+    connection = http.client.HTTPConnection(*address, timeout=10)
+    connection.request("GET", "/health")
+    assert connection.getresponse().read() == b"ok\n"
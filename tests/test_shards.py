@@ -0,0 +1,59 @@
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow.parquet as pq
+from data_schema_config.column_formats.categorical_column_configs import CategoryColumnConfig
+from data_schema_config.column_formats.numeric_column_configs import FloatColumnConfig, IntegerColumnConfig
+from data_schema_config.shards import ShardCoordinator, ShardManifest, plan_shards, verify_manifest, write_shard
+from data_schema_config.streams import BLOCK_ROWS
+from data_schema_config.table_schema import TableSchema
+
+
+def _schema(num_rows):
+    schema = TableSchema(seed=7)
+    schema.add_col_config(IntegerColumnConfig(name="qty", min_value=1, max_value=50))
+    schema.add_col_config(FloatColumnConfig(name="price", min_value=0.5, max_value=500.0, precision=2))
+    schema.add_col_config(CategoryColumnConfig(name="tier", categories=["a", "b", "c"]))
+    schema.set_num_rows(num_rows)
+    return schema
+
+
+def _start_worker():
+    proc = subprocess.Popen([sys.executable, "-m", "data_schema_config.shards", "worker", "--port", "0"],
+                            stdout=subprocess.PIPE, text=True)
+    return proc, proc.stdout.readline().strip()
+
+
+def test_concurrent_attempts_publish_one_complete_file(tmp_path):
+    schema = _schema(2 * BLOCK_ROWS)
+    spec = plan_shards(schema.num_rows, BLOCK_ROWS)[1]
+    with ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(lambda _: write_shard(schema, spec, tmp_path, batch_size=10_000), range(2)))
+    assert results[0].sha256 == results[1].sha256
+    assert not list(tmp_path.glob("*.tmp"))
+    expected = schema.generate_range(spec.start, spec.stop).reset_index(drop=True)
+    pd.testing.assert_frame_equal(pq.read_table(tmp_path / spec.file).to_pandas(), expected, check_dtype=False)
+
+
+def test_coordinator_survives_a_killed_worker(tmp_path):
+    schema = _schema(8 * BLOCK_ROWS)
+    workers = [_start_worker() for _ in range(3)]
+    victim = workers[0][0]
+    try:
+        # One worker dies shortly after the run starts; its shards go to the others.
+        threading.Timer(0.2, victim.kill).start()
+        manifest = ShardCoordinator([address for _, address in workers], shard_timeout=60).run(
+            schema, tmp_path, shard_rows=BLOCK_ROWS)
+    finally:
+        for proc, _ in workers:
+            proc.kill()
+            proc.wait()
+            proc.stdout.close()
+    assert manifest.complete
+    assert verify_manifest(tmp_path) == []
+    assert ShardManifest.load(tmp_path).shards == manifest.shards
+    assert [s.index for s in manifest.shards] == list(range(8))
+    frame = pd.concat([pq.read_table(tmp_path / s.file).to_pandas() for s in manifest.shards], ignore_index=True)
+    pd.testing.assert_frame_equal(frame, schema.generate_dataframe(), check_dtype=False)